@@ -3,6 +3,21 @@ from __future__ import annotations
 from typing import Literal
 
 
-META_KEYS = Literal["table_process_order", "join", "keys", "is_optional"]
+META_KEYS = Literal[
+    "table_process_order",
+    "join",
+    "keys",
+    "is_optional",
+    "engine",
+    "is_key_local",
+    "is_expression",
+    "is_aggregation",
+    "join_options",
+    "output_of",
+]
 
-POLARS_JOIN_METHOD = Literal["inner", "left", "right", "full", "semi", "anti", "cross"]
+POLARS_JOIN_METHOD = Literal[
+    "inner", "left", "right", "full", "semi", "anti", "cross", "asof", "range"
+]
+
+ENGINE = Literal["polars", "duckdb"]
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+import json
+import os
+import pathlib
+import threading
+import time
+from typing import IO
+
+
+@dataclass
+class ExecutionEvent:
+    """
+    Event of DataHub execution passed to callbacks.
+
+    Attributes
+    ----------
+    event : str
+        Name of the event, e.g. 'node_end'.
+    hub : str
+        Class name of the DataHub.
+    name : str, optional
+        Name of the table. None for events of the whole execution.
+    elapsed_seconds : float, optional
+        Elapsed time of the node, join or execution. Only set for '*_end' events.
+    n_rows : int, optional
+        Number of rows of the created table, or of the DataFrame after the join.
+    size : int, optional
+        Estimated size in bytes of the created table, or of the DataFrame after the join.
+    missing_tables : list of str
+        Input tables which are not found. Only set for 'skip' events.
+    timestamp : float
+        Unix time when the event occurred.
+    """
+
+    event: str
+    hub: str
+    name: str | None = None
+    elapsed_seconds: float | None = None
+    n_rows: int | None = None
+    size: int | None = None
+    missing_tables: list[str] = field(default_factory=list)
+    timestamp: float = field(default_factory=time.time)
+
+
+class ExecutionCallback:
+    """
+    Base class of callbacks receiving events of DataHub execution.
+
+    Override methods of events to handle. Callbacks are registered by the `callbacks` class
+    attribute of DataHub or by `DataHub.add_callback`.
+
+    Callbacks are shared by concurrent executions of a DataHub. Events of an execution are
+    emitted from the thread calling it, so callbacks keeping state during an execution should
+    key the state by the thread, e.g. `threading.get_ident()`.
+    """
+
+    def on_execute_start(self, event: ExecutionEvent):
+        pass
+
+    def on_execute_end(self, event: ExecutionEvent):
+        pass
+
+    def on_node_start(self, event: ExecutionEvent):
+        pass
+
+    def on_node_end(self, event: ExecutionEvent):
+        pass
+
+    def on_join_start(self, event: ExecutionEvent):
+        pass
+
+    def on_join_end(self, event: ExecutionEvent):
+        pass
+
+    def on_cache_hit(self, event: ExecutionEvent):
+        """
+        Called when a table created in advance is used instead of executing the function,
+        e.g. by CompiledDataHub.
+        """
+
+    def on_skip(self, event: ExecutionEvent):
+        """
+        Called when an optional table is skipped because its input tables are not found.
+        """
+
+
+def emit_event(callbacks: Sequence[ExecutionCallback], event: str, hub: str, **kwargs):
+    """
+    Calls `on_{event}` of callbacks with an ExecutionEvent.
+    """
+    if not callbacks:
+        return
+    execution_event = ExecutionEvent(event, hub, **kwargs)
+    for callback in callbacks:
+        getattr(callback, f"on_{event}")(execution_event)
+
+
+class TimingRecorder(ExecutionCallback):
+    """
+    Records elapsed seconds of nodes of the latest finished execution, e.g. for
+    `DataHub.critical_path`. Timings of concurrent executions are recorded separately.
+    """
+
+    def __init__(self):
+        self.timings: dict[str, float] = {}
+        # timings of running executions keyed by their threads
+        self._running: dict[int, dict[str, float]] = {}
+
+    def on_execute_start(self, event: ExecutionEvent):
+        self._running[threading.get_ident()] = {}
+
+    def on_node_end(self, event: ExecutionEvent):
+        if event.name is not None and event.elapsed_seconds is not None:
+            timings = self._running.setdefault(threading.get_ident(), {})
+            timings[event.name] = event.elapsed_seconds
+
+    def on_execute_end(self, event: ExecutionEvent):
+        self.timings = self._running.pop(threading.get_ident(), {})
+
+
+class JsonLinesExporter(ExecutionCallback):
+    """
+    Writes each event as a line of JSON.
+    """
+
+    def __init__(self, file: str | pathlib.Path | IO[str]):
+        """
+        Parameters
+        ----------
+        file : str, pathlib.Path or file object
+            Path of the JSON lines file, which is appended to, or a text stream.
+        """
+        self.file = file
+        self._lock = threading.Lock()
+
+    def write(self, event: ExecutionEvent):
+        line = json.dumps(asdict(event)) + "\n"
+        with self._lock:
+            if isinstance(self.file, (str, pathlib.Path)):
+                with open(self.file, "a") as f:
+                    f.write(line)
+            else:
+                self.file.write(line)
+
+    on_execute_start = write
+    on_execute_end = write
+    on_node_start = write
+    on_node_end = write
+    on_join_start = write
+    on_join_end = write
+    on_cache_hit = write
+    on_skip = write
+
+
+class PrometheusTextfileExporter(ExecutionCallback):
+    """
+    Writes metrics of the latest execution to a file in the Prometheus text format, which can be
+    collected by the textfile collector of node_exporter.
+
+    The file is rewritten atomically at the end of each execution.
+    """
+
+    def __init__(self, path: str | pathlib.Path, prefix: str = "pytred"):
+        """
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            Path of the metrics file. It should end with '.prom'.
+        prefix : str, default 'pytred'
+            Prefix of metric names.
+        """
+        self.path = pathlib.Path(path)
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        # (metric name, labels) -> value
+        self._gauges: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+        self._counters: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+
+    def _set(self, metric: str, event: ExecutionEvent, value: float | None):
+        if value is not None:
+            self._gauges[(metric, self._labels(event))] = value
+
+    def _inc(self, metric: str, event: ExecutionEvent):
+        key = (metric, self._labels(event))
+        self._counters[key] = self._counters.get(key, 0) + 1
+
+    @staticmethod
+    def _labels(event: ExecutionEvent) -> tuple[tuple[str, str], ...]:
+        if event.name is None:
+            return (("hub", event.hub),)
+        return (("hub", event.hub), ("node", event.name))
+
+    def on_node_end(self, event: ExecutionEvent):
+        with self._lock:
+            self._set("node_duration_seconds", event, event.elapsed_seconds)
+            self._set("node_rows", event, event.n_rows)
+            self._set("node_bytes", event, event.size)
+            self._set("node_skipped", event, 0)
+
+    def on_join_end(self, event: ExecutionEvent):
+        with self._lock:
+            self._set("join_duration_seconds", event, event.elapsed_seconds)
+            self._set("join_rows", event, event.n_rows)
+            self._set("join_bytes", event, event.size)
+
+    def on_cache_hit(self, event: ExecutionEvent):
+        with self._lock:
+            self._inc("cache_hits_total", event)
+
+    def on_skip(self, event: ExecutionEvent):
+        with self._lock:
+            self._set("node_skipped", event, 1)
+
+    def on_execute_end(self, event: ExecutionEvent):
+        with self._lock:
+            self._set("execute_duration_seconds", event, event.elapsed_seconds)
+            self._set("execute_rows", event, event.n_rows)
+            self._inc("executions_total", event)
+            # the temporary file is unique per thread, e.g. of other exporters of the same path
+            tmp_path = self.path.with_name(
+                f".{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            tmp_path.write_text(self.format())
+            os.replace(tmp_path, self.path)
+
+    def format(self) -> str:
+        """
+        Returns metrics in the Prometheus text format.
+        """
+        lines = []
+        for metrics, metric_type in [(self._gauges, "gauge"), (self._counters, "counter")]:
+            names = sorted({metric for metric, _ in metrics})
+            for metric in names:
+                lines.append(f"# TYPE {self.prefix}_{metric} {metric_type}")
+                for (name, labels), value in sorted(metrics.items()):
+                    if name != metric:
+                        continue
+                    label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                    lines.append(f"{self.prefix}_{metric}{{{label_text}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
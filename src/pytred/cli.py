@@ -1,13 +1,20 @@
 from __future__ import annotations
 
 import argparse
-import importlib.util
 import json
 from logging import getLogger
+import sys
+from typing import Literal
+
+import polars as pl
 
 import pytred
+from pytred.data_node import DataNode
 from pytred.data_node import EmptyDataNode
 from pytred.helpers import visualize
+from pytred.helpers.loader import load_datahub_class
+from pytred.helpers.loader import load_report_datahub_class
+from pytred.prefetch import read_table
 
 
 logger = getLogger(__name__)
@@ -24,8 +31,89 @@ def get_parser():
     parser_report.add_argument("file_path")
     parser_report.add_argument("class_name")
     parser_report.add_argument("--input-table", action="append", dest="inputs_table")
+    parser_report.add_argument(
+        "--mode",
+        choices=["auto", "static", "import"],
+        default="auto",
+        help="'static' parses the file without importing it, 'import' imports it, and 'auto' "
+        "parses it and imports it only if the class cannot be built statically.",
+    )
     parser_report.set_defaults(func=cli_report)
 
+    # make reports of all DataHub classes in a directory
+    parser_report_batch = subparsers.add_parser(
+        "report-batch", help="see 'pytred report-batch -h'"
+    )
+    parser_report_batch.add_argument("directory")
+    parser_report_batch.add_argument("--output-dir", required=True)
+    parser_report_batch.add_argument(
+        "--jobs", type=int, default=None, help="number of worker processes"
+    )
+    parser_report_batch.add_argument(
+        "--mode", choices=["auto", "static", "import"], default="auto"
+    )
+    parser_report_batch.add_argument(
+        "--no-cache", action="store_false", dest="use_cache", help="render unchanged hubs again"
+    )
+    parser_report_batch.set_defaults(func=cli_report_batch)
+
+    # compare performance history
+    parser_history = subparsers.add_parser(
+        "history-compare", help="see 'pytred history-compare -h'"
+    )
+    parser_history.add_argument("history_path", help="SQLite file written by HistoryRecorder")
+    parser_history.add_argument("hub", help="name of the DataHub class")
+    parser_history.add_argument("--run-id", type=int, default=None, help="defaults to the latest")
+    parser_history.add_argument(
+        "--baseline", type=int, default=None, help="run id of the baseline"
+    )
+    parser_history.add_argument(
+        "--baseline-runs",
+        type=int,
+        default=5,
+        help="number of previous runs whose median is the baseline",
+    )
+    parser_history.add_argument("--time-threshold", type=float, default=0.2)
+    parser_history.add_argument("--size-threshold", type=float, default=0.2)
+    parser_history.add_argument("--min-seconds", type=float, default=0.01)
+    parser_history.set_defaults(func=cli_history_compare)
+
+    # serve datahub
+    parser_serve = subparsers.add_parser("serve", help="see 'pytred serve -h'")
+    parser_serve.add_argument("file_path")
+    parser_serve.add_argument("class_name")
+    parser_serve.add_argument(
+        "--input-table",
+        action="append",
+        dest="inputs_table",
+        help='JSON like {"name": "users", "path": "users.parquet", "keys": ["id"]}',
+    )
+    parser_serve.add_argument(
+        "--root-table", help="file of root_df. Its schema is used to parse requests."
+    )
+    parser_serve.add_argument("--host", default="127.0.0.1")
+    parser_serve.add_argument("--port", type=int, default=8000)
+    parser_serve.add_argument("--unix-socket", help="serve on this Unix domain socket")
+    parser_serve.add_argument("--max-batch-rows", type=int, default=1024)
+    parser_serve.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser_serve.set_defaults(func=cli_serve)
+
+    # re-execute changed functions on saving the file
+    parser_watch = subparsers.add_parser("watch", help="see 'pytred watch -h'")
+    parser_watch.add_argument("file_path")
+    parser_watch.add_argument("class_name")
+    parser_watch.add_argument(
+        "--input-table",
+        action="append",
+        dest="inputs_table",
+        help='JSON like {"name": "users", "path": "users.parquet", "keys": ["id"]}',
+    )
+    parser_watch.add_argument("--root-table", help="file of root_df")
+    parser_watch.add_argument(
+        "--interval", type=float, default=0.5, help="seconds between checks of the file"
+    )
+    parser_watch.set_defaults(func=cli_watch)
+
     return parser
 
 
@@ -40,17 +128,16 @@ def cli():
         parser.parse_args(["--help"])
 
 
-def cli_report(file_path: str, class_name: str, inputs_table: list[str]):
+def cli_report(
+    file_path: str,
+    class_name: str,
+    inputs_table: list[str] | None,
+    mode: Literal["auto", "static", "import"] = "auto",
+):
 
     # parse inputs_table and make EmptyDataNode
     data_nodes = []
-    for input_table_str in inputs_table:
-        try:
-            table = json.loads(input_table_str)
-        except json.decoder.JSONDecodeError as e:
-            logger.exception(f"Failed to parse {input_table_str}")
-            raise e
-
+    for table in parse_input_tables(inputs_table):
         data_nodes.append(
             EmptyDataNode(
                 name=table["name"],
@@ -59,17 +146,156 @@ def cli_report(file_path: str, class_name: str, inputs_table: list[str]):
             )
         )
 
-    # import target class
-    spec = importlib.util.spec_from_file_location("visualize_datahub", file_path)
-    if spec is None:
-        raise FileNotFoundError(f"{file_path} is not found.")
-    module = importlib.util.module_from_spec(spec)
-    if module is None:
-        raise RuntimeError(f"Failed to convert {file_path} to module.")
-    spec.loader.exec_module(module)  # type: ignore
-
-    target_datahub_class = getattr(module, class_name)
+    target_datahub_class = load_report_datahub_class(file_path, class_name, mode)
 
     # print report
     report = visualize.report_datahub(target_datahub_class, *data_nodes)
     print(report)
+
+
+def cli_report_batch(
+    directory: str,
+    output_dir: str,
+    jobs: int | None,
+    mode: Literal["auto", "static", "import"],
+    use_cache: bool,
+):
+    from pytred.helpers.batch_report import report_directory
+
+    result = report_directory(
+        directory, output_dir, max_workers=jobs, mode=mode, use_cache=use_cache
+    )
+    print(
+        f"Rendered {len(result.rendered)}, skipped {len(result.skipped)} unchanged, "
+        f"failed {len(result.failed)}."
+    )
+    for name, error in result.failed.items():
+        print(f"  {name}: {error}", file=sys.stderr)
+    if result.failed:
+        sys.exit(1)
+
+
+def cli_history_compare(
+    history_path: str,
+    hub: str,
+    run_id: int | None,
+    baseline: int | None,
+    baseline_runs: int,
+    time_threshold: float,
+    size_threshold: float,
+    min_seconds: float,
+):
+    from pytred.history import PerformanceHistory
+
+    report = PerformanceHistory(history_path).compare(
+        hub,
+        run_id=run_id,
+        baseline=baseline,
+        baseline_runs=baseline_runs,
+        time_threshold=time_threshold,
+        size_threshold=size_threshold,
+        min_seconds=min_seconds,
+    )
+    print(report.summary())
+    if report.has_regressions:
+        sys.exit(1)
+
+
+def cli_serve(
+    file_path: str,
+    class_name: str,
+    inputs_table: list[str] | None,
+    root_table: str | None,
+    host: str,
+    port: int,
+    unix_socket: str | None,
+    max_batch_rows: int,
+    max_wait_ms: float,
+):
+    from pytred.server import make_server
+
+    target_datahub_class = load_datahub_class(file_path, class_name)
+
+    data_nodes = read_input_tables(inputs_table)
+    root_df = pl.DataFrame() if root_table is None else read_table(root_table)
+
+    datahub = target_datahub_class(root_df, *data_nodes)
+    compiled = datahub.compile()
+
+    server = make_server(
+        compiled,
+        host=host,
+        port=port,
+        unix_socket=unix_socket,
+        max_batch_rows=max_batch_rows,
+        max_wait_seconds=max_wait_ms / 1000,
+    )
+    if unix_socket is None:
+        address = "http://{}:{}".format(*server.server_address[:2])  # type: ignore[index]
+    else:
+        address = unix_socket
+    print(f"Serving {class_name} on {address}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def cli_watch(
+    file_path: str,
+    class_name: str,
+    inputs_table: list[str] | None,
+    root_table: str | None,
+    interval: float,
+):
+    from pytred.watch import WatchSession
+
+    session = WatchSession(
+        file_path,
+        class_name,
+        pl.DataFrame() if root_table is None else read_table(root_table),
+        *read_input_tables(inputs_table),
+    )
+    print(f"Watching {file_path}", flush=True)
+    try:
+        for df in session.watch(interval=interval):
+            print(
+                f"Executed {len(session.last_executed)} of {len(session.fingerprints) - 1} "
+                f"functions in {session.last_elapsed_seconds:.3f}s: "
+                f"{', '.join(session.last_executed) or '-'}",
+                flush=True,
+            )
+            print(df, flush=True)
+    except KeyboardInterrupt:
+        pass
+
+
+def read_input_tables(inputs_table: list[str] | None) -> list[DataNode]:
+    """
+    Read files of --input-table options into DataNodes.
+    """
+    return [
+        DataNode(
+            read_table(table["path"]),
+            keys=table.get("keys", None),
+            join=table.get("join", None),
+            name=table["name"],
+        )
+        for table in parse_input_tables(inputs_table)
+    ]
+
+
+def parse_input_tables(inputs_table: list[str] | None) -> list[dict]:
+    """
+    Parse JSON strings of --input-table options.
+    """
+    tables = []
+    for input_table_str in inputs_table or []:
+        try:
+            tables.append(json.loads(input_table_str))
+        except json.decoder.JSONDecodeError as e:
+            logger.exception(f"Failed to parse {input_table_str}")
+            raise e
+    return tables
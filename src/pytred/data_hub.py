@@ -1,35 +1,104 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+from collections.abc import Collection
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Mapping
+from collections.abc import MutableMapping
 from collections.abc import Sequence
+import copy
+from dataclasses import replace
 from functools import reduce
 import inspect
+from itertools import groupby
 from logging import getLogger
 from operator import and_
+import time
 from typing import Literal
 
 import polars as pl
 
+from pytred.callbacks import ExecutionCallback
+from pytred.callbacks import emit_event
 from pytred.data_node import DataEdge
 from pytred.data_node import DataflowGraph
 from pytred.data_node import DataflowNode
 from pytred.data_node import DataNode
 from pytred.data_node import EmptyDataNode
+from pytred.data_node import ExpressionNode
+from pytred.decorators.polars import build_output_functions
+from pytred.dry_run import DryRunReport
 from pytred.exceptions import TableNotFoundError
+from pytred.helpers.coalesce import coalesce_join_nodes
+from pytred.helpers.coalesce import group_coalescible_joins
+from pytred.helpers.compaction import CompactionResult
+from pytred.helpers.compaction import compact_tables
+from pytred.helpers.critical_path import CriticalPathReport
+from pytred.helpers.critical_path import compute_critical_path
 from pytred.helpers.decorator import get_metadata
+from pytred.helpers.duckdb_join import DUCKDB_JOIN_METHODS
+from pytred.helpers.duckdb_join import join_with_duckdb
+from pytred.helpers.fanout import FANOUT_JOIN_METHODS
+from pytred.helpers.fanout import FanoutEstimate
+from pytred.helpers.fanout import FanoutPolicy
+from pytred.helpers.fanout import check_fanout
+from pytred.helpers.fanout import estimate_fanout
+from pytred.helpers.ordered_join import get_join_columns
+from pytred.helpers.ordered_join import join_data_node
+from pytred.helpers.sampling import sample_by_keys
+from pytred.helpers.surrogate import encode_surrogate_keys
+from pytred.nested import NestedDataHub
+from pytred.partition import execute_partitioned
+from pytred.prefetch import FileDataNode
+from pytred.prefetch import PrefetchingTableStore
+from pytred.serving import CompiledDataHub
+from pytred.spill import SpillableTableStore
+from pytred.spill import SpilledDataNode
+from pytred.statistics import StatisticsCatalog
+from pytred.statistics import collect_statistics
+from pytred.statistics import estimate_join_rows
 
 
 logger = getLogger(__name__)
 
+# Functions can receive root_df by the argument of this name
+ROOT_TABLE_NAME = "root_df"
+
 
 class DataHub:
     table_join_info: dict[str, str] | None = None
     table_join_keys: dict[str, Sequence[str]] | None = None
     registerd_tables_order: dict[str, int] | None = None
 
+    # If True, dtypes of root_df and joined tables are compacted before joins in steps()
+    compact_dtypes: bool = False
+    # If True, composite join keys shared by tables are joined on a single integer key
+    surrogate_keys: bool = False
+    # If True, consecutive joins with the same join type and keys are coalesced into one join
+    # when the tables are aligned or not larger than the left table
+    coalesce_joins: bool = False
+    # Callbacks receiving events of execution
+    callbacks: Sequence[ExecutionCallback] = ()
+    # Policies for joins whose keys are not unique: 'warn', 'raise' or the maximum fan-out
+    # factor, by table name. The default policy applies to tables which are not in the dict.
+    fanout_policies: dict[str, FanoutPolicy] | None = None
+    default_fanout_policy: FanoutPolicy | None = None
+    # Memory budget and number of threads of input files read ahead of the functions using them
+    prefetch_memory_limit: int | str = "1GB"
+    prefetch_workers: int = 2
+    # If True, statistics of root_df, input tables and tables of functions are collected into
+    # `self.statistics` on execution. If `statistics_path` is set, statistics are also collected,
+    # and saved to the JSON file after each run, so that they persist between runs.
+    collect_statistics: bool = False
+    statistics_path: str | None = None
+    # Maximum number of rows statistics of keys are computed from. None uses all rows.
+    statistics_sample_size: int | None = 100_000
+
     def __init__(
         self,
         root_df: pl.DataFrame,
-        *tables: DataNode,
+        *tables: DataNode | FileDataNode,
         **named_tables: pl.DataFrame,
     ):
         """
@@ -40,8 +109,9 @@ class DataHub:
         ----------
         root_df: pl.DataFrame
             The base DataFrame to be used as the primary table.
-        tables: DataNode
-            Positional arguments for DataNode objects to be registered.
+        tables: DataNode or FileDataNode
+            Positional arguments for DataNode objects to be registered. Tables of FileDataNode
+            are read in background threads before the functions which use them.
         **named_tables: pl.DataFrame
             Keyword arguments for named DataFrames or DataNodes to be registered.
         """
@@ -49,7 +119,7 @@ class DataHub:
         self.root_df = root_df
 
         # parse additional tables
-        input_tables: list[DataNode] = []
+        input_tables: list[DataNode | FileDataNode] = []
         # tables of positional arguments
         if len(tables) >= 1:
             data_nodes = self.validate_tables_is_node(*tables)
@@ -58,8 +128,23 @@ class DataHub:
         if len(named_tables) >= 1:
             input_tables += self.parse_tables_to_node(**named_tables)
 
-        self.tables: dict[str, DataNode] = {}
+        # input tables shared by execution contexts
+        self._input_tables: dict[str, DataNode | FileDataNode] = {}
+        self.tables: MutableMapping[str, DataNode | EmptyDataNode] = {}
+        if any(isinstance(data_node, FileDataNode) for data_node in input_tables):
+            self.tables = PrefetchingTableStore(
+                memory_limit=self.prefetch_memory_limit, max_workers=self.prefetch_workers
+            )
         self.table_order = {}
+        self.compaction_report: dict[str, CompactionResult] = {}
+        self.fanout_report: dict[str, FanoutEstimate] = {}
+        self.callbacks = list(self.callbacks)
+        # statistics catalog shared by execution contexts
+        self.statistics = StatisticsCatalog(self.statistics_path, hub=self.__class__.__name__)
+        # whether inputs are sampled, whose statistics do not represent the inputs
+        self._is_sampled = False
+        # memory limit and spill directory set by set_memory_limit, applied to every execution
+        self._memory_limit: tuple[int | str, str | None] | None = None
 
         # User defined tables
         if self.registerd_tables_order is not None:
@@ -69,8 +154,12 @@ class DataHub:
         for data_node in input_tables:
             if data_node.name in self.tables.keys():
                 raise ValueError(f"{data_node.name} is duplicated.")
+            if data_node.name == ROOT_TABLE_NAME:
+                raise ValueError(f"'{ROOT_TABLE_NAME}' is reserved and can not be a table name.")
 
-            self.tables[data_node.name] = data_node
+            # FileDataNodes are registered only to PrefetchingTableStore
+            self.tables[data_node.name] = data_node  # type: ignore[assignment]
+            self._input_tables[data_node.name] = data_node
 
             self.table_order[data_node.name] = -1
 
@@ -84,6 +173,17 @@ class DataHub:
         """
         super().__init_subclass__(**kwargs)
 
+        # fuse functions of nested DataHubs and split functions of multiple outputs
+        for name, value in list(vars(cls).items()):
+            if isinstance(value, NestedDataHub):
+                for function_name, function in value.build_functions(name).items():
+                    setattr(cls, function_name, function)
+            elif hasattr(value, "__pytred_outputs__"):
+                for function_name, function in build_output_functions(name, value).items():
+                    if function_name in vars(cls):
+                        raise ValueError(f"{function_name} is duplicated in {cls.__name__}.")
+                    setattr(cls, function_name, function)
+
         cls.table_join_info = {}
         cls.table_join_keys = {}
         cls.registerd_tables_order = {}
@@ -97,13 +197,13 @@ class DataHub:
         cls.registerd_tables_order.update(table_order)
 
     @staticmethod
-    def validate_tables_is_node(*tables) -> list[DataNode]:
+    def validate_tables_is_node(*tables) -> list[DataNode | FileDataNode]:
         """
-        Validate `tables` are DataNode instance.
+        Validate `tables` are DataNode or FileDataNode instance.
         """
         input_data_node = []
         for data_node in tables:
-            if isinstance(data_node, DataNode):
+            if isinstance(data_node, (DataNode, FileDataNode)):
                 input_data_node.append(data_node)
             else:
                 raise TypeError(f"tables must be DataNode, not {type(data_node)}.")
@@ -182,32 +282,135 @@ class DataHub:
         """
         return self.execute(*filters)
 
-    def execute(self, *filters: pl.Expr) -> pl.DataFrame:
+    def execute(
+        self,
+        *filters: pl.Expr,
+        memory_limit: int | str | None = None,
+        spill_dir: str | None = None,
+        sample: float | None = None,
+        sample_keys: Sequence[str] | None = None,
+    ) -> pl.DataFrame:
         """
         Executes the data processing pipeline, including table creation, joins, and applying
         filter expressions.
 
+        Each call is executed on its own execution context, which shares the input tables with
+        the DataHub without copying them, so a DataHub can be executed concurrently from
+        multiple threads. Tables and reports of the latest finished call are set to `tables`,
+        `compaction_report` and `fanout_report`.
+
         Parameters
         ----------
         filters : pl.Expr
             Filter expressions to apply to the output DataFrame.
+        memory_limit : int or str, optional
+            Memory budget of tables, e.g. '48GB'. If given, tables are spilled to Arrow IPC
+            files when their total estimated size exceeds the budget, and reloaded when
+            functions or joins need them. Tables used latest are spilled first. Input tables
+            count toward the budget but are not spilled, since the DataHub holds them.
+        spill_dir : str, optional
+            Directory for spilled tables. Defaults to the system temporary directory.
+        sample : float, optional
+            Fraction of keys to be sampled for fast development runs. If given, root_df and
+            input tables having all `sample_keys` columns are sampled by the hash of the keys,
+            so that the same keys are kept in all tables and joins still match. Input tables
+            of the DataHub are not modified, and statistics are not collected from samples.
+        sample_keys : Sequence of str, optional
+            Key columns for sampling. Required if `sample` is given.
 
         Returns
         -------
         pl.DataFrame
             The resulting DataFrame after applying the data processing pipeline and filters.
         """
-        # On calling execute, annotated functions are executed to create each DataFrame as needed.
-        # if self.table_functions is not None:
-        if self.table_order is not None and max(v for v in self.table_order.values()) >= 0:
-            self.create_tables()
+        if sample is not None and not sample_keys:
+            raise ValueError("sample_keys must be given with sample.")
+        if memory_limit is None and self._memory_limit is not None:
+            memory_limit, default_spill_dir = self._memory_limit
+            spill_dir = spill_dir if spill_dir is not None else default_spill_dir
+
+        context = self._execution_context()
+        sampled_tables = []
+        try:
+            if sample is not None:
+                sampled_tables = context._sample_inputs(sample, sample_keys)  # type: ignore[arg-type]
+            return context._execute(*filters, memory_limit=memory_limit, spill_dir=spill_dir)
+        finally:
+            # samples are not published as input tables
+            for name in sampled_tables:
+                context.tables[name] = self._input_tables[name]  # type: ignore[assignment]
+            self._publish_execution_context(context)
+
+    def _execution_context(self) -> DataHub:
+        """
+        Returns a shallow copy of the DataHub with its own table store holding the input tables
+        and its own reports. Input DataFrames are shared since they are not modified.
+        """
+        context = copy.copy(self)
+        input_tables = list(self._input_tables.items())
+        if any(isinstance(node, FileDataNode) for _, node in input_tables):
+            context.tables = PrefetchingTableStore(
+                memory_limit=self.prefetch_memory_limit, max_workers=self.prefetch_workers
+            )
+        else:
+            context.tables = {}
+        for name, node in input_tables:
+            context.tables[name] = node  # type: ignore[assignment]
+        context.compaction_report = {}
+        context.fanout_report = {}
+        return context
+
+    def _publish_execution_context(self, context: DataHub):
+        """
+        Sets tables and reports of the finished execution context to the DataHub.
+        """
+        # files read by the context are shared by later calls
+        for name, node in list(self._input_tables.items()):
+            if isinstance(node, FileDataNode) and name in context.tables:
+                read_node = context._peek_table(name)
+                if isinstance(read_node, DataNode):
+                    self._input_tables[name] = read_node
+        # spilled files of the replaced tables are removed
+        self._close_table_store(context._table_store)
+        self.tables = context.tables
+        self.compaction_report = context.compaction_report
+        self.fanout_report = context.fanout_report
+
+    def _execute(
+        self,
+        *filters: pl.Expr,
+        memory_limit: int | str | None = None,
+        spill_dir: str | None = None,
+    ) -> pl.DataFrame:
+        """
+        Executes the pipeline on this execution context.
+        """
+        start = time.perf_counter()
+        self.emit_event("execute_start")
+
+        if memory_limit is not None:
+            self.set_memory_limit(memory_limit, spill_dir=spill_dir)
+
+        if self._collects_statistics:
+            self._collect_input_statistics()
 
-        # Validate to self.tables is not empty.
-        if self.tables is None or len(self.tables) == 0:
-            raise RuntimeError("There are not tables.")
+        if isinstance(self.tables, PrefetchingTableStore):
+            self.tables.start(self._prefetch_order())
+        try:
+            # On calling execute, annotated functions are executed to create each DataFrame as
+            # needed.
+            if self.table_order is not None and max(v for v in self.table_order.values()) >= 0:
+                self.create_tables()
+
+            # Validate to self.tables is not empty.
+            if self.tables is None or len(self.tables) == 0:
+                raise RuntimeError("There are not tables.")
 
-        # join table
-        df = self.steps()
+            # join table
+            df = self.steps()
+        finally:
+            if isinstance(self.tables, PrefetchingTableStore):
+                self.tables.close()
 
         # processing of joined dataframe
         df = self.post_step(df)
@@ -216,8 +419,214 @@ class DataHub:
         if filters:
             df = df.filter(reduce(and_, filters))
 
+        if self._collects_statistics and self.statistics_path is not None:
+            self.statistics.save()
+
+        self.emit_event(
+            "execute_end",
+            elapsed_seconds=time.perf_counter() - start,
+            n_rows=df.height,
+            size=int(df.estimated_size()),
+        )
+        return df
+
+    def _sample_inputs(self, fraction: float, keys: Sequence[str]) -> list[str]:
+        """
+        Replaces root_df and input tables having the key columns with their samples by the hash
+        of the keys. This is called on execution contexts.
+
+        Returns
+        -------
+        list of str
+            Names of sampled input tables.
+        """
+        original_nodes = {
+            name: node
+            for name, node in self.tables.items()
+            if self.table_order.get(name) == -1
+            and isinstance(node, DataNode)
+            and set(keys).issubset(node.table.columns)
+        }
+        is_root_sampled = set(keys).issubset(self.root_df.columns)
+        if not original_nodes and not is_root_sampled:
+            raise ValueError(f"There are no tables which have the sample keys {list(keys)}.")
+        logger.info(
+            f"Sample {fraction} of keys {list(keys)} of tables: "
+            f"{([ROOT_TABLE_NAME] if is_root_sampled else []) + list(original_nodes)}"
+        )
+
+        # the same values of keys must be hashed with the same dtypes in all tables
+        frames = [self.root_df] if is_root_sampled else []
+        frames += [node.table for node in original_nodes.values()]
+        key_dtypes = dict(frames[0].select(keys).schema)
+
+        if is_root_sampled:
+            self.root_df = sample_by_keys(self.root_df, keys, fraction, key_dtypes=key_dtypes)
+        for name, node in original_nodes.items():
+            sampled = sample_by_keys(node.table, keys, fraction, key_dtypes=key_dtypes)
+            self.tables[name] = replace(node, table=sampled)
+        self._is_sampled = True
+        return list(original_nodes)
+
+    def execute_partitioned(
+        self,
+        *filters: pl.Expr,
+        keys: Sequence[str],
+        n_partitions: int,
+        max_workers: int | None = None,
+    ) -> pl.DataFrame:
+        """
+        Executes the data processing pipeline per hash partition of `keys` in parallel worker
+        processes.
+
+        root_df and tables having the key columns are split into `n_partitions` partitions by
+        the hash of the keys. Functions declared with `is_key_local=True` and joins are executed
+        per partition in worker processes, and the other functions are executed once in this
+        process and their tables are split or passed to all partitions. Key-local functions
+        whose tables are used by functions executed once are executed once too.
+        post_step and filters are applied to the concatenated result.
+
+        Parameters
+        ----------
+        filters : pl.Expr
+            Filter expressions to apply to the output DataFrame.
+        keys : Sequence of str
+            Partition keys. root_df must have these columns.
+        n_partitions : int
+            Number of partitions.
+        max_workers : int, optional
+            Maximum number of worker processes. Defaults to n_partitions.
+
+        Returns
+        -------
+        pl.DataFrame
+            The resulting DataFrame. The row order is not kept.
+
+        Notes
+        -----
+        The DataHub is sent to workers by pickle, so the DataHub class must be importable.
+        Dtype compaction is not applied.
+        """
+        start = time.perf_counter()
+        self.emit_event("execute_start")
+
+        df = execute_partitioned(self, keys, n_partitions, max_workers=max_workers)
+        df = self.post_step(df)
+        if filters:
+            df = df.filter(reduce(and_, filters))
+
+        self.emit_event(
+            "execute_end",
+            elapsed_seconds=time.perf_counter() - start,
+            n_rows=df.height,
+            size=int(df.estimated_size()),
+        )
         return df
 
+    def add_callback(self, callback: ExecutionCallback):
+        """
+        Registers a callback receiving events of execution.
+
+        Parameters
+        ----------
+        callback : ExecutionCallback
+            Callback such as JsonLinesExporter or PrometheusTextfileExporter.
+        """
+        self.callbacks = [*self.callbacks, callback]
+
+    def emit_event(self, event: str, **kwargs):
+        """
+        Calls `on_{event}` of registered callbacks.
+        """
+        emit_event(self.callbacks, event, self.__class__.__name__, **kwargs)
+
+    def set_memory_limit(self, memory_limit: int | str, spill_dir: str | None = None):
+        """
+        Replaces `self.tables` with a SpillableTableStore which keeps tables in memory under
+        `memory_limit`. The limit also applies to later calls of `execute` without
+        `memory_limit`.
+
+        Parameters
+        ----------
+        memory_limit : int or str
+            Memory budget of tables, e.g. '48GB'. Input tables count toward the budget but are
+            not spilled.
+        spill_dir : str, optional
+            Directory for spilled tables. Defaults to the system temporary directory.
+        """
+        self._memory_limit = (memory_limit, spill_dir)
+        schedule = [
+            (name, arg_table_names)
+            for _, name, arg_table_names in self.collect_table_and_arguments(self.table_order)
+        ]
+        joined_tables = [
+            name
+            for name in self.table_order
+            if (name in self.tables and self._peek_table(name).join is not None)
+            or (self.table_join_info or {}).get(name) is not None
+        ]
+        # input tables are held by the DataHub, so spilling them does not release memory
+        resident_tables = [
+            name
+            for name, node in self._input_tables.items()
+            if name in self._table_store and self._table_store[name] is node
+        ]
+        store = SpillableTableStore(
+            memory_limit,
+            schedule=schedule,
+            joined_tables=joined_tables,
+            spill_dir=spill_dir,
+            resident_tables=resident_tables,
+        )
+        for name in list(self._table_store):
+            store[name] = self._table_store[name]
+        store.position = 0
+        self._close_table_store(store)
+        if isinstance(self.tables, PrefetchingTableStore):
+            # files are read into the spillable store
+            self.tables.inner = store
+        else:
+            self.tables = store
+
+    def _close_table_store(self, new_store: MutableMapping[str, DataNode | EmptyDataNode]):
+        """
+        Removes spilled files of the current store of tables, which is replaced by new_store.
+        """
+        if self._table_store is not new_store and isinstance(
+            self._table_store, SpillableTableStore
+        ):
+            self._table_store.close()
+
+    @property
+    def _table_store(self) -> MutableMapping[str, DataNode | EmptyDataNode]:
+        """
+        Store of tables in memory, which is wrapped by PrefetchingTableStore if input tables
+        are read from files.
+        """
+        if isinstance(self.tables, PrefetchingTableStore):
+            return self.tables.inner
+        return self.tables
+
+    def _peek_table(self, name: str) -> DataNode | EmptyDataNode | FileDataNode | SpilledDataNode:
+        """
+        Returns the node without reading files or reloading spilled tables.
+        """
+        if isinstance(self.tables, (SpillableTableStore, PrefetchingTableStore)):
+            return self.tables.peek(name)
+        return self.tables[name]
+
+    def _prefetch_order(self) -> list[str]:
+        """
+        Names of tables in the order in which they are first used by functions and joins.
+        """
+        order = [
+            table_name
+            for _, _, arg_table_names in self.collect_table_and_arguments(self.table_order)
+            for table_name in arg_table_names
+        ]
+        order += [name for name, _ in sorted(self.table_order.items(), key=lambda x: x[1])]
+        return list(dict.fromkeys(order))
+
     def steps(self) -> pl.DataFrame:
         """
         Joins root_df and each tables according to the specified join conditions.
@@ -229,20 +638,229 @@ class DataHub:
         """
         if self.table_order is None:
             raise RuntimeError("Unexpected Error: table_order is None.")
-        df = self.root_df.clone()
+        root_df = self.root_df
+        join_nodes: Iterable[DataNode] = self._iter_join_nodes()
+
+        if self.compact_dtypes:
+            join_nodes = list(join_nodes)
+            root_df, join_nodes = self.compact_join_tables(root_df, join_nodes)
+
+        surrogate_columns: list[str] = []
+        if self.surrogate_keys:
+            root_df, join_nodes, surrogate_columns = encode_surrogate_keys(
+                root_df, list(join_nodes)
+            )
+
+        df = self._apply_expression_nodes(
+            root_df.clone(), [self._peek_table(name) for name in self.table_order]
+        )
+        for is_duckdb, nodes in groupby(join_nodes, key=self._is_duckdb_join):
+            if is_duckdb:
+                # consecutive joins of DuckDB tables are executed in one query and reported as
+                # one join event
+                duckdb_nodes = list(nodes)
+                n_rows = df.height
+                for table_node in duckdb_nodes:
+                    n_rows = self.check_join_fanout(table_node, n_rows)
+                name = ",".join(node.name for node in duckdb_nodes)
+                start = self._emit_join_start(name, df)
+                df = join_with_duckdb(df, duckdb_nodes)
+                self._emit_join_end(name, df, start)
+                continue
+            if self.coalesce_joins:
+                groups = group_coalescible_joins(df.columns, nodes, max_rows=df.height)
+            else:
+                groups = ([table_node] for table_node in nodes)
+            for group in groups:
+                n_rows = df.height
+                for table_node in group:
+                    n_rows = self.check_join_fanout(table_node, n_rows)
+                table_node = coalesce_join_nodes(group) if len(group) > 1 else group[0]
+                start = self._emit_join_start(table_node.name, df)
+                df = join_data_node(df, table_node)
+                self._emit_join_end(table_node.name, df, start)
+        return df.drop(surrogate_columns)
+
+    def _apply_expression_nodes(self, df: pl.DataFrame, nodes: Iterable[object]) -> pl.DataFrame:
+        """
+        Adds columns of expressions of ExpressionNodes among nodes to df by a single
+        `with_columns`, so that polars evaluates them in parallel in one pass over df.
+        Expressions are evaluated in the order of functions, and the evaluation is reported as
+        one join event.
+        """
+        expression_nodes = sorted(
+            (node for node in nodes if isinstance(node, ExpressionNode)),
+            key=lambda node: self.table_order[node.name],
+        )
+        if not expression_nodes:
+            return df
+        name = ",".join(node.name for node in expression_nodes)
+        start = self._emit_join_start(name, df)
+        df = df.with_columns([expr for node in expression_nodes for expr in node.exprs])
+        self._emit_join_end(name, df, start)
+        return df
+
+    def _emit_join_start(self, name: str, df: pl.DataFrame) -> float:
+        self.emit_event("join_start", name=name, n_rows=df.height)
+        return time.perf_counter()
+
+    def _emit_join_end(self, name: str, df: pl.DataFrame, start: float):
+        if self.callbacks:
+            self.emit_event(
+                "join_end",
+                name=name,
+                elapsed_seconds=time.perf_counter() - start,
+                n_rows=df.height,
+                size=int(df.estimated_size()),
+            )
+
+    def check_join_fanout(self, table_node: DataNode, left_rows: int) -> int:
+        """
+        Estimates the fan-out of the join from key statistics of the joined table and applies
+        the fan-out policy of the table. Estimates are stored in `self.fanout_report`.
+
+        Parameters
+        ----------
+        table_node : DataNode
+            DataNode to be joined.
+        left_rows : int
+            Number of rows of the left table.
+
+        Returns
+        -------
+        int
+            Estimated number of rows after the join.
+
+        Raises
+        ------
+        JoinFanoutError
+            If the fan-out violates the policy.
+        """
+        policy = (self.fanout_policies or {}).get(table_node.name, self.default_fanout_policy)
+        if policy is None or table_node.join not in FANOUT_JOIN_METHODS or not table_node.keys:
+            return left_rows
+
+        estimate = estimate_fanout(left_rows, table_node.table, table_node.keys, table_node.name)
+        self.fanout_report[table_node.name] = estimate
+        check_fanout(estimate, policy)
+        return estimate.estimated_rows
 
+    @staticmethod
+    def _is_duckdb_join(table_node: DataNode) -> bool:
+        return table_node.engine == "duckdb" and table_node.join in DUCKDB_JOIN_METHODS
+
+    def _iter_join_nodes(self) -> Iterator[DataNode]:
+        """
+        Yields DataNodes to be joined with root_df in the join order.
+        Spilled tables are reloaded one by one.
+        """
+        aggregation_sources = self._aggregation_sources()
+        fused_tables: set[str] = set()
         for name, _ in sorted(self.table_order.items(), key=lambda x: x[1]):
-            table_node = self.tables[name]
+            if name in fused_tables:
+                continue
+            table_node = self._peek_table(name)
             if table_node.join is None or isinstance(table_node, EmptyDataNode):
                 # This is used only preprocessing.
                 continue
-            df = df.join(
-                table_node.table,
-                on=table_node.keys,
-                how=table_node.join,
-                suffix=f"_{table_node.name}",
+            table_node = self.tables[name]
+            if not isinstance(table_node, DataNode):
+                continue
+            if name in aggregation_sources:
+                # aggregations of the same source, keys and join type are joined at once
+                members = [
+                    member
+                    for member, source in aggregation_sources.items()
+                    if member != name
+                    and member not in fused_tables
+                    and source == aggregation_sources[name]
+                    and member in self.tables
+                    and not isinstance(self._peek_table(member), EmptyDataNode)
+                    and self._peek_table(member).join == table_node.join
+                ]
+                nodes = self._fusible_aggregation_nodes(
+                    table_node, [self.tables[member] for member in members]
+                )
+                if nodes:
+                    table_node = self._fuse_aggregation_nodes(table_node, nodes)
+                    fused_tables.update(node.name for node in nodes)
+                fused_tables.add(name)
+            yield table_node
+
+    @staticmethod
+    def _fusible_aggregation_nodes(
+        table_node: DataNode, nodes: Sequence[DataNode | EmptyDataNode]
+    ) -> list[DataNode]:
+        """
+        Returns DataNodes which are selections of the same aggregated DataFrame as table_node,
+        i.e. which have the same key columns, and whose columns do not collide.
+        """
+        keys = list(table_node.keys or [])
+        key_table = table_node.table.select(keys)
+        columns = set(table_node.table.columns)
+        fusible = []
+        for node in nodes:
+            if not isinstance(node, DataNode) or not node.table.select(keys).equals(key_table):
+                continue
+            value_columns = set(node.table.columns) - set(keys)
+            if value_columns & columns:
+                continue
+            columns |= value_columns
+            fusible.append(node)
+        return fusible
+
+    @staticmethod
+    def _fuse_aggregation_nodes(
+        table_node: DataNode, nodes: Sequence[DataNode | EmptyDataNode]
+    ) -> DataNode:
+        """
+        Combines tables of aggregations into one DataNode. The tables are selections of the
+        same aggregated DataFrame, so that their rows are in the same order.
+        """
+        keys = list(table_node.keys or [])
+        columns = [
+            column
+            for node in nodes
+            if isinstance(node, DataNode)
+            for column in node.table.drop(keys).iter_columns()
+        ]
+        return replace(
+            table_node,
+            table=table_node.table.hstack(columns),
+            name=",".join([table_node.name, *(node.name for node in nodes)]),
+        )
+
+    def compact_join_tables(
+        self, root_df: pl.DataFrame, join_nodes: list[DataNode]
+    ) -> tuple[pl.DataFrame, list[DataNode]]:
+        """
+        Compacts dtypes of root_df and tables to be joined.
+        Memory usage before and after compaction is stored in `self.compaction_report`.
+
+        Parameters
+        ----------
+        root_df : pl.DataFrame
+            The base DataFrame of joins.
+        join_nodes : list of DataNode
+            DataNodes to be joined with root_df.
+
+        Returns
+        -------
+        tuple of pl.DataFrame and list of DataNode
+            Compacted root_df and DataNodes. `self.tables` is not modified.
+        """
+        frames = {"root_df": root_df}
+        frames.update({node.name: node.table for node in join_nodes})
+        compacted, self.compaction_report = compact_tables(frames)
+
+        for result in self.compaction_report.values():
+            logger.info(
+                f"Compacted {result.name}: {result.original_size} -> {result.compacted_size} "
+                f"bytes ({result.saved_size} bytes saved)"
             )
-        return df
+
+        compacted_nodes = [replace(node, table=compacted[node.name]) for node in join_nodes]
+        return compacted["root_df"], compacted_nodes
 
     @classmethod
     def collect_table_and_arguments(
@@ -274,35 +892,526 @@ class DataHub:
         """
         Creates tables based on the annotated functions and their execution order.
         """
+        self._build_tables(self.tables, self.root_df, collect_statistics=self._collects_statistics)
+
+    @property
+    def _collects_statistics(self) -> bool:
+        if self._is_sampled:
+            return False
+        return self.collect_statistics or self.statistics_path is not None
+
+    def _collect_input_statistics(self):
+        """
+        Collects statistics of root_df and input tables. Tables of FileDataNodes are skipped,
+        since they are not read yet.
+        """
+        self._update_statistics(ROOT_TABLE_NAME, self.root_df)
+        for data_node in self._input_tables.values():
+            if isinstance(data_node, DataNode):
+                self._update_statistics(data_node.name, data_node.table, data_node.keys)
+
+    def _update_statistics(
+        self, name: str, table: pl.DataFrame, keys: Sequence[str] | None = None
+    ):
+        self.statistics.update(
+            collect_statistics(table, name, keys, sample_size=self.statistics_sample_size)
+        )
+
+    @classmethod
+    def _aggregation_sources(cls) -> dict[str, tuple[str, tuple[str, ...]]]:
+        """
+        Returns names of the source table and keys of aggregation functions, keyed by names of
+        the functions. Aggregations of functions with the same source and keys are fused.
+        """
+        if cls.registerd_tables_order is None:
+            return {}
+        return {
+            name: (arg_table_names[0], tuple(get_metadata(getattr(cls, name), "keys")))
+            for _, name, arg_table_names in cls.collect_table_and_arguments(
+                cls.registerd_tables_order
+            )
+            if get_metadata(getattr(cls, name), "is_aggregation")
+        }
+
+    def _aggregate(
+        self,
+        name: str,
+        tables: dict[str, DataNode | EmptyDataNode],
+        root_df: pl.DataFrame,
+        aggregations: dict[tuple[str, tuple[str, ...]], dict[str, tuple[pl.DataFrame, list[str]]]],
+        names: Collection[str] | None = None,
+    ) -> pl.DataFrame:
+        """
+        Returns the table of the aggregation function `name`.
+
+        Aggregations of all functions in `names` sharing the source table and keys are computed
+        by one `group_by(...).agg(...)` when the first of them is executed, and cached in
+        `aggregations` with the output columns of each function. The table of each function is a
+        selection of its columns. Functions whose output columns collide with columns of other
+        functions are aggregated separately.
+        """
+        aggregation_sources = self._aggregation_sources()
+        source_name, keys = aggregation_sources[name]
+        if (source_name, keys) not in aggregations:
+            source = self._get_argument_table(source_name, tables, root_df)
+            fused_exprs: list[pl.Expr] = []
+            fused_columns: dict[str, list[str]] = {}
+            separate_exprs: dict[str, list[pl.Expr]] = {}
+            for member, member_source in aggregation_sources.items():
+                if member_source != (source_name, keys) or (
+                    names is not None and member not in names
+                ):
+                    continue
+                member_exprs = getattr(self, member)(source)
+                # output names of expressions such as pl.col("a", "b").sum() are resolved by
+                # the schema of the aggregation
+                columns = (
+                    source.lazy().group_by(keys).agg(member_exprs).collect_schema().names()
+                )[len(keys) :]
+                if set(columns) & {c for cols in fused_columns.values() for c in cols}:
+                    separate_exprs[member] = member_exprs
+                    continue
+                fused_columns[member] = columns
+                fused_exprs.extend(member_exprs)
+
+            table = source.group_by(keys).agg(fused_exprs)
+            member_tables = {member: (table, cols) for member, cols in fused_columns.items()}
+            for member, member_exprs in separate_exprs.items():
+                member_table = source.group_by(keys).agg(member_exprs)
+                member_tables[member] = (member_table, member_table.columns[len(keys) :])
+            aggregations[(source_name, keys)] = member_tables
+
+        table, columns = aggregations[(source_name, keys)][name]
+        return table.select(*keys, *columns)
+
+    def _get_output(
+        self,
+        name: str,
+        arg_table_names: Sequence[str],
+        tables: dict[str, DataNode | EmptyDataNode],
+        root_df: pl.DataFrame,
+        outputs: dict[str, dict[str, pl.DataFrame]],
+    ) -> pl.DataFrame:
+        """
+        Returns the table `name` returned by a function of multiple outputs.
+
+        The function is executed when the first of its tables is created, and the other tables
+        are kept in `outputs` only until they are created.
+        """
+        source_name = get_metadata(getattr(self, name), "output_of")
+        if source_name not in outputs:
+            source_fn = getattr(self, source_name)
+            outputs[source_name] = source_fn(
+                *self._get_argument_tables(source_fn, arg_table_names, tables, root_df)
+            )
+        return outputs[source_name].pop(name)
+
+    def _build_tables(
+        self,
+        tables: dict[str, DataNode | EmptyDataNode],
+        root_df: pl.DataFrame,
+        names: Collection[str] | None = None,
+        collect_statistics: bool = False,
+    ):
+        """
+        Creates tables of the annotated functions into `tables`.
+
+        Parameters
+        ----------
+        tables : dict of str to DataNode
+            Tables passed to functions. Created tables are added to this dictionary.
+        root_df : pl.DataFrame
+            DataFrame passed to functions which have `root_df` argument.
+        names : Collection of str, optional
+            Names of functions to execute. If None, all functions are executed.
+        collect_statistics : bool
+            If True, statistics of created tables are collected into `self.statistics`.
+        """
+        aggregations: dict = {}
+        outputs: dict[str, dict[str, pl.DataFrame]] = {}
         for _, name, arg_table_names in self.collect_table_and_arguments(self.table_order):
+            if names is not None and name not in names:
+                continue
+
             # data processing function
             process_fn = getattr(self, name)
 
             # Collect argument tables that do not exist
-            missing_tables = [
-                t
-                for t in arg_table_names
-                if t not in self.tables or isinstance(self.tables[t], EmptyDataNode)
-            ]
+            missing_tables = self._find_missing_tables(
+                self._get_required_arguments(process_fn, arg_table_names), tables
+            )
             if get_metadata(process_fn, "is_optional") and missing_tables:
                 logger.debug(
                     f"Process '{name}' is skipped, because these tables are not found: "
                     f"{missing_tables}"
                 )
-                self.tables[name] = EmptyDataNode(
+                self.emit_event("skip", name=name, missing_tables=missing_tables)
+                tables[name] = EmptyDataNode(
                     name=name,
-                    join=self.table_join_info[name],
-                    keys=self.table_join_keys.get(name),
+                    join=get_metadata(process_fn, "join"),
+                    keys=get_metadata(process_fn, "keys"),
                     is_optional=True,
                 )
             else:
-                table = process_fn(*[self.get(table_name).table for table_name in arg_table_names])
-                self.tables[name] = DataNode(
+                self.emit_event("node_start", name=name)
+                start = time.perf_counter()
+                if get_metadata(process_fn, "is_aggregation"):
+                    table = self._aggregate(name, tables, root_df, aggregations, names)
+                elif get_metadata(process_fn, "output_of") is not None:
+                    table = self._get_output(name, arg_table_names, tables, root_df, outputs)
+                else:
+                    table = process_fn(
+                        *self._get_argument_tables(process_fn, arg_table_names, tables, root_df)
+                    )
+                if get_metadata(process_fn, "is_expression"):
+                    # expressions are evaluated together in `steps`
+                    self.emit_event(
+                        "node_end", name=name, elapsed_seconds=time.perf_counter() - start
+                    )
+                    tables[name] = ExpressionNode(table, name=name)  # type: ignore[assignment, arg-type]
+                    continue
+                if self.callbacks:
+                    self.emit_event(
+                        "node_end",
+                        name=name,
+                        elapsed_seconds=time.perf_counter() - start,
+                        n_rows=table.height,
+                        size=int(table.estimated_size()),
+                    )
+                tables[name] = DataNode(
                     table,
-                    self.table_join_keys.get(name),
-                    join=self.table_join_info[name],
+                    get_metadata(process_fn, "keys"),
+                    join=get_metadata(process_fn, "join"),
                     name=name,
+                    engine=get_metadata(process_fn, "engine"),
+                    join_options=get_metadata(process_fn, "join_options"),
+                )
+                if collect_statistics:
+                    self._update_statistics(name, table, get_metadata(process_fn, "keys"))
+
+    @classmethod
+    def _get_argument_tables(
+        cls,
+        process_fn: Callable,
+        arg_table_names: Sequence[str],
+        tables: dict[str, DataNode | EmptyDataNode],
+        root_df: pl.DataFrame,
+    ) -> list[pl.DataFrame | None]:
+        """
+        Returns the DataFrames passed to the arguments of functions.
+        Arguments with the default value None receive None if the table is missing or skipped.
+        """
+        missing_tables = set(cls._find_missing_tables(arg_table_names, tables)) - set(
+            cls._get_required_arguments(process_fn, arg_table_names)
+        )
+        return [
+            (
+                None
+                if table_name in missing_tables
+                else cls._get_argument_table(table_name, tables, root_df)
+            )
+            for table_name in arg_table_names
+        ]
+
+    @staticmethod
+    def _get_required_arguments(process_fn: Callable, arg_table_names: Sequence[str]) -> list[str]:
+        """
+        Returns names of arguments which do not have the default value None.
+        """
+        parameters = inspect.signature(process_fn).parameters
+        return [
+            table_name
+            for table_name in arg_table_names
+            if table_name not in parameters or parameters[table_name].default is not None
+        ]
+
+    @staticmethod
+    def _get_argument_table(
+        table_name: str, tables: dict[str, DataNode | EmptyDataNode], root_df: pl.DataFrame
+    ) -> pl.DataFrame:
+        """
+        Returns the DataFrame passed to the argument `table_name` of functions.
+        """
+        if table_name == ROOT_TABLE_NAME:
+            return root_df
+        table_node = tables.get(table_name)
+        if not isinstance(table_node, DataNode):
+            raise KeyError(
+                f"table '{table_name}' is not found: Current table list {tables.keys()}."
+            )
+        return table_node.table
+
+    @classmethod
+    def get_root_dependent_tables(cls) -> set[str]:
+        """
+        Returns names of functions which depend on root_df, that is, functions which have the
+        `root_df` argument and functions which depend on them.
+        """
+        if cls.registerd_tables_order is None:
+            return set()
+
+        root_dependent_tables: set[str] = set()
+        for _, name, arg_table_names in cls.collect_table_and_arguments(
+            cls.registerd_tables_order
+        ):
+            if any(t == ROOT_TABLE_NAME or t in root_dependent_tables for t in arg_table_names):
+                root_dependent_tables.add(name)
+        return root_dependent_tables
+
+    def compile(self) -> CompiledDataHub:
+        """
+        Compiles this DataHub for low-latency execution with small root_df.
+        Tables which do not depend on root_df are created once and indexed by join keys.
+
+        Returns
+        -------
+        CompiledDataHub
+            Callable which executes the pipeline with a new root_df.
+
+        Examples
+        --------
+        >>> compiled = datahub.compile()
+        >>> compiled(pl.DataFrame({"id": ["a"]}))
+        """
+        return CompiledDataHub(self)
+
+    @staticmethod
+    def _find_missing_tables(
+        arg_table_names: Sequence[str], tables: dict[str, DataNode | EmptyDataNode]
+    ) -> list[str]:
+        """
+        Collect argument tables that do not exist or are skipped.
+        """
+        return [
+            t
+            for t in arg_table_names
+            if t != ROOT_TABLE_NAME and (t not in tables or isinstance(tables[t], EmptyDataNode))
+        ]
+
+    def dry_run(self) -> DryRunReport:
+        """
+        Validates the pipeline without processing data.
+
+        Every function is called with zero-row tables which have the same schemas as the input
+        tables, and the resulting schemas are propagated through the join chain. Missing keys,
+        key dtype mismatches and suffix collisions are reported instead of raised.
+        `self.tables` is not modified.
+
+        Returns
+        -------
+        DryRunReport
+            Schemas of each table, the output schema and the issues found.
+        """
+        start = time.perf_counter()
+        report = DryRunReport(name=self.__class__.__name__)
+
+        tables = self._dry_run_tables(report)
+
+        # propagate schemas through the join chain
+        df: pl.DataFrame | None = self._dry_run_expressions(self.root_df.clear(), tables, report)
+        for name, _ in sorted(self.table_order.items(), key=lambda x: x[1]):
+            if df is None:
+                break
+            table_node = tables.get(name)
+            if not isinstance(table_node, DataNode) or table_node.join is None:
+                continue
+            df = self._dry_run_join(df, table_node, report)
+
+        if df is not None:
+            try:
+                df = self.post_step(df)
+                report.output_schema = df.schema
+            except Exception as err:
+                report.add_issue("post_step", "post_step_error", f"{type(err).__name__}: {err}")
+
+        report.elapsed_seconds = time.perf_counter() - start
+        return report
+
+    def _dry_run_tables(self, report: DryRunReport) -> dict[str, DataNode | EmptyDataNode]:
+        """
+        Calls each function of the dry run with zero-row tables and returns created tables.
+        """
+        root_df = self.root_df.clear()
+        tables: dict[str, DataNode | EmptyDataNode] = {}
+        for name in list(self.tables):
+            if self.table_order.get(name) != -1:
+                continue
+            data_node = self._peek_table(name)
+            if isinstance(data_node, EmptyDataNode):
+                continue
+            schema = self._dry_run_input_schema(data_node)
+            tables[name] = DataNode(
+                pl.DataFrame(schema=schema),
+                data_node.keys,
+                join=data_node.join,  # type: ignore[arg-type]
+                name=name,
+                engine=data_node.engine,
+                join_options=data_node.join_options,
+            )
+            report.schemas[name] = schema
+
+        # propagate schemas through functions
+        aggregations: dict = {}
+        for _, name, arg_table_names in self.collect_table_and_arguments(self.table_order):
+            process_fn = getattr(self, name)
+            empty_node = EmptyDataNode(
+                name=name,
+                join=get_metadata(process_fn, "join"),
+                keys=get_metadata(process_fn, "keys"),
+            )
+
+            missing_tables = self._find_missing_tables(
+                self._get_required_arguments(process_fn, arg_table_names), tables
+            )
+            if missing_tables:
+                if get_metadata(process_fn, "is_optional"):
+                    empty_node.is_optional = True
+                    report.skipped.append(name)
+                else:
+                    report.add_issue(
+                        name, "missing_table", f"input tables are not found: {missing_tables}"
+                    )
+                tables[name] = empty_node
+                continue
+
+            try:
+                if get_metadata(process_fn, "is_aggregation"):
+                    table = self._aggregate(name, tables, root_df, aggregations)
+                else:
+                    table = process_fn(
+                        *self._get_argument_tables(process_fn, arg_table_names, tables, root_df)
+                    )
+            except Exception as err:
+                report.add_issue(name, "function_error", f"{type(err).__name__}: {err}")
+                tables[name] = empty_node
+                continue
+
+            if get_metadata(process_fn, "is_expression"):
+                tables[name] = ExpressionNode(table, name=name)  # type: ignore[assignment, arg-type]
+                continue
+            tables[name] = DataNode(
+                table,
+                empty_node.keys,
+                join=empty_node.join,
+                name=name,
+                join_options=get_metadata(process_fn, "join_options"),
+            )
+            report.schemas[name] = table.schema
+
+        return tables
+
+    @staticmethod
+    def _dry_run_input_schema(data_node: DataNode | FileDataNode | SpilledDataNode) -> pl.Schema:
+        """
+        Returns the schema of an input table. Files and spilled tables are not read, but only
+        their schemas.
+        """
+        if isinstance(data_node, FileDataNode):
+            return data_node.schema
+        if isinstance(data_node, SpilledDataNode):
+            return pl.Schema(pl.read_ipc_schema(data_node.path))
+        return data_node.table.schema
+
+    def _dry_run_expressions(
+        self,
+        df: pl.DataFrame,
+        tables: dict[str, DataNode | EmptyDataNode],
+        report: DryRunReport,
+    ) -> pl.DataFrame | None:
+        """
+        Evaluates expressions of the dry run on zero-row root_df.
+        Returns None if the expressions can not be evaluated.
+        """
+        exprs: list[pl.Expr] = []
+        is_valid = True
+        for node in tables.values():
+            if not isinstance(node, ExpressionNode):
+                continue
+            try:
+                report.schemas[node.name] = df.select(node.exprs).schema
+            except Exception as err:
+                report.add_issue(node.name, "expression_error", f"{type(err).__name__}: {err}")
+                is_valid = False
+            exprs.extend(node.exprs)
+        return df.with_columns(exprs) if is_valid else None
+
+    @staticmethod
+    def _dry_run_keys(df: pl.DataFrame, table_node: DataNode, report: DryRunReport) -> bool:
+        """
+        Checks keys and columns of a join of the dry run. Returns False if they are invalid.
+        """
+        name = table_node.name
+        table = table_node.table
+
+        is_valid = True
+        # columns of 'asof' and 'range' joins other than keys
+        for column in get_join_columns(table_node):
+            if column not in table.columns:
+                is_valid = False
+                report.add_issue(
+                    name, "missing_key", f"column '{column}' is not found in columns of {name}."
+                )
+        for key in table_node.keys or []:
+            for side, frame in [("root_df", df), (name, table)]:
+                if key not in frame.columns:
+                    is_valid = False
+                    report.add_issue(
+                        name, "missing_key", f"key '{key}' is not found in columns of {side}."
+                    )
+            if key in df.columns and key in table.columns and df[key].dtype != table[key].dtype:
+                is_valid = False
+                report.add_issue(
+                    name,
+                    "key_dtype_mismatch",
+                    f"dtype of key '{key}' is {df[key].dtype} in root_df, "
+                    f"but {table[key].dtype} in {name}.",
                 )
+        return is_valid
+
+    @staticmethod
+    def _dry_run_join(
+        df: pl.DataFrame, table_node: DataNode, report: DryRunReport
+    ) -> pl.DataFrame | None:
+        """
+        Checks a join of the dry run and returns the joined zero-row DataFrame.
+        Returns None if the join can not be performed.
+        """
+        name = table_node.name
+        keys = list(table_node.keys or [])
+        if table_node.join == "asof":
+            # the `on` column of the table is not kept by 'asof' joins
+            keys += get_join_columns(table_node)
+        table = table_node.table
+
+        is_valid = DataHub._dry_run_keys(df, table_node, report)
+
+        suffix = f"_{name}"
+        for column in table.columns:
+            if column in keys or column not in df.columns:
+                continue
+            if f"{column}{suffix}" in df.columns or f"{column}{suffix}" in table.columns:
+                is_valid = False
+                report.add_issue(
+                    name,
+                    "suffix_collision",
+                    f"column '{column}' is renamed to '{column}{suffix}', which already exists.",
+                )
+            else:
+                report.add_issue(
+                    name,
+                    "suffix_applied",
+                    f"column '{column}' is renamed to '{column}{suffix}'.",
+                    severity="warning",
+                )
+
+        if not is_valid:
+            return None
+
+        try:
+            return join_data_node(df, table_node)
+        except Exception as err:
+            report.add_issue(name, "join_error", f"{type(err).__name__}: {err}")
+            return None
 
     @classmethod
     def search_tables(cls, *input_tables: EmptyDataNode) -> list:
@@ -348,6 +1457,75 @@ class DataHub:
 
         return processing_nodes
 
+    @classmethod
+    def critical_path(
+        cls, timings: Mapping[str, float], *input_tables: EmptyDataNode
+    ) -> CriticalPathReport:
+        """
+        Computes the critical path of the dataflow and the slack of each function from recorded
+        timings. Optimizing functions on the critical path reduces the end-to-end latency when
+        independent functions run in parallel, and functions with slack do not.
+
+        Parameters
+        ----------
+        timings : Mapping of str to float
+            Elapsed seconds of functions, e.g. `TimingRecorder.timings`.
+        input_tables : EmptyDataNode
+            Input tables of the DataHub.
+
+        Returns
+        -------
+        CriticalPathReport
+
+        Examples
+        --------
+        >>> recorder = TimingRecorder()
+        >>> datahub.add_callback(recorder)
+        >>> datahub.execute()
+        >>> print(type(datahub).critical_path(recorder.timings).summary())
+        """
+        return compute_critical_path(cls.search_tables(*input_tables), timings)
+
+    def explain(self) -> str:
+        """
+        Describes the plan of execution with statistics in `self.statistics`: tables in the
+        execution order, and joins in the join order with the estimated number of rows after
+        each join. The estimates assume that all rows of root_df match keys of joined tables,
+        so that fan-out of joins and skew of keys are found before running.
+
+        Statistics are collected by previous runs with `collect_statistics` or
+        `statistics_path`, and tables without statistics are shown with '?'.
+
+        Returns
+        -------
+        str
+
+        Examples
+        --------
+        >>> datahub = MyDataHub(root_df, users=users)  # MyDataHub.statistics_path is set
+        >>> print(datahub.explain())
+        """
+        lines = [f"{self.__class__.__name__}", "Tables:"]
+        for name, order in self.sort_tables_by_execute_order(self.table_order):
+            statistics = self.statistics.get(name)
+            summary = statistics.summary() if statistics is not None else "?"
+            lines.append(f"  [{order}] {name}: {summary}")
+
+        n_rows: float | None = self.root_df.height
+        lines.append(f"Joins (root_df: {n_rows} rows):")
+        for name, _ in self.sort_tables_by_execute_order(self.table_order):
+            if name in self._input_tables:
+                join, keys = self._input_tables[name].join, self._input_tables[name].keys
+            else:
+                process_fn = getattr(self, name)
+                join, keys = get_metadata(process_fn, "join"), get_metadata(process_fn, "keys")
+            if join is None:
+                continue
+            n_rows = estimate_join_rows(n_rows, join, self.statistics.get(name))
+            estimate = f"~{round(n_rows)}" if n_rows is not None else "?"
+            lines.append(f"  {join} join {name} on {list(keys or [])}: {estimate} rows")
+        return "\n".join(lines)
+
     @classmethod
     def _get_dataflow_node(cls, level: int, name: str) -> DataflowNode:
         """
@@ -389,7 +1567,7 @@ class DataHub:
         """
         return df
 
-    def get(self, table_name: str) -> DataNode:
+    def get(self, table_name: str) -> DataNode | EmptyDataNode:
         """
         Retrieves a DataNode by its name.
 
@@ -400,8 +1578,8 @@ class DataHub:
 
         Returns
         -------
-        DataNode
-            The requested DataNode object.
+        DataNode or EmptyDataNode
+            The requested DataNode object. EmptyDataNode is returned for skipped optional tables.
 
         Raises
         ------
@@ -456,10 +1634,10 @@ class DataHub:
                 graph.add_edge(edge)
 
             # if node does not parents, make invisible edge
-            if len(_node.parents) == 0 and _node.level >= 0:
+            nodes_in_before_level = graph.get_nodes_by_level(_node.level - 1)
+            if len(_node.parents) == 0 and _node.level >= 0 and nodes_in_before_level:
                 # target node index of invisible edge
                 nodes_in_level = graph.get_nodes_by_level(_node.level)
-                nodes_in_before_level = graph.get_nodes_by_level(_node.level - 1)
 
                 target_node_index = min(len(nodes_in_level), len(nodes_in_before_level)) - 1
 
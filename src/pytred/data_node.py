@@ -3,10 +3,12 @@ from __future__ import annotations
 from collections.abc import Sequence
 from dataclasses import dataclass
 from dataclasses import field
+from typing import Any
 from typing import Literal
 
 import polars as pl
 
+from pytred._types import ENGINE
 from pytred._types import POLARS_JOIN_METHOD
 
 
@@ -28,6 +30,22 @@ class DataNode:
     keys: Sequence[str] | None
     join: POLARS_JOIN_METHOD | None
     name: str
+    engine: ENGINE = "polars"
+    # Options of 'asof' and 'range' joins, e.g. {"on": "timestamp", "strategy": "backward"}
+    join_options: dict[str, Any] | None = None
+
+
+@dataclass
+class ExpressionNode:
+    """
+    Node of columns derived from root_df by polars expressions.
+    Expressions of all ExpressionNodes are evaluated by a single `with_columns` on root_df.
+    """
+
+    exprs: list[pl.Expr]
+    name: str
+    keys: None = None
+    join: None = None
 
 
 @dataclass
@@ -109,6 +127,7 @@ class DataEdge:
     source: str
     target: str
     link_type: str
+    is_highlighted: bool = False
 
     def fmt_mermaid(self):
         return f"{self.source} {self.link_type} {self.target}"
@@ -119,6 +138,8 @@ class DataflowGraph:
     graph_direction: Literal["LR", "TD"] = "TD"
     nodes: list[DataflowNode] = field(default_factory=list, init=False)
     edges: list[DataEdge] = field(default_factory=list, init=False)
+    highlighted_nodes: list[str] = field(default_factory=list, init=False)
+    highlight_style: str = "stroke:#d62728,stroke-width:3px"
 
     def add_node(self, node: DataflowNode):
         self.nodes.append(node)
@@ -126,12 +147,37 @@ class DataflowGraph:
     def add_edge(self, edge: DataEdge):
         self.edges.append(edge)
 
+    def highlight_path(self, path: list[str]):
+        """
+        Highlights nodes of the path and edges between consecutive nodes of the path.
+        The edge from the last node to root_df is highlighted too.
+
+        Parameters
+        ----------
+        path : list of str
+            Names of nodes, e.g. the critical path.
+        """
+        self.highlighted_nodes = list(path)
+        for edge in self.edges:
+            edge.is_highlighted = False
+        pairs = set(zip(path[:-1], path[1:]))  # noqa: B905
+        if path:
+            pairs.add((path[-1], "root_df"))
+        for edge in self.edges:
+            if (edge.source, edge.target) in pairs and edge.link_type != "~~~":
+                edge.is_highlighted = True
+
     def __str__(self):
         graph_str = f"graph {self.graph_direction}\n"
         for node in self.nodes:
             graph_str += f"    {node.fmt_mermaid()}\n"
         for edge in self.edges:
             graph_str += f"    {edge.fmt_mermaid()}\n"
+        for name in self.highlighted_nodes:
+            graph_str += f"    style {name} {self.highlight_style}\n"
+        for i, edge in enumerate(self.edges):
+            if edge.is_highlighted:
+                graph_str += f"    linkStyle {i} {self.highlight_style}\n"
         return graph_str
 
     def get_nodes_by_level(self, level: int):
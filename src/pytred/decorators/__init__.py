@@ -6,11 +6,12 @@ from typing import Literal
 from typing_extensions import TypeGuard
 
 from pytred._types import POLARS_JOIN_METHOD
+from pytred.decorators.duckdb import duckdb_table
 from pytred.decorators.polars import polars_table
 
 
 def table(
-    engine: Literal["polars"],
+    engine: Literal["polars", "duckdb"],
     order: int,
     *keys: str,
     join: str | None = None,
@@ -19,8 +20,9 @@ def table(
     """
     Parameters
     ----------
-    engine : {"polars"}
-        The backend engine used for data processing. Currently, only "polars" is supported.
+    engine : {"polars", "duckdb"}
+        The backend engine used for data processing. Functions of "duckdb" return SQL or
+        DuckDB relations, and joins of their tables are executed in DuckDB.
     order : int
         An integer specifying the execution order of the data processing function.
     keys : str
@@ -33,13 +35,14 @@ def table(
         duplicate entries based on the keys.
     """
 
-    if engine == "polars":
-        if check_polars_join_keys(join):
-            return polars_table(order, *keys, join=join, is_validate_unique=is_validate_unique)
-        else:
-            raise ValueError("join must be 'inner', 'left', 'outer', 'semi', 'anti' or 'cross'.")
-    else:
-        raise ValueError("engine must be 'polars only'.")
+    if engine not in ["polars", "duckdb"]:
+        raise ValueError("engine must be 'polars' or 'duckdb'.")
+    if not check_polars_join_keys(join):
+        raise ValueError("join must be 'inner', 'left', 'outer', 'semi', 'anti' or 'cross'.")
+
+    if engine == "duckdb":
+        return duckdb_table(order, *keys, join=join, is_validate_unique=is_validate_unique)
+    return polars_table(order, *keys, join=join, is_validate_unique=is_validate_unique)
 
 
 def check_polars_join_keys(
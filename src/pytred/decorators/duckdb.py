@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from functools import partial
+from functools import wraps
+import inspect
+from logging import getLogger
+from typing import Callable
+
+import polars as pl
+
+from pytred._types import POLARS_JOIN_METHOD
+from pytred.decorators.polars import _set_metadata_to_function
+from pytred.decorators.polars import _validate_signature
+from pytred.decorators.polars import _validate_table
+from pytred.exceptions import InvalidReturnValueError
+
+
+logger = getLogger(__name__)
+
+
+def import_duckdb():
+    """
+    Imports duckdb, which is an optional dependency of pytred.
+    """
+    try:
+        import duckdb
+    except ImportError as err:
+        raise ImportError(
+            "duckdb is required for engine='duckdb'. Install it with `pip install pytred[duckdb]`."
+        ) from err
+    return duckdb
+
+
+def duckdb_table(
+    order: int,
+    *keys: str,
+    join: POLARS_JOIN_METHOD | None = None,
+    is_validate_unique: bool = True,
+    is_optional: bool = False,
+    is_key_local: bool = False,
+):
+    """
+    Decorator for data processing functions executed by DuckDB.
+
+    Argument tables of the decorated function are registered to an in-memory DuckDB connection
+    through Arrow without copying, under the names of the arguments, and the function receives
+    them as DuckDB relations. The function returns a SQL query which refers to the argument
+    names as tables, or a DuckDB relation. The result is converted to polars.DataFrame through
+    Arrow, so DuckDB nodes and polars nodes can be mixed in the same DataHub.
+    Joins of consecutive DuckDB tables with root_df are executed in DuckDB by `DataHub.steps`.
+
+    Parameters
+    ----------
+    order : int
+        The order in which the decorated function should be executed in the data pipeline.
+    keys : tuple
+        The keys to be used for joining data tables.
+    join : {'inner', 'left', 'right', 'full', 'semi', 'anti', 'cross'}, optional
+        The type of join to be used when combining data tables. 'inner', 'left', 'semi', 'anti'
+        and 'cross' joins are executed in DuckDB, and the others in polars.
+        If join is None, the table is used only within preprocessing steps.
+    is_validate_unique : bool, default True
+        Whether to validate the uniqueness of the specified keys in the returned table.
+    is_optional: bool, default False
+        If True, do not execute if input table does not exist
+    is_key_local: bool, default False
+        If True, the function is executed per hash partition by `DataHub.execute_partitioned`.
+
+    Raises
+    ------
+    ValueError
+        If the 'order' parameter is not an integer.
+
+    Examples
+    --------
+    >>> class MyDataHub(DataHub):
+    ...     @duckdb_table(0, "id", join="left")
+    ...     def total_amount(self, orders):
+    ...         return "SELECT id, SUM(amount) AS amount FROM orders GROUP BY id"
+    """
+    _validate_signature(order, keys, join)
+
+    def decorator(func: Callable) -> Callable:
+        logger.info(f"set table by {func.__name__}. keys: {keys}, join: {join}, order: {order}.")
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def _wrapper(*args, **kwargs):
+            duckdb = import_duckdb()
+            bound = signature.bind(*args, **kwargs)
+            with duckdb.connect() as connection:
+                for name, value in bound.arguments.items():
+                    if isinstance(value, pl.DataFrame):
+                        connection.register(name, value)
+                        bound.arguments[name] = connection.table(name)
+
+                result = func(*bound.args, **bound.kwargs)
+                if isinstance(result, str):
+                    result = connection.sql(result)
+                if not isinstance(result, duckdb.DuckDBPyRelation):
+                    raise InvalidReturnValueError(
+                        f"{func.__name__} must be return SQL string or duckdb.DuckDBPyRelation, "
+                        f"not {type(result)}."
+                    )
+                df = result.pl()
+
+            _validate_table(df, keys, is_validate_unique, func.__name__)
+            return df
+
+        _wrapper = _set_metadata_to_function(
+            _wrapper,
+            order=order,
+            join=join,
+            keys=keys,
+            is_optional=is_optional,
+            engine="duckdb",
+            is_key_local=is_key_local,
+        )
+
+        return _wrapper
+
+    return decorator
+
+
+duckdb_optional_table = partial(duckdb_table, is_optional=True)
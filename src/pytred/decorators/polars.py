@@ -1,21 +1,27 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from functools import partial
 from functools import wraps
+import inspect
 from logging import getLogger
 from typing import Callable
 
 import polars as pl
 
+from pytred._types import ENGINE
 from pytred._types import POLARS_JOIN_METHOD
 from pytred.exceptions import DuplicatedError
 from pytred.exceptions import InvalidReturnValueError
+from pytred.helpers.ordered_join import ORDERED_JOIN_METHODS
+from pytred.helpers.ordered_join import validate_join_options
 
 
 logger = getLogger(__name__)
 
 
 def _validate_signature(order: int, keys: tuple[str, ...], join: POLARS_JOIN_METHOD | None = None):
+    # keys of 'asof' and 'range' joins are optional
     if not isinstance(order, int):
         raise ValueError("order must be int.")
     if isinstance(order, int) and order < 0:
@@ -24,7 +30,9 @@ def _validate_signature(order: int, keys: tuple[str, ...], join: POLARS_JOIN_MET
 
     if (join is None or join in ["cross"]) and (len(keys) >= 1 and keys[0] is not None):
         raise ValueError("When 'join' is None or 'cross', keys must be empty.")
-    if (join is not None and join not in ["cross"]) and (len(keys) == 0 or keys[0] is None):
+    if (join is not None and join not in ["cross", *ORDERED_JOIN_METHODS]) and (
+        len(keys) == 0 or keys[0] is None
+    ):
         raise ValueError(f"When 'join' is {join}, keys must not be empty.")
 
 
@@ -34,23 +42,76 @@ def _set_metadata_to_function(
     join: POLARS_JOIN_METHOD | None,
     keys: tuple[str, ...],
     is_optional: bool,
+    engine: ENGINE = "polars",
+    is_key_local: bool = False,
+    is_expression: bool = False,
+    is_aggregation: bool = False,
+    join_options: dict | None = None,
+    output_of: str | None = None,
 ):
     wrapper.__pytred_meta__ = {
         "table_process_order": order,
         "join": join,
         "keys": None if (len(keys) == 0 or keys[0] is None) else keys,
         "is_optional": is_optional,
+        "engine": engine,
+        "is_key_local": is_key_local,
+        "is_expression": is_expression,
+        "is_aggregation": is_aggregation,
+        "join_options": join_options,
+        "output_of": output_of,
     }
 
     return wrapper
 
 
+def _to_expressions(value, name: str) -> list[pl.Expr]:
+    """
+    Normalizes a pl.Expr, a list of pl.Expr or a dict of column names to pl.Expr returned by
+    the function `name` to a list of pl.Expr.
+    """
+    exprs = value
+    if isinstance(exprs, pl.Expr):
+        exprs = [exprs]
+    elif isinstance(exprs, dict):
+        exprs = [expr.alias(column) for column, expr in exprs.items()]
+    if not isinstance(exprs, (list, tuple)) or not all(
+        isinstance(expr, pl.Expr) for expr in exprs
+    ):
+        raise InvalidReturnValueError(
+            f"{name} must be return polars.Expr, list of polars.Expr or dict of polars.Expr, "
+            f"not {type(value)}."
+        )
+    return list(exprs)
+
+
+def _validate_table(df: pl.DataFrame, keys: tuple[str, ...], is_validate_unique: bool, name: str):
+    if keys:
+        if not set(keys).issubset(set(df.columns)):
+            raise ValueError(
+                f"Expected keys not found in DataFrame columns: expected {keys}, "
+                f"found {df.columns}."
+            )
+
+        if is_validate_unique:
+            if len(df.unique(subset=keys)) != len(df):
+                raise DuplicatedError(
+                    f"There are duplicate values based on the specified keys {keys} "
+                    f"returned by {name}."
+                )
+
+
 def polars_table(
     order: int,
     *keys: str,
     join: POLARS_JOIN_METHOD | None = None,
     is_validate_unique: bool = True,
     is_optional: bool = False,
+    is_key_local: bool = False,
+    on: str | None = None,
+    strategy: str = "backward",
+    tolerance: int | float | str | None = None,
+    between: tuple[str, str] | None = None,
 ):
     """
     Decorator class for adding metadata to data processing functions, specifying their order of
@@ -63,9 +124,13 @@ def polars_table(
     keys : tuple
         The keys to be used for joining data tables. If keys are provided, the decorator will check
         for their presence in the DataFrame returned by the function.
-    join : {‘inner’, ‘left’, ‘outer’, ‘semi’, ‘anti’, ‘cross’, ‘outer_coalesce’}, optional
+    join : {‘inner’, ‘left’, ‘outer’, ‘semi’, ‘anti’, ‘cross’, ‘asof’, ‘range’}, optional
         The type of join to be used when combining data tables. Supported join types are 'inner',
-        'left', 'outer', 'semi', 'anti', and 'cross'.
+        'left', 'outer', 'semi', 'anti', 'cross', 'asof' and 'range'.
+        'asof' joins each row with the nearest row of the table by the `on` column, and 'range'
+        joins each row with rows of the table whose interval `between` contains the `on`
+        column, like an inner join. Both are sort-based joins, and keys of them are optional
+        `by` keys which must be equal.
         If join is None, it implies that the resulting table from this function is intended for use
         only within preprocessing steps and will not be directly included in the final output of
         the DataHub pipeline.
@@ -74,13 +139,52 @@ def polars_table(
         function. If True, a check for duplicate entries based on the keys is performed.
     is_optional: bool, default False
         If True, do not execute if input table does not exist
+    is_key_local: bool, default False
+        If True, rows of the returned table for a key depend only on rows of the argument tables
+        with the same key, e.g. filters or aggregations grouped by the key. Such functions are
+        executed per hash partition by `DataHub.execute_partitioned`.
+    on : str, optional
+        Column of root_df and the table ordering rows of 'asof' and 'range' joins.
+    strategy : {'backward', 'forward', 'nearest'}, default 'backward'
+        Whether 'asof' joins the last row whose `on` is less than or equal to, the first row
+        whose `on` is greater than or equal to, or the nearest row.
+    tolerance : int, float or str, optional
+        Maximum distance of `on` of 'asof' joins, e.g. 5 or '7d' for temporal columns.
+    between : tuple of str, optional
+        Start and end columns of the closed intervals of the table of 'range' joins.
 
     Raises
     ------
     ValueError
         If the 'order' parameter is not an integer.
+
+    Notes
+    -----
+    Arguments of the decorated function are names of tables in DataHub. The argument named
+    `root_df` receives root_df of DataHub.
+
+    Examples
+    --------
+    >>> class MyDataHub(DataHub):
+    ...     @polars_table(0, "item_id", join="asof", on="timestamp", tolerance="7d")
+    ...     def latest_price(self, prices):
+    ...         return prices.select("item_id", "timestamp", "price")
     """
     _validate_signature(order, keys, join)
+    join_options: dict | None = None
+    if join == "asof":
+        join_options = {"on": on, "strategy": strategy, "tolerance": tolerance}
+    elif join == "range":
+        join_options = {"on": on, "between": between}
+    elif on is not None or between is not None:
+        raise ValueError("'on' and 'between' are only for 'asof' and 'range' joins.")
+    validate_join_options(join, join_options)
+    # columns of the table used by joins other than keys
+    join_columns: tuple[str, ...] = ()
+    if join == "asof" and on is not None:
+        join_columns = (on,)
+    elif join == "range" and between is not None:
+        join_columns = tuple(between)
 
     def decorator(func: Callable[..., pl.DataFrame]) -> Callable:
         """
@@ -115,19 +219,11 @@ def polars_table(
                 raise InvalidReturnValueError(
                     f"{func.__name__} must be return polars.DataFrame, not {type(df)}."
                 )
-            if keys:
-                if not set(keys).issubset(set(df.columns)):
-                    raise ValueError(
-                        f"Expected keys not found in DataFrame columns: expected {keys}, "
-                        f"found {df.columns}."
-                    )
-
-                if is_validate_unique:
-                    if len(df.unique(subset=keys)) != len(df):
-                        raise DuplicatedError(
-                            f"There are duplicate values based on the specified keys {keys} "
-                            f"returned by {func.__name__}."
-                        )
+            # keys of 'asof' and 'range' joins are not unique
+            _validate_table(
+                df, keys, is_validate_unique and join not in ORDERED_JOIN_METHODS, func.__name__
+            )
+            _validate_table(df, join_columns, False, func.__name__)
             return df
 
         _wrapper = _set_metadata_to_function(
@@ -136,6 +232,8 @@ def polars_table(
             join=join,
             keys=keys,
             is_optional=is_optional,
+            is_key_local=is_key_local,
+            join_options=join_options,
         )
 
         return _wrapper
@@ -144,3 +242,280 @@ def polars_table(
 
 
 polars_optional_table = partial(polars_table, is_optional=True)
+
+
+def polars_expr(order: int, is_optional: bool = False):
+    """
+    Decorator for functions deriving columns of root_df by polars expressions.
+
+    The decorated function returns a pl.Expr, a list of pl.Expr or a dict of column names to
+    pl.Expr instead of a DataFrame. Expressions of all such functions are evaluated against
+    root_df by a single `with_columns` in `DataHub.steps` before joins, instead of creating a
+    table and joining it for each function. Expressions can refer only to columns of root_df,
+    and tables of these functions can not be arguments of other functions.
+
+    Parameters
+    ----------
+    order : int
+        The order in which the decorated function should be executed in the data pipeline.
+    is_optional: bool, default False
+        If True, do not execute if input table does not exist
+
+    Examples
+    --------
+    >>> class MyDataHub(DataHub):
+    ...     @polars_expr(0)
+    ...     def price_features(self):
+    ...         return {
+    ...             "price_with_tax": pl.col("price") * 1.1,
+    ...             "is_expensive": pl.col("price") > 1000,
+    ...         }
+    """
+    _validate_signature(order, (), None)
+
+    def decorator(func: Callable) -> Callable:
+        logger.info(f"set expressions by {func.__name__}. order: {order}.")
+
+        @wraps(func)
+        def _wrapper(*args, **kwargs) -> list[pl.Expr]:
+            return _to_expressions(func(*args, **kwargs), func.__name__)
+
+        _wrapper = _set_metadata_to_function(
+            _wrapper,
+            order=order,
+            join=None,
+            keys=(),
+            is_optional=is_optional,
+            is_expression=True,
+        )
+
+        return _wrapper
+
+    return decorator
+
+
+def polars_agg(
+    order: int,
+    *keys: str,
+    join: POLARS_JOIN_METHOD | None = "left",
+    is_optional: bool = False,
+    is_key_local: bool = False,
+):
+    """
+    Decorator for functions declaring aggregations of a table grouped by keys.
+
+    The decorated function has one table argument, the source table, and returns aggregation
+    expressions as a pl.Expr, a list of pl.Expr or a dict of column names to pl.Expr. The table
+    of the function is `source.group_by(keys).agg(expressions)`.
+    Aggregations of all functions sharing the source table and keys are computed by one
+    `group_by(...).agg(...)`, and their tables are joined to root_df by one join when they
+    also share the join type, instead of scanning, hashing and joining per function.
+
+    Parameters
+    ----------
+    order : int
+        The order in which the decorated function should be executed in the data pipeline.
+    keys : tuple
+        The group keys, which are also the keys to join the table.
+    join : {'inner', 'left', 'full', 'semi', 'anti'}, optional, default 'left'
+        The type of join of the table. If None, the table is used only by other functions.
+    is_optional: bool, default False
+        If True, do not execute if the source table does not exist
+    is_key_local: bool, default False
+        If True, the function is executed per hash partition by
+        `DataHub.execute_partitioned`. Set it when keys include the partition keys.
+
+    Raises
+    ------
+    ValueError
+        If keys are empty, join is 'cross', or the function does not have exactly one table
+        argument.
+
+    Examples
+    --------
+    >>> class MyDataHub(DataHub):
+    ...     @polars_agg(0, "user_id")
+    ...     def order_amount(self, orders):
+    ...         return {"total_amount": pl.col("amount").sum()}
+    ...
+    ...     @polars_agg(0, "user_id")
+    ...     def order_count(self, orders):
+    ...         return pl.len().alias("n_orders")
+    """
+    _validate_signature(order, (), None)
+    if not keys:
+        raise ValueError("keys of aggregations must not be empty.")
+    if join in ["cross", *ORDERED_JOIN_METHODS]:
+        raise ValueError(f"Tables of aggregations can not be joined by '{join}'.")
+
+    def decorator(func: Callable) -> Callable:
+        logger.info(
+            f"set aggregations by {func.__name__}. keys: {keys}, join: {join}, order: {order}."
+        )
+        parameters = [
+            name for name in inspect.signature(func).parameters if name not in ("self", "cls")
+        ]
+        if len(parameters) != 1:
+            raise ValueError(
+                f"{func.__name__} must have exactly one table argument, the source of "
+                f"aggregations: {parameters}"
+            )
+
+        @wraps(func)
+        def _wrapper(*args, **kwargs) -> list[pl.Expr]:
+            return _to_expressions(func(*args, **kwargs), func.__name__)
+
+        _wrapper = _set_metadata_to_function(
+            _wrapper,
+            order=order,
+            join=join,
+            keys=keys,
+            is_optional=is_optional,
+            is_key_local=is_key_local,
+            is_aggregation=True,
+        )
+
+        return _wrapper
+
+    return decorator
+
+
+@dataclass(frozen=True)
+class TableOutput:
+    """
+    Keys and the join of a table returned by a function decorated by `polars_tables`.
+
+    Attributes
+    ----------
+    keys : tuple of str
+        The keys to join the table.
+    join : {'inner', 'left', 'full', 'semi', 'anti', 'cross'}, optional
+        The type of join of the table. If None, the table is used only by other functions.
+    is_validate_unique : bool, default True
+        Whether to validate the uniqueness of the keys in the table.
+    """
+
+    keys: tuple[str, ...] = ()
+    join: POLARS_JOIN_METHOD | None = None
+    is_validate_unique: bool = True
+
+
+def polars_tables(order: int, is_optional: bool = False, **outputs: TableOutput):
+    """
+    Decorator for functions returning several tables, e.g. tables sharing an expensive
+    intermediate table which is computed once and released after the function returns.
+
+    The decorated function returns a dict of table names to pl.DataFrame. Each table is
+    registered as a separate table of the DataHub with its own keys and join, and the function is
+    executed once for all of them by `DataHub.execute`.
+
+    Parameters
+    ----------
+    order : int
+        The order in which the decorated function should be executed in the data pipeline.
+    is_optional: bool, default False
+        If True, do not execute if input table does not exist
+    outputs : TableOutput
+        Keys and joins of the returned tables by their names.
+
+    Raises
+    ------
+    ValueError
+        If there are no outputs, an output has the name of the function, or keys of an output
+        do not match its join. 'asof' and 'range' joins are not supported.
+
+    Examples
+    --------
+    >>> class MyDataHub(DataHub):
+    ...     @polars_tables(
+    ...         0,
+    ...         session_count=TableOutput(("user_id",), join="left"),
+    ...         session_days=TableOutput(),
+    ...     )
+    ...     def sessions(self, events):
+    ...         sessions = sessionize(events)
+    ...         return {
+    ...             "session_count": sessions.group_by("user_id").agg(n_sessions=pl.len()),
+    ...             "session_days": sessions.select("user_id", "day"),
+    ...         }
+    """
+    if not outputs:
+        raise ValueError("outputs must not be empty.")
+    for output in outputs.values():
+        _validate_signature(order, output.keys, output.join)
+        if output.join in ORDERED_JOIN_METHODS:
+            raise ValueError(f"Tables of multiple outputs can not be joined by '{output.join}'.")
+
+    def decorator(func: Callable[..., dict[str, pl.DataFrame]]) -> Callable:
+        logger.info(f"set tables {list(outputs)} by {func.__name__}. order: {order}.")
+        if func.__name__ in outputs:
+            raise ValueError(f"Output {func.__name__} has the same name as the function.")
+
+        @wraps(func)
+        def _wrapper(*args, **kwargs) -> dict[str, pl.DataFrame]:
+            tables = func(*args, **kwargs)
+            if not isinstance(tables, dict) or not all(
+                isinstance(table, pl.DataFrame) for table in tables.values()
+            ):
+                raise InvalidReturnValueError(
+                    f"{func.__name__} must be return dict of polars.DataFrame, not {type(tables)}."
+                )
+            if set(tables) != set(outputs):
+                raise InvalidReturnValueError(
+                    f"{func.__name__} must be return tables {sorted(outputs)}, not "
+                    f"{sorted(tables)}."
+                )
+            for name, output in outputs.items():
+                _validate_table(tables[name], output.keys, output.is_validate_unique, name)
+            return tables
+
+        _wrapper.__pytred_outputs__ = {  # type: ignore[attr-defined]
+            "table_process_order": order,
+            "is_optional": is_optional,
+            "outputs": dict(outputs),
+        }
+        return _wrapper
+
+    return decorator
+
+
+def build_output_functions(name: str, function: Callable) -> dict[str, Callable]:
+    """
+    Creates a function of each table returned by a function decorated by `polars_tables`.
+
+    Each function has the arguments of the decorated function and returns its table. Called
+    directly, it executes the decorated function. `DataHub` executes the decorated function
+    once for all of its tables instead.
+
+    Parameters
+    ----------
+    name : str
+        Name of the decorated function in the DataHub class.
+    function : Callable
+        The decorated function.
+
+    Returns
+    -------
+    dict of str to Callable
+        Functions keyed by names of the tables.
+    """
+    meta = function.__pytred_outputs__  # type: ignore[attr-defined]
+    functions = {}
+    for output_name, output in meta["outputs"].items():
+
+        def output_function(self, *tables, output_name=output_name):
+            return getattr(self, name)(*tables)[output_name]
+
+        output_function.__name__ = output_function.__qualname__ = output_name
+        output_function.__doc__ = function.__doc__
+        output_function.__wrapped__ = function  # type: ignore[attr-defined]
+        output_function.__signature__ = inspect.signature(function)  # type: ignore[attr-defined]
+        functions[output_name] = _set_metadata_to_function(
+            output_function,
+            order=meta["table_process_order"],
+            join=output.join,
+            keys=output.keys,
+            is_optional=meta["is_optional"],
+            output_of=name,
+        )
+    return functions
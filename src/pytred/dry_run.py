@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Literal
+
+import polars as pl
+
+from pytred.exceptions import SchemaMismatchError
+
+
+@dataclass
+class DryRunIssue:
+    """
+    A problem found by DataHub.dry_run().
+
+    Attributes
+    ----------
+    table : str
+        Name of the table (or 'root_df' / 'post_step') where the issue was found.
+    kind : str
+        Category of the issue. One of 'function_error', 'missing_table', 'missing_key',
+        'key_dtype_mismatch', 'suffix_collision', 'suffix_applied', 'join_error' and
+        'post_step_error'.
+    message : str
+        Human readable description of the issue.
+    severity : {"error", "warning"}
+        Errors make the pipeline fail at execution. Warnings do not.
+    """
+
+    table: str
+    kind: str
+    message: str
+    severity: Literal["error", "warning"] = "error"
+
+    def __str__(self):
+        return f"[{self.severity}] {self.table} ({self.kind}): {self.message}"
+
+
+@dataclass
+class DryRunReport:
+    """
+    Result of DataHub.dry_run().
+
+    Attributes
+    ----------
+    name : str
+        Name of the DataHub class.
+    schemas : dict of str to pl.Schema
+        Schema of each input table and each table created by functions.
+    output_schema : pl.Schema or None
+        Schema of the final output. None if the join chain could not be propagated.
+    issues : list of DryRunIssue
+        Problems found while propagating schemas.
+    skipped : list of str
+        Optional tables skipped because their input tables were not found.
+    elapsed_seconds : float
+        Time spent on the dry run.
+    """
+
+    name: str
+    schemas: dict[str, pl.Schema] = field(default_factory=dict)
+    output_schema: pl.Schema | None = None
+    issues: list[DryRunIssue] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def errors(self) -> list[DryRunIssue]:
+        return [issue for issue in self.issues if issue.severity == "error"]
+
+    @property
+    def warnings(self) -> list[DryRunIssue]:
+        return [issue for issue in self.issues if issue.severity == "warning"]
+
+    @property
+    def is_valid(self) -> bool:
+        """
+        True if no error is found.
+        """
+        return len(self.errors) == 0
+
+    def add_issue(
+        self,
+        table: str,
+        kind: str,
+        message: str,
+        severity: Literal["error", "warning"] = "error",
+    ):
+        self.issues.append(DryRunIssue(table, kind, message, severity=severity))
+
+    def raise_for_errors(self):
+        """
+        Raise SchemaMismatchError if any error is found.
+
+        Raises
+        ------
+        SchemaMismatchError
+            If the report contains at least one error.
+        """
+        if not self.is_valid:
+            errors = "\n".join(f"  {issue}" for issue in self.errors)
+            raise SchemaMismatchError(f"Dry run of {self.name} failed:\n{errors}")
+
+    def summary(self) -> str:
+        """
+        Returns a text summary of this report.
+        """
+        lines = [
+            f"{self.name}: {len(self.errors)} error(s), {len(self.warnings)} warning(s) "
+            f"in {self.elapsed_seconds * 1000:.1f} ms"
+        ]
+        lines += [f"  {issue}" for issue in self.issues]
+        if self.skipped:
+            lines.append(f"  skipped optional tables: {self.skipped}")
+        if self.output_schema is not None:
+            lines.append("  output schema:")
+            lines += [f"    {name}: {dtype}" for name, dtype in self.output_schema.items()]
+        return "\n".join(lines)
@@ -12,3 +12,15 @@ class TableNotFoundError(Exception):
 
 class InvalidFunctionCalledError(Exception):
     pass
+
+
+class SchemaMismatchError(Exception):
+    pass
+
+
+class JoinFanoutError(Exception):
+    pass
+
+
+class StaticAnalysisError(Exception):
+    pass
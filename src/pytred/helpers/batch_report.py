@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+import hashlib
+import json
+from logging import getLogger
+import multiprocessing
+import pathlib
+from typing import Literal
+
+import pytred
+from pytred.data_hub import DataHub
+from pytred.data_node import EmptyDataNode
+from pytred.helpers.loader import ReportDataHubLoader
+from pytred.helpers.static_analysis import find_datahub_classes
+from pytred.helpers.visualize import report_datahub
+
+
+logger = getLogger(__name__)
+
+# File in the output directory recording hashes of the sources of rendered reports
+CACHE_FILE_NAME = ".pytred-report-cache.json"
+
+
+@dataclass
+class BatchReportResult:
+    """
+    Result of `report_directory`.
+
+    Attributes
+    ----------
+    rendered : list of str
+        Paths of reports rendered in this run.
+    skipped : list of str
+        Paths of reports skipped because their source files are not changed.
+    failed : dict of str to str
+        Errors of DataHub classes which failed to be rendered, keyed by '{file}::{class}'.
+    """
+
+    rendered: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+def discover_datahubs(directory: str | pathlib.Path) -> dict[pathlib.Path, list[str]]:
+    """
+    Find DataHub classes in script files under the directory by static analysis.
+    Hidden directories and files which cannot be parsed are skipped.
+
+    Returns
+    -------
+    dict of pathlib.Path to list of str
+        Names of DataHub classes of each file.
+    """
+    root = pathlib.Path(directory)
+    datahubs = {}
+    for path in sorted(root.rglob("*.py")):
+        if any(part.startswith(".") for part in path.relative_to(root).parts):
+            continue
+        try:
+            class_names = find_datahub_classes(path)
+        except (SyntaxError, UnicodeDecodeError) as err:
+            logger.warning(f"Skip {path} since it cannot be parsed: {err}")
+            continue
+        if class_names:
+            datahubs[path] = class_names
+    return datahubs
+
+
+def infer_input_tables(datahub_class: type[DataHub]) -> list[EmptyDataNode]:
+    """
+    Input tables of a DataHub class, which are arguments of functions not created by functions.
+    """
+    table_order = datahub_class.registerd_tables_order or {}
+    names: dict[str, None] = {}
+    for _, _, arg_table_names in datahub_class.collect_table_and_arguments(table_order):
+        for name in arg_table_names:
+            if name != "root_df" and name not in table_order:
+                names[name] = None
+    return [EmptyDataNode(name=name, keys=None, join=None) for name in names]
+
+
+def hash_file(path: str | pathlib.Path) -> str:
+    return hashlib.sha256(pathlib.Path(path).read_bytes()).hexdigest()
+
+
+def report_directory(
+    directory: str | pathlib.Path,
+    output_dir: str | pathlib.Path,
+    max_workers: int | None = None,
+    mode: Literal["auto", "static", "import"] = "auto",
+    use_cache: bool = True,
+) -> BatchReportResult:
+    """
+    Render reports of all DataHub classes under the directory in worker processes.
+
+    The report of each class is written to `{output_dir}/{module}.{class}.md`, where module is
+    the dotted path of the file relative to the directory. Reports of files whose content hash
+    and pytred version are the same as in the previous run are skipped. Input tables of each
+    class are inferred from arguments of its functions.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path
+        Directory searched for DataHub classes recursively.
+    output_dir : str or pathlib.Path
+        Directory where reports and the cache file are written.
+    max_workers : int, optional
+        Maximum number of worker processes. Defaults to the number of CPUs.
+    mode : {'auto', 'static', 'import'}, default 'auto'
+        How DataHub classes are loaded. See `pytred report --mode`.
+    use_cache : bool, default True
+        If False, all reports are rendered again.
+
+    Returns
+    -------
+    BatchReportResult
+    """
+    root = pathlib.Path(directory)
+    output_root = pathlib.Path(output_dir)
+    output_root.mkdir(parents=True, exist_ok=True)
+    cache_path = output_root / CACHE_FILE_NAME
+    cache: dict[str, dict[str, str]] = {}
+    if use_cache and cache_path.exists():
+        cache = json.loads(cache_path.read_text())
+
+    result = BatchReportResult()
+    jobs = []
+    for path, class_names in discover_datahubs(root).items():
+        module = ".".join(path.relative_to(root).with_suffix("").parts)
+        file_hash = hash_file(path)
+        targets = []
+        for class_name in class_names:
+            output_path = output_root / f"{module}.{class_name}.md"
+            entry = cache.get(f"{module}.{class_name}")
+            if (
+                entry is not None
+                and entry["hash"] == file_hash
+                and entry["version"] == pytred.__version__
+                and output_path.exists()
+            ):
+                result.skipped.append(str(output_path))
+            else:
+                targets.append((class_name, str(output_path)))
+        if targets:
+            jobs.append((module, path, file_hash, targets))
+
+    if jobs:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers, mp_context=context) as executor:
+            futures = [
+                executor.submit(_render_file, path, [name for name, _ in targets], mode)
+                for _, path, _, targets in jobs
+            ]
+            for (module, path, file_hash, targets), future in zip(jobs, futures):  # noqa: B905
+                reports, errors = future.result()
+                for class_name, output in targets:
+                    if class_name in errors:
+                        result.failed[f"{path}::{class_name}"] = errors[class_name]
+                        cache.pop(f"{module}.{class_name}", None)
+                        continue
+                    pathlib.Path(output).write_text(reports[class_name])
+                    result.rendered.append(output)
+                    cache[f"{module}.{class_name}"] = {
+                        "hash": file_hash,
+                        "version": pytred.__version__,
+                    }
+
+    cache_path.write_text(json.dumps(cache, indent=2, sort_keys=True))
+    return result
+
+
+def _render_file(
+    path: pathlib.Path, class_names: Sequence[str], mode: Literal["auto", "static", "import"]
+) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Render reports of DataHub classes in a file. Returns reports and errors keyed by class names.
+    The file is imported at most once for all of its classes.
+    """
+    loader = ReportDataHubLoader(path, mode)
+    reports = {}
+    errors = {}
+    for class_name in class_names:
+        try:
+            datahub_class = loader.load(class_name)
+            reports[class_name] = report_datahub(datahub_class, *infer_input_tables(datahub_class))
+        except Exception as err:
+            errors[class_name] = f"{type(err).__name__}: {err}"
+    return reports, errors
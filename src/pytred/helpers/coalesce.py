@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+
+from pytred.data_node import DataNode
+
+
+# Join methods whose consecutive joins on the same keys can be coalesced into one join
+COALESCE_JOIN_METHODS = ("left", "inner")
+
+
+def group_coalescible_joins(
+    columns: Sequence[str], join_nodes: Iterable[DataNode], max_rows: int | None = None
+) -> Iterator[list[DataNode]]:
+    """
+    Group consecutive joins which can be coalesced into one join.
+
+    Consecutive DataNodes are grouped when they are joined with the same 'left' or 'inner' join
+    on the same keys with the same key dtypes, and their other columns are not in the left
+    table or in other tables of the group, so that no suffix is needed.
+
+    Joining tables with each other costs more than joining them one by one when they are larger
+    than the left table, so such tables are grouped only when their key columns are identical
+    to those of the first table of the group and they are concatenated horizontally.
+
+    Parameters
+    ----------
+    columns : Sequence of str
+        Columns of the left table of the first join.
+    join_nodes : Iterable of DataNode
+        DataNodes in the join order. They are consumed lazily, so that only the DataNodes of a
+        group and the next DataNode are held at once.
+    max_rows : int, optional
+        Number of rows of the left table. Tables with more rows are grouped only when they are
+        aligned. If None, the sizes of tables are not checked.
+
+    Yields
+    ------
+    list of DataNode
+        Groups of DataNodes in the join order. Groups of one DataNode are joined as is.
+    """
+    left_columns = set(columns)
+    group: list[DataNode] = []
+    # whether columns of all DataNodes of the group are joined without suffixes
+    is_unsuffixed_group = False
+    for node in join_nodes:
+        keys = list(node.keys or [])
+        value_columns = [col for col in node.table.columns if col not in keys]
+        is_unsuffixed = not any(col in left_columns for col in value_columns)
+        if (
+            group
+            and is_unsuffixed_group
+            and is_unsuffixed
+            and _can_coalesce(group[0], node, max_rows)
+        ):
+            group.append(node)
+        else:
+            if group:
+                yield group
+            group = [node]
+            is_unsuffixed_group = is_unsuffixed
+
+        # columns of the left table after the join
+        if node.join in ["semi", "anti"]:
+            continue
+        for col in value_columns if node.join != "cross" else node.table.columns:
+            left_columns.add(f"{col}_{node.name}" if col in left_columns else col)
+    if group:
+        yield group
+
+
+def _can_coalesce(first: DataNode, node: DataNode, max_rows: int | None) -> bool:
+    if node.join not in COALESCE_JOIN_METHODS or node.join != first.join:
+        return False
+    if not node.keys or list(node.keys) != list(first.keys or []):
+        return False
+    if any(node.table.schema[key] != first.table.schema[key] for key in node.keys):
+        return False
+    if max_rows is None or max(first.table.height, node.table.height) <= max_rows:
+        return True
+    return _is_aligned(first, node)
+
+
+def _is_aligned(first: DataNode, node: DataNode) -> bool:
+    """
+    Returns whether the key columns of the tables are identical.
+    """
+    keys = list(first.keys or [])
+    return node.table.height == first.table.height and node.table.select(keys).equals(
+        first.table.select(keys)
+    )
+
+
+def coalesce_join_nodes(join_nodes: Sequence[DataNode]) -> DataNode:
+    """
+    Combine tables joined with the same join on the same keys into one DataNode, so that the
+    left table is joined once instead of being hashed and copied for each table.
+
+    Tables whose key columns are identical, e.g. tables selected from the same DataFrame, are
+    concatenated horizontally. Otherwise they are joined with each other on the keys, by full
+    joins for 'left' joins and by inner joins for 'inner' joins. Joining the left table with the
+    combined table returns the same rows as joining the tables one by one.
+
+    Parameters
+    ----------
+    join_nodes : Sequence of DataNode
+        DataNodes grouped by `group_coalescible_joins`.
+
+    Returns
+    -------
+    DataNode
+        DataNode of the combined table named by comma-separated names of the DataNodes.
+    """
+    first = join_nodes[0]
+    keys = list(first.keys or [])
+    if all(_is_aligned(first, node) for node in join_nodes[1:]):
+        table = first.table.hstack(
+            [col for node in join_nodes[1:] for col in node.table.drop(keys).iter_columns()]
+        )
+    else:
+        table = first.table
+        how = "full" if first.join == "left" else "inner"
+        for node in join_nodes[1:]:
+            table = table.join(node.table, on=keys, how=how, coalesce=True)  # type: ignore[arg-type]
+
+    return DataNode(
+        table,
+        keys=first.keys,
+        join=first.join,
+        name=",".join(node.name for node in join_nodes),
+        engine=first.engine,
+    )
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import polars as pl
+
+
+# integer dtypes and their value ranges, from the smallest one
+SIGNED_INTEGER_RANGES = [
+    (pl.Int8, -(2**7), 2**7 - 1),
+    (pl.Int16, -(2**15), 2**15 - 1),
+    (pl.Int32, -(2**31), 2**31 - 1),
+    (pl.Int64, -(2**63), 2**63 - 1),
+]
+UNSIGNED_INTEGER_RANGES = [
+    (pl.UInt8, 0, 2**8 - 1),
+    (pl.UInt16, 0, 2**16 - 1),
+    (pl.UInt32, 0, 2**32 - 1),
+    (pl.UInt64, 0, 2**64 - 1),
+]
+
+
+@dataclass
+class CompactionResult:
+    """
+    Memory usage of a table before and after dtype compaction.
+
+    Attributes
+    ----------
+    name : str
+        Name of the table.
+    original_size : int
+        Estimated size in bytes before compaction.
+    compacted_size : int
+        Estimated size in bytes after compaction.
+    """
+
+    name: str
+    original_size: int
+    compacted_size: int
+
+    @property
+    def saved_size(self) -> int:
+        return self.original_size - self.compacted_size
+
+
+def compact_tables(
+    tables: dict[str, pl.DataFrame],
+    max_categories: int = 10_000,
+    max_category_ratio: float = 0.5,
+) -> tuple[dict[str, pl.DataFrame], dict[str, CompactionResult]]:
+    """
+    Downcast columns of tables to the smallest dtypes which keep all values.
+
+    A target dtype is decided per column name over all tables, so join keys keep the same dtype
+    in every table.
+    - Integer columns are downcast to the smallest integer dtype with the same signedness.
+    - Float64 columns are downcast to Float32 if no value changes.
+    - Low-cardinality String columns are converted to Enum whose categories are the union of
+      values in all tables, so that the physical encoding is shared across tables.
+
+    Parameters
+    ----------
+    tables : dict of str to pl.DataFrame
+        Tables to compact, keyed by table name.
+    max_categories : int, default 10000
+        String columns with more unique values than this are not converted.
+    max_category_ratio : float, default 0.5
+        String columns whose ratio of unique values to rows is larger than this are not
+        converted.
+
+    Returns
+    -------
+    tuple of dict of str to pl.DataFrame and dict of str to CompactionResult
+        Compacted tables and the memory usage of each table.
+    """
+    target_dtypes = plan_compaction(
+        list(tables.values()),
+        max_categories=max_categories,
+        max_category_ratio=max_category_ratio,
+    )
+
+    compacted_tables = {}
+    results = {}
+    for name, df in tables.items():
+        casts = {col: dtype for col, dtype in target_dtypes.items() if col in df.columns}
+        compacted = df.with_columns([pl.col(col).cast(dtype) for col, dtype in casts.items()])
+        compacted_tables[name] = compacted
+        results[name] = CompactionResult(
+            name, int(df.estimated_size()), int(compacted.estimated_size())
+        )
+
+    return compacted_tables, results
+
+
+def plan_compaction(
+    frames: list[pl.DataFrame],
+    max_categories: int = 10_000,
+    max_category_ratio: float = 0.5,
+) -> dict[str, pl.DataType]:
+    """
+    Decide the target dtype of each column name over frames.
+
+    Columns whose dtype differs between frames, or which can not be compacted, are not included
+    in the returned dictionary.
+    """
+    columns: dict[str, list[pl.Series]] = {}
+    for df in frames:
+        for series in df.get_columns():
+            columns.setdefault(series.name, []).append(series)
+
+    target_dtypes = {}
+    for col, series_list in columns.items():
+        dtype = series_list[0].dtype
+        if any(series.dtype != dtype for series in series_list):
+            continue
+
+        if dtype.is_integer():
+            target = _smallest_integer_dtype(series_list, dtype)
+        elif dtype == pl.Float64:
+            target = _float_dtype(series_list)
+        elif dtype == pl.String:
+            target = _enum_dtype(series_list, max_categories, max_category_ratio)
+        else:
+            target = None
+
+        if target is not None and target != dtype:
+            target_dtypes[col] = target
+
+    return target_dtypes
+
+
+def _smallest_integer_dtype(
+    series_list: list[pl.Series], dtype: pl.DataType
+) -> pl.DataType | None:
+    non_empty = [series for series in series_list if series.null_count() < len(series)]
+    if len(non_empty) == 0:
+        return None
+    min_value = min(int(series.min()) for series in non_empty)  # type: ignore[arg-type]
+    max_value = max(int(series.max()) for series in non_empty)  # type: ignore[arg-type]
+
+    ranges = SIGNED_INTEGER_RANGES if dtype.is_signed_integer() else UNSIGNED_INTEGER_RANGES
+    for candidate, lower, upper in ranges:
+        if lower <= min_value and max_value <= upper:
+            return candidate()
+    return None
+
+
+def _float_dtype(series_list: list[pl.Series]) -> pl.DataType | None:
+    for series in series_list:
+        casted = series.cast(pl.Float32).cast(pl.Float64)
+        # NaN is not equal to NaN, so compare them separately
+        is_same = (casted == series) | (casted.is_nan() & series.is_nan())
+        if not is_same.fill_null(True).all():
+            return None
+    return pl.Float32()
+
+
+def _enum_dtype(
+    series_list: list[pl.Series], max_categories: int, max_category_ratio: float
+) -> pl.DataType | None:
+    n_rows = sum(len(series) for series in series_list)
+    if n_rows == 0:
+        return None
+
+    categories = pl.concat([series.drop_nulls().unique() for series in series_list]).unique()
+    if len(categories) > max_categories or len(categories) > n_rows * max_category_ratio:
+        return None
+    return pl.Enum(categories.sort().to_list())
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from dataclasses import field
+
+from pytred.data_node import DataflowNode
+
+
+@dataclass
+class CriticalPathReport:
+    """
+    Critical path of a dataflow computed from timings of nodes.
+
+    Attributes
+    ----------
+    path : list of str
+        Names of nodes on the critical path, from the first node to the last node.
+    total_seconds : float
+        Length of the critical path, which is the lower bound of the end-to-end latency when
+        independent nodes run in parallel.
+    earliest_start : dict of str to float
+        Earliest start time of each node.
+    latest_start : dict of str to float
+        Latest start time of each node which does not delay the end of the dataflow.
+    durations : dict of str to float
+        Duration of each node. Nodes without timings have 0.
+    """
+
+    path: list[str]
+    total_seconds: float
+    earliest_start: dict[str, float] = field(default_factory=dict)
+    latest_start: dict[str, float] = field(default_factory=dict)
+    durations: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def slack(self) -> dict[str, float]:
+        """
+        Time each node can be delayed without delaying the end of the dataflow.
+        Nodes on the critical path have no slack.
+        """
+        return {
+            name: self.latest_start[name] - self.earliest_start[name]
+            for name in self.earliest_start
+        }
+
+    def summary(self) -> str:
+        lines = [f"Critical path ({self.total_seconds:.3f}s): {' -> '.join(self.path)}"]
+        for name, slack in sorted(self.slack.items(), key=lambda x: (x[1], x[0])):
+            lines.append(f"  {name}: {self.durations[name]:.3f}s, slack {slack:.3f}s")
+        return "\n".join(lines)
+
+
+def compute_critical_path(
+    nodes: list[DataflowNode], timings: Mapping[str, float]
+) -> CriticalPathReport:
+    """
+    Compute the critical path and slack of each node.
+
+    Parameters
+    ----------
+    nodes : list of DataflowNode
+        Nodes of the dataflow in a topological order, e.g. returned by `DataHub.search_tables`.
+    timings : Mapping of str to float
+        Elapsed seconds of nodes, e.g. `TimingRecorder.timings`. Nodes without timings are
+        regarded as taking no time.
+
+    Returns
+    -------
+    CriticalPathReport
+    """
+    durations = {node.name: float(timings.get(node.name, 0.0)) for node in nodes}
+
+    earliest_start: dict[str, float] = {}
+    # predecessor of each node on the longest path to it
+    predecessors: dict[str, str | None] = {}
+    for node in nodes:
+        earliest_start[node.name] = 0.0
+        predecessors[node.name] = None
+        for parent in node.parents:
+            finish = earliest_start[parent.name] + durations[parent.name]
+            if finish > earliest_start[node.name] or predecessors[node.name] is None:
+                earliest_start[node.name] = finish
+                predecessors[node.name] = parent.name
+
+    finishes = {name: earliest_start[name] + durations[name] for name in durations}
+    total_seconds = max(finishes.values(), default=0.0)
+
+    latest_start: dict[str, float] = {}
+    for node in reversed(nodes):
+        latest_finish = min(
+            (latest_start[child.name] for child in node.children), default=total_seconds
+        )
+        latest_start[node.name] = latest_finish - durations[node.name]
+
+    path: list[str] = []
+    last: str | None = max(finishes, key=lambda name: finishes[name]) if finishes else None
+    while last is not None:
+        path.append(last)
+        last = predecessors[last]
+
+    return CriticalPathReport(
+        path=path[::-1],
+        total_seconds=total_seconds,
+        earliest_start=earliest_start,
+        latest_start=latest_start,
+        durations=durations,
+    )
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import polars as pl
+
+from pytred.data_node import DataNode
+from pytred.decorators.duckdb import import_duckdb
+
+
+# Join methods executed in DuckDB. Others are executed in polars.
+DUCKDB_JOIN_METHODS = ("inner", "left", "semi", "anti", "cross")
+
+# Column keeping the row order of the left table
+ROW_INDEX_COLUMN = "__pytred_row_index"
+
+
+def quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def join_with_duckdb(df: pl.DataFrame, join_nodes: Sequence[DataNode]) -> pl.DataFrame:
+    """
+    Joins tables to df in one DuckDB query.
+
+    Tables are registered to DuckDB through Arrow without copying, and the result has the same
+    columns as consecutive `df.join(table, on=keys, how=join, suffix=f"_{name}")` in polars:
+    key columns of the left table are kept and the other duplicated column names get the
+    suffix. Rows keep the order of df.
+
+    Parameters
+    ----------
+    df : pl.DataFrame
+        Left table of joins.
+    join_nodes : Sequence of DataNode
+        DataNodes joined with 'inner', 'left', 'semi', 'anti' or 'cross'.
+
+    Returns
+    -------
+    pl.DataFrame
+        The joined DataFrame.
+    """
+    duckdb = import_duckdb()
+
+    # output column name -> SQL expression of the column
+    columns = {col: f"t0.{quote(col)}" for col in df.columns}
+    clauses = []
+    for i, node in enumerate(join_nodes, 1):
+        if node.join not in DUCKDB_JOIN_METHODS:
+            raise ValueError(f"join '{node.join}' of {node.name} can not be executed in DuckDB.")
+
+        alias = f"t{i}"
+        keys = list(node.keys or [])
+        conditions = " AND ".join(f"{columns[key]} = {alias}.{quote(key)}" for key in keys)
+        if node.join == "cross":
+            clauses.append(f"CROSS JOIN __pytred_table_{i} AS {alias}")
+        else:
+            join = {"inner": "INNER", "left": "LEFT", "semi": "SEMI", "anti": "ANTI"}[node.join]
+            clauses.append(f"{join} JOIN __pytred_table_{i} AS {alias} ON {conditions}")
+
+        if node.join in ["semi", "anti"]:
+            continue
+        for col in node.table.columns:
+            if col in keys:
+                continue
+            name = f"{col}_{node.name}" if col in columns else col
+            columns[name] = f"{alias}.{quote(col)}"
+
+    select = ", ".join(f"{expr} AS {quote(name)}" for name, expr in columns.items())
+    query = (
+        f"SELECT {select} FROM __pytred_table_0 AS t0 {' '.join(clauses)} "
+        f"ORDER BY t0.{quote(ROW_INDEX_COLUMN)}"
+    )
+
+    with duckdb.connect() as connection:
+        connection.register("__pytred_table_0", df.with_row_index(ROW_INDEX_COLUMN))
+        for i, node in enumerate(join_nodes, 1):
+            connection.register(f"__pytred_table_{i}", node.table)
+        joined = connection.sql(query).pl()
+
+    # DuckDB may change dtypes of empty or null columns, so keep those of polars
+    return joined.cast(
+        {col: dtype for col, dtype in df.schema.items() if joined.schema[col] != dtype}
+    )
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Literal
+from typing import Union
+
+import polars as pl
+
+from pytred.exceptions import JoinFanoutError
+
+
+logger = getLogger(__name__)
+
+# 'warn', 'raise' or the maximum fan-out factor
+FanoutPolicy = Union[Literal["warn", "raise"], float]  # noqa: UP007
+
+# Join methods whose output rows can be multiplied by duplicated keys of the right table.
+# Rows of 'right' joins are multiplied by duplicated keys of the left table, which are not
+# estimated.
+FANOUT_JOIN_METHODS = ("inner", "left", "full")
+
+# Estimated fan-out factors under this value are regarded as unique keys, because the number of
+# unique keys is approximated
+FANOUT_TOLERANCE = 1.05
+
+
+@dataclass
+class FanoutEstimate:
+    """
+    Estimated cardinality of a join.
+
+    Attributes
+    ----------
+    name : str
+        Name of the joined table.
+    left_rows : int
+        Number of rows of the left table.
+    right_rows : int
+        Number of rows of the joined table.
+    right_unique_keys : int
+        Approximate number of unique keys of the joined table.
+    """
+
+    name: str
+    left_rows: int
+    right_rows: int
+    right_unique_keys: int
+
+    @property
+    def fanout(self) -> float:
+        """
+        Average number of rows of the joined table per key, which is the factor that rows of
+        the left table are multiplied by the join.
+        """
+        if self.right_unique_keys == 0:
+            return 1.0
+        return max(self.right_rows / self.right_unique_keys, 1.0)
+
+    @property
+    def estimated_rows(self) -> int:
+        return int(self.left_rows * self.fanout)
+
+
+def estimate_fanout(
+    left_rows: int, right: pl.DataFrame, keys: Sequence[str], name: str
+) -> FanoutEstimate:
+    """
+    Estimate the fan-out of joining `right` to a table of `left_rows` rows on `keys` from the
+    approximate number of unique keys of `right`, which costs a single scan of the key columns.
+
+    The estimate assumes duplicated keys are evenly distributed, so a few heavily duplicated
+    keys are underestimated.
+    """
+    key = pl.struct(keys).hash() if len(keys) > 1 else pl.col(keys[0])
+    right_unique_keys = right.select(key.approx_n_unique()).item() if right.height > 0 else 0
+    return FanoutEstimate(
+        name=name,
+        left_rows=left_rows,
+        right_rows=right.height,
+        right_unique_keys=int(right_unique_keys),
+    )
+
+
+def check_fanout(estimate: FanoutEstimate, policy: FanoutPolicy):
+    """
+    Apply the policy to the estimated fan-out.
+
+    Parameters
+    ----------
+    estimate : FanoutEstimate
+        Estimated cardinality of the join.
+    policy : {'warn', 'raise'} or float
+        'warn' logs a warning and 'raise' raises JoinFanoutError when keys of the joined table
+        are not unique. A number is the maximum fan-out factor, over which JoinFanoutError is
+        raised.
+
+    Raises
+    ------
+    JoinFanoutError
+        If the fan-out violates the policy.
+    """
+    if policy in ["warn", "raise"]:
+        if estimate.fanout < FANOUT_TOLERANCE:
+            return
+        message = (
+            f"Join of {estimate.name} multiplies rows by about {estimate.fanout:.2f} "
+            f"({estimate.left_rows} -> {estimate.estimated_rows} rows), because its keys "
+            "are not unique."
+        )
+        if policy == "warn":
+            logger.warning(message)
+        else:
+            raise JoinFanoutError(message)
+    elif isinstance(policy, (int, float)):
+        if estimate.fanout > policy:
+            raise JoinFanoutError(
+                f"Join of {estimate.name} multiplies rows by about {estimate.fanout:.2f} "
+                f"({estimate.left_rows} -> {estimate.estimated_rows} rows), which exceeds the "
+                f"maximum fan-out {policy}."
+            )
+    else:
+        raise ValueError(f"fan-out policy must be 'warn', 'raise' or number, not {policy!r}.")
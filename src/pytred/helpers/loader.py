@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import importlib.util
+from logging import getLogger
+import pathlib
+from types import ModuleType
+from typing import Literal
+
+from pytred.data_hub import DataHub
+from pytred.exceptions import StaticAnalysisError
+from pytred.helpers.static_analysis import load_datahub_class_statically
+
+
+logger = getLogger(__name__)
+
+
+def load_module(file_path: str | pathlib.Path) -> ModuleType:
+    """
+    Import a script file as a module.
+    """
+    spec = importlib.util.spec_from_file_location("visualize_datahub", file_path)
+    if spec is None:
+        raise FileNotFoundError(f"{file_path} is not found.")
+    module = importlib.util.module_from_spec(spec)
+    if module is None:
+        raise RuntimeError(f"Failed to convert {file_path} to module.")
+    spec.loader.exec_module(module)  # type: ignore
+
+    return module
+
+
+def load_datahub_class(file_path: str | pathlib.Path, class_name: str) -> type[DataHub]:
+    """
+    Import the DataHub class from a script file.
+    """
+    return getattr(load_module(file_path), class_name)
+
+
+class ReportDataHubLoader:
+    """
+    Load DataHub classes of a script file for reports by static analysis, by import, or by static
+    analysis falling back to import. The file is imported at most once for all of its classes.
+
+    Parameters
+    ----------
+    file_path : str or pathlib.Path
+        Path of the script file.
+    mode : {'auto', 'static', 'import'}, default 'auto'
+        How DataHub classes are loaded. See `pytred report --mode`.
+    """
+
+    def __init__(
+        self, file_path: str | pathlib.Path, mode: Literal["auto", "static", "import"] = "auto"
+    ):
+        self.file_path = file_path
+        self.mode = mode
+        self._module: ModuleType | None = None
+        self._import_error: Exception | None = None
+
+    def load(self, class_name: str) -> type[DataHub]:
+        if self.mode == "import":
+            return getattr(self._import(), class_name)
+        try:
+            return load_datahub_class_statically(self.file_path, class_name)
+        except StaticAnalysisError as err:
+            if self.mode == "static":
+                raise
+            logger.info(f"Import {self.file_path} since static analysis failed: {err}")
+            return getattr(self._import(), class_name)
+
+    def _import(self) -> ModuleType:
+        # errors are kept so that a failing module is not executed again for other classes
+        if self._import_error is not None:
+            raise self._import_error
+        if self._module is None:
+            try:
+                self._module = load_module(self.file_path)
+            except Exception as err:
+                self._import_error = err
+                raise
+        return self._module
+
+
+def load_report_datahub_class(
+    file_path: str | pathlib.Path,
+    class_name: str,
+    mode: Literal["auto", "static", "import"] = "auto",
+) -> type[DataHub]:
+    """
+    Load the DataHub class for reports by static analysis, by import, or by static analysis
+    falling back to import.
+    """
+    return ReportDataHubLoader(file_path, mode).load(class_name)
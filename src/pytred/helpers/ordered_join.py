@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import polars as pl
+
+from pytred.data_node import DataNode
+
+
+# Join methods matching rows by the order of a column instead of the equality of keys.
+# Keys of these joins are optional `by` keys which must be equal.
+ORDERED_JOIN_METHODS = ("asof", "range")
+ASOF_STRATEGIES = ("backward", "forward", "nearest")
+
+# Column keeping the row order of the left table
+ROW_INDEX_COLUMN = "__pytred_row_index"
+
+
+def validate_join_options(join: str | None, join_options: Mapping[str, Any] | None):
+    """
+    Validates options of 'asof' and 'range' joins.
+
+    Raises
+    ------
+    ValueError
+        If options are given to other joins, or required options are missing.
+    """
+    options = dict(join_options or {})
+    if join not in ORDERED_JOIN_METHODS:
+        if options:
+            raise ValueError(f"Options of joins are only for {ORDERED_JOIN_METHODS}: {options}")
+        return
+    if not isinstance(options.get("on"), str):
+        raise ValueError(f"'on' column is required by '{join}' join.")
+    if join == "asof" and options.get("strategy", "backward") not in ASOF_STRATEGIES:
+        raise ValueError(f"strategy of 'asof' join must be one of {ASOF_STRATEGIES}.")
+    if join == "range":
+        between = options.get("between")
+        if not isinstance(between, (tuple, list)) or len(between) != 2:
+            raise ValueError("'between' columns (start, end) are required by 'range' join.")
+
+
+def get_join_columns(table_node: DataNode) -> list[str]:
+    """
+    Returns columns of the table of the DataNode used by its join other than the keys.
+    """
+    options = table_node.join_options or {}
+    if table_node.join == "asof":
+        return [options["on"]]
+    if table_node.join == "range":
+        return list(options["between"])
+    return []
+
+
+def join_data_node(df: pl.DataFrame, table_node: DataNode) -> pl.DataFrame:
+    """
+    Joins the table of the DataNode to df.
+
+    'asof' joins are executed by `join_asof` and 'range' joins by `join_where`, others by
+    `join`. Columns of the table which are also in df get the suffix `_{name}`.
+
+    Parameters
+    ----------
+    df : pl.DataFrame
+        Left table of the join.
+    table_node : DataNode
+        DataNode to be joined.
+
+    Returns
+    -------
+    pl.DataFrame
+        The joined DataFrame.
+    """
+    if table_node.join == "asof":
+        return join_asof(df, table_node)
+    if table_node.join == "range":
+        return join_range(df, table_node)
+    return df.join(
+        table_node.table,
+        on=table_node.keys,
+        how=table_node.join,  # type: ignore[arg-type]
+        suffix=f"_{table_node.name}",
+    )
+
+
+def join_asof(df: pl.DataFrame, table_node: DataNode) -> pl.DataFrame:
+    """
+    Joins each row of df with the nearest row of the table by the `on` column, among rows with
+    the same keys, by a sort-merge join. Rows keep the order of df.
+
+    Options of the DataNode are `on`, `strategy` ('backward', 'forward' or 'nearest',
+    default 'backward') and `tolerance` (a number or a duration string such as '7d').
+    """
+    options = table_node.join_options or {}
+    on = options["on"]
+    table = table_node.table
+    if not table[on].is_sorted():
+        table = table.sort(on)
+
+    def join(left: pl.DataFrame) -> pl.DataFrame:
+        return left.join_asof(
+            table,
+            on=on,
+            by=list(table_node.keys) if table_node.keys else None,
+            strategy=options.get("strategy", "backward"),
+            tolerance=options.get("tolerance"),
+            suffix=f"_{table_node.name}",
+            check_sortedness=False,
+        )
+
+    if df[on].is_sorted():
+        return join(df)
+    return (
+        join(df.with_row_index(ROW_INDEX_COLUMN).sort(on))
+        .sort(ROW_INDEX_COLUMN)
+        .drop(ROW_INDEX_COLUMN)
+    )
+
+
+def join_range(df: pl.DataFrame, table_node: DataNode) -> pl.DataFrame:
+    """
+    Joins each row of df with rows of the table whose interval contains the `on` column,
+    among rows with the same keys. Rows without matches are dropped like an inner join.
+
+    Options of the DataNode are `on` and `between`, the (start, end) columns of the closed
+    interval in the table. The start and end columns must not be in df.
+    """
+    options = table_node.join_options or {}
+    on = options["on"]
+    start, end = options["between"]
+    suffix = f"_{table_node.name}"
+    keys = list(table_node.keys or [])
+
+    predicates = [pl.col(on) >= pl.col(start), pl.col(on) <= pl.col(end)]
+    predicates += [pl.col(key) == pl.col(f"{key}{suffix}") for key in keys]
+    joined = df.join_where(table_node.table, *predicates, suffix=suffix)
+    # keys of the table are the same as keys of df
+    return joined.drop([f"{key}{suffix}" for key in keys])
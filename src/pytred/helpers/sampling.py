@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from collections.abc import Sequence
+
+import polars as pl
+
+
+# Resolution of sampling fractions
+SAMPLING_BUCKETS = 2**32
+
+
+def sample_by_keys(
+    df: pl.DataFrame,
+    keys: Sequence[str],
+    fraction: float,
+    seed: int = 0,
+    key_dtypes: Mapping[str, pl.DataType] | None = None,
+) -> pl.DataFrame:
+    """
+    Sample rows by the hash of key columns.
+
+    Whether a row is sampled is decided only by its key values, so tables sampled with the same
+    keys, fraction and seed keep the same keys, and joins of sampled tables match as well as the
+    original tables.
+
+    Parameters
+    ----------
+    df : pl.DataFrame
+        DataFrame to be sampled. It must have the key columns.
+    keys : Sequence of str
+        Key columns.
+    fraction : float
+        Fraction of keys to be sampled, in (0, 1].
+    seed : int, default 0
+        Seed of the hash.
+    key_dtypes : Mapping of str to pl.DataType, optional
+        Dtypes which key columns are cast to before hashing. Hashes of the same values with
+        different dtypes differ, so the key columns of all tables must be hashed with the same
+        dtypes.
+
+    Returns
+    -------
+    pl.DataFrame
+        Sampled DataFrame.
+    """
+    if not 0 < fraction <= 1:
+        raise ValueError(f"fraction must be in (0, 1], not {fraction}.")
+
+    key_columns = [
+        pl.col(key).cast(key_dtypes[key]) if key_dtypes and key in key_dtypes else pl.col(key)
+        for key in keys
+    ]
+    bucket = pl.struct(key_columns).hash(seed) % SAMPLING_BUCKETS
+    return df.filter(bucket < int(fraction * SAMPLING_BUCKETS))
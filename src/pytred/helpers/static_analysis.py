@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import ast
+from collections.abc import Callable
+import inspect
+import pathlib
+
+from pytred.data_hub import DataHub
+from pytred.decorators import table
+from pytred.decorators.duckdb import duckdb_optional_table
+from pytred.decorators.duckdb import duckdb_table
+from pytred.decorators.polars import polars_agg
+from pytred.decorators.polars import polars_expr
+from pytred.decorators.polars import polars_optional_table
+from pytred.decorators.polars import polars_table
+from pytred.decorators.polars import polars_tables
+from pytred.exceptions import StaticAnalysisError
+
+
+# Decorators of pytred which can be applied to stub functions without executing user code
+STATIC_DECORATORS: dict[str, Callable] = {
+    "polars_table": polars_table,
+    "polars_optional_table": polars_optional_table,
+    "polars_expr": polars_expr,
+    "polars_agg": polars_agg,
+    # outputs are not literals, so that classes using it are imported by the 'auto' mode
+    "polars_tables": polars_tables,
+    "duckdb_table": duckdb_table,
+    "duckdb_optional_table": duckdb_optional_table,
+    "table": table,
+}
+
+# Builtin decorators of methods which do not make tables
+BUILTIN_DECORATORS = ("staticmethod", "classmethod", "property")
+
+
+def load_datahub_class_statically(file_path: str | pathlib.Path, class_name: str) -> type[DataHub]:
+    """
+    Build a DataHub class from the source of a script file without importing it.
+
+    The module's AST is parsed for functions decorated by pytred decorators, and a DataHub class
+    with stub functions having the same names, signatures, docstrings and metadata is returned.
+    The stub functions cannot be executed, but the class can be used for reports and dataflow
+    graphs, e.g. by `report_datahub`, without importing the dependencies of the module or running
+    its side effects.
+
+    Parameters
+    ----------
+    file_path : str or pathlib.Path
+        Path of the script file.
+    class_name : str
+        Name of the DataHub class defined in the file.
+
+    Returns
+    -------
+    type of DataHub
+
+    Raises
+    ------
+    FileNotFoundError
+        If file_path is not found.
+    StaticAnalysisError
+        If the class cannot be built statically, e.g. when arguments of decorators are not
+        literals, or the class uses NestedDataHub or inherits classes defined in other modules.
+        Import the module in this case.
+    """
+    path = pathlib.Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"{file_path} is not found.")
+    module = ast.parse(path.read_text(), filename=str(path))
+
+    aliases = _collect_pytred_aliases(module)
+    class_defs = {node.name: node for node in module.body if isinstance(node, ast.ClassDef)}
+    if class_name not in class_defs:
+        raise StaticAnalysisError(f"{class_name} is not defined at the top level of {file_path}.")
+
+    attributes: dict[str, object] = {}
+    attributes.update(_collect_functions(class_defs[class_name], class_defs, aliases))
+    attributes["__doc__"] = ast.get_docstring(class_defs[class_name], clean=False)
+    attributes["__module__"] = path.stem
+    return type(class_name, (DataHub,), attributes)
+
+
+def find_datahub_classes(file_path: str | pathlib.Path) -> list[str]:
+    """
+    Find names of DataHub classes defined at the top level of a script file without importing it.
+    Classes inheriting DataHub or other DataHub classes defined in the same file are found.
+
+    Parameters
+    ----------
+    file_path : str or pathlib.Path
+        Path of the script file.
+
+    Returns
+    -------
+    list of str
+        Names of DataHub classes in the order of definition.
+    """
+    path = pathlib.Path(file_path)
+    module = ast.parse(path.read_text(), filename=str(path))
+    aliases = _collect_pytred_aliases(module)
+
+    class_names: list[str] = []
+    for node in module.body:
+        if isinstance(node, ast.ClassDef) and any(
+            _resolve_name(base, aliases) == "DataHub"
+            or (isinstance(base, ast.Name) and base.id in class_names)
+            for base in node.bases
+        ):
+            class_names.append(node.name)
+    return class_names
+
+
+def _collect_pytred_aliases(module: ast.Module) -> dict[str, str]:
+    """
+    Map local names of modules and objects imported from pytred to their qualified names,
+    e.g. `pt` of `import pytred as pt` to `pytred` and `decorators` of
+    `from pytred import decorators` to `pytred.decorators`.
+    """
+    aliases = {}
+    for node in module.body:
+        if isinstance(node, ast.ImportFrom) and (node.module or "").split(".")[0] == "pytred":
+            for alias in node.names:
+                aliases[alias.asname or alias.name] = f"{node.module}.{alias.name}"
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name.split(".")[0] != "pytred":
+                    continue
+                if alias.asname:
+                    aliases[alias.asname] = alias.name
+                else:
+                    # `import pytred.decorators` binds `pytred`
+                    aliases["pytred"] = "pytred"
+    return aliases
+
+
+def _resolve_name(node: ast.expr, aliases: dict[str, str]) -> str | None:
+    """
+    Resolve the original name of an object of pytred referred by a name or an attribute,
+    e.g. `polars_table`, `pt` imported as an alias, `decorators.polars_table` of an imported
+    module or `pytred.decorators.polars_table`.
+    """
+    attributes = []
+    while isinstance(node, ast.Attribute):
+        attributes.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name) or node.id not in aliases:
+        return None
+    qualified_name = ".".join([aliases[node.id], *reversed(attributes)])
+    return qualified_name.split(".")[-1]
+
+
+def _collect_functions(
+    class_def: ast.ClassDef, class_defs: dict[str, ast.ClassDef], aliases: dict[str, str]
+) -> dict[str, Callable]:
+    functions = _resolve_bases(class_def, class_defs, aliases)
+
+    for node in class_def.body:
+        if isinstance(node, (ast.Assign, ast.AnnAssign)) and isinstance(node.value, ast.Call):
+            if _resolve_name(node.value.func, aliases) == "NestedDataHub":
+                raise StaticAnalysisError(
+                    f"NestedDataHub in {class_def.name} cannot be resolved statically."
+                )
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+
+        table_decorator = _table_decorator(class_def, node, aliases)
+        if table_decorator is None:
+            # overriding a table function by a plain function removes the table
+            functions.pop(node.name, None)
+            continue
+        functions[node.name] = _make_stub_function(node, table_decorator, aliases)
+
+    return functions
+
+
+def _resolve_bases(
+    class_def: ast.ClassDef, class_defs: dict[str, ast.ClassDef], aliases: dict[str, str]
+) -> dict[str, Callable]:
+    """
+    Collect functions of base classes defined in the same module, which are inherited.
+    """
+    functions: dict[str, Callable] = {}
+    for base in class_def.bases:
+        if _resolve_name(base, aliases) == "DataHub":
+            continue
+        if isinstance(base, ast.Name) and base.id in class_defs:
+            functions.update(_collect_functions(class_defs[base.id], class_defs, aliases))
+            continue
+        raise StaticAnalysisError(
+            f"Base class {ast.unparse(base)} of {class_def.name} cannot be resolved statically."
+        )
+    return functions
+
+
+def _table_decorator(
+    class_def: ast.ClassDef,
+    node: ast.FunctionDef | ast.AsyncFunctionDef,
+    aliases: dict[str, str],
+) -> ast.expr | None:
+    """
+    Returns the table decorator of the function definition, or None for plain functions.
+    """
+    decorators = [
+        (decorator, _resolve_name(getattr(decorator, "func", decorator), aliases))
+        for decorator in node.decorator_list
+    ]
+    for decorator, name in decorators:
+        # decorators of other modules may make tables, e.g. by wrapping polars_table
+        if name not in STATIC_DECORATORS and not _is_builtin_decorator(decorator, aliases):
+            raise StaticAnalysisError(
+                f"Decorator {ast.unparse(decorator)} of {class_def.name}.{node.name} cannot "
+                "be resolved statically."
+            )
+    table_decorators = [d for d, name in decorators if name in STATIC_DECORATORS]
+    if not table_decorators:
+        return None
+    if len(decorators) > 1:
+        raise StaticAnalysisError(
+            f"{class_def.name}.{node.name} has decorators other than a table decorator."
+        )
+    return table_decorators[0]
+
+
+def _is_builtin_decorator(decorator: ast.expr, aliases: dict[str, str]) -> bool:
+    return (
+        isinstance(decorator, ast.Name)
+        and decorator.id in BUILTIN_DECORATORS
+        and decorator.id not in aliases
+    )
+
+
+def _make_stub_function(
+    node: ast.FunctionDef | ast.AsyncFunctionDef, decorator: ast.expr, aliases: dict[str, str]
+) -> Callable:
+    """
+    Make a function with the same name, signature and docstring as the function definition,
+    decorated by the same decorator with the same arguments.
+    """
+    if not isinstance(decorator, ast.Call):
+        raise StaticAnalysisError(f"Decorator of {node.name} must be called with arguments.")
+    try:
+        args = [ast.literal_eval(arg) for arg in decorator.args]
+        kwargs = {str(kw.arg): ast.literal_eval(kw.value) for kw in decorator.keywords if kw.arg}
+    except (ValueError, TypeError) as err:
+        raise StaticAnalysisError(
+            f"Arguments of the decorator of {node.name} are not literals."
+        ) from err
+    if len(kwargs) < len(decorator.keywords):
+        raise StaticAnalysisError(f"Decorator of {node.name} uses ** arguments.")
+
+    def stub(*args, **kwargs):
+        raise StaticAnalysisError(
+            f"{node.name} is built by static analysis and is not executable."
+        )
+
+    stub.__name__ = stub.__qualname__ = node.name
+    stub.__doc__ = ast.get_docstring(node, clean=False)
+    stub.__signature__ = _make_signature(node.args)  # type: ignore[attr-defined]
+
+    decorator_function = STATIC_DECORATORS[str(_resolve_name(decorator.func, aliases))]
+    return decorator_function(*args, **kwargs)(stub)
+
+
+def _make_signature(arguments: ast.arguments) -> inspect.Signature:
+    """
+    Make a signature with the argument names of the function definition. Defaults which are not
+    literals are replaced by Ellipsis, since only whether an argument has a default matters.
+    """
+    parameters = []
+    positional = [*arguments.posonlyargs, *arguments.args]
+    defaults = [None] * (len(positional) - len(arguments.defaults)) + list(arguments.defaults)
+    for arg, default in zip(positional, defaults):  # noqa: B905
+        parameters.append(
+            inspect.Parameter(
+                arg.arg, inspect.Parameter.POSITIONAL_OR_KEYWORD, default=_literal_default(default)
+            )
+        )
+    for arg, default in zip(arguments.kwonlyargs, arguments.kw_defaults):  # noqa: B905
+        parameters.append(
+            inspect.Parameter(
+                arg.arg, inspect.Parameter.KEYWORD_ONLY, default=_literal_default(default)
+            )
+        )
+    return inspect.Signature(parameters)
+
+
+def _literal_default(default: ast.expr | None):
+    if default is None:
+        return inspect.Parameter.empty
+    try:
+        return ast.literal_eval(default)
+    except (ValueError, TypeError):
+        return ...
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import replace
+
+import polars as pl
+
+from pytred.data_node import DataNode
+
+
+# Join methods whose output keeps only the key columns of the left table
+SURROGATE_JOIN_METHODS = ("inner", "left", "semi", "anti")
+
+
+def get_surrogate_column_name(keys: Sequence[str]) -> str:
+    return "__pytred_surrogate_" + "_".join(keys)
+
+
+def encode_surrogate_keys(
+    root_df: pl.DataFrame,
+    join_nodes: list[DataNode],
+) -> tuple[pl.DataFrame, list[DataNode], list[str]]:
+    """
+    Replace composite join keys with a single integer surrogate key.
+
+    A dense integer dictionary over the key tuples of root_df and all tables sharing the same
+    keys is built once. root_df and the tables get the surrogate key column, and the tables are
+    joined on it instead of hashing all key columns in every join.
+    Only keys which are composed of two or more columns, shared by two or more tables and joined
+    with 'inner', 'left', 'semi' or 'anti' are encoded. Rows with null in any key column get a
+    null surrogate key, so they are not matched as well as the original join.
+
+    Parameters
+    ----------
+    root_df : pl.DataFrame
+        The base DataFrame of joins.
+    join_nodes : list of DataNode
+        DataNodes to be joined with root_df.
+
+    Returns
+    -------
+    tuple of pl.DataFrame, list of DataNode and list of str
+        root_df with surrogate key columns, DataNodes joined on surrogate keys and the names
+        of surrogate key columns, which should be dropped after joins.
+    """
+    groups: dict[tuple[str, ...], list[DataNode]] = {}
+    for node in join_nodes:
+        if node.join not in SURROGATE_JOIN_METHODS or node.keys is None or len(node.keys) < 2:
+            continue
+        groups.setdefault(tuple(node.keys), []).append(node)
+
+    encoded_nodes: dict[str, DataNode] = {}
+    surrogate_columns = []
+    for keys, nodes in groups.items():
+        if len(nodes) < 2 or not _is_encodable(root_df, [node.table for node in nodes], keys):
+            continue
+
+        surrogate_column = get_surrogate_column_name(keys)
+        frames = [root_df.select(keys)] + [node.table.select(keys) for node in nodes]
+        dictionary = pl.concat(frames).drop_nulls().unique().with_row_index(surrogate_column)
+
+        root_df = root_df.join(dictionary, on=keys, how="left")
+        for node in nodes:
+            table = node.table.join(dictionary, on=keys, how="left").drop(keys)
+            encoded_nodes[node.name] = replace(node, table=table, keys=[surrogate_column])
+        surrogate_columns.append(surrogate_column)
+
+    return (
+        root_df,
+        [encoded_nodes.get(node.name, node) for node in join_nodes],
+        surrogate_columns,
+    )
+
+
+def _is_encodable(
+    root_df: pl.DataFrame, tables: list[pl.DataFrame], keys: tuple[str, ...]
+) -> bool:
+    """
+    Keys can be encoded if all frames have the key columns with the same dtypes.
+    """
+    if not set(keys).issubset(root_df.columns):
+        return False
+    if get_surrogate_column_name(keys) in root_df.columns:
+        return False
+    schema = root_df.select(keys).schema
+    return all(table.select(keys).schema == schema for table in tables)
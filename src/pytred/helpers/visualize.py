@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 import pathlib
 import subprocess
 import sys
@@ -10,6 +11,7 @@ from pytred.data_hub import DataHub
 from pytred.data_node import DataflowGraph
 from pytred.data_node import DataflowNode
 from pytred.data_node import EmptyDataNode
+from pytred.helpers.critical_path import compute_critical_path
 from pytred.helpers.md_tabulator import MarkdownTableTabulator
 
 
@@ -91,6 +93,7 @@ def make_dataflow_graph_from_datahub(
     *tables: EmptyDataNode,
     output: str | pathlib.Path | None = None,
     direction: Literal["TD", "LR"] = "TD",
+    timings: Mapping[str, float] | None = None,
 ) -> tuple[DataflowGraph, list[DataflowNode]]:
     """
     Visualize the hierarchical structure of data preprocessing nodes from DataHub.
@@ -105,10 +108,14 @@ def make_dataflow_graph_from_datahub(
         graph direction
     *tables: EmptyDataNode
         DataNode used in input DataHub class
+    timings: Mapping of str to float, optional
+        Elapsed seconds of functions. If given, the critical path is highlighted.
 
     """
     nodes = datahub_class.search_tables(*tables)
     graph = datahub_class.get_dataflow_graph(nodes, direction)
+    if timings is not None:
+        graph.highlight_path(compute_critical_path(nodes, timings).path)
 
     if output is not None:
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+from contextlib import closing
+from dataclasses import dataclass
+from dataclasses import field
+import pathlib
+import sqlite3
+import statistics
+import threading
+
+import polars as pl
+
+from pytred.callbacks import ExecutionCallback
+from pytred.callbacks import ExecutionEvent
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    hub TEXT NOT NULL,
+    label TEXT,
+    timestamp REAL NOT NULL,
+    elapsed_seconds REAL,
+    n_rows INTEGER,
+    size INTEGER
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    elapsed_seconds REAL,
+    n_rows INTEGER,
+    size INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_hub ON runs (hub, run_id);
+CREATE INDEX IF NOT EXISTS nodes_run_id ON nodes (run_id);
+"""
+
+# Metrics of nodes compared by `PerformanceHistory.compare`
+METRICS = ("elapsed_seconds", "size")
+
+
+class HistoryRecorder(ExecutionCallback):
+    """
+    Appends timings, row counts and sizes of functions and joins of each execution to a SQLite
+    file, which is read by `PerformanceHistory` to detect regressions. Concurrent executions
+    are recorded as separate runs.
+
+    Examples
+    --------
+    >>> datahub.add_callback(HistoryRecorder("pytred_history.sqlite", label=git_commit))
+    >>> datahub.execute()
+    """
+
+    def __init__(self, path: str | pathlib.Path, label: str | None = None):
+        """
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            Path of the SQLite file. It is created if it does not exist.
+        label : str, optional
+            Label of runs, e.g. a commit hash or a version of the pipeline.
+        """
+        self.path = pathlib.Path(path)
+        self.label = label
+        self._lock = threading.Lock()
+        # nodes of running executions keyed by their threads
+        self._nodes: dict[int, list[tuple[str, str, float | None, int | None, int | None]]] = {}
+
+    def on_execute_start(self, event: ExecutionEvent):
+        with self._lock:
+            self._nodes[threading.get_ident()] = []
+
+    def on_node_end(self, event: ExecutionEvent):
+        self._append("node", event)
+
+    def on_join_end(self, event: ExecutionEvent):
+        self._append("join", event)
+
+    def _append(self, kind: str, event: ExecutionEvent):
+        with self._lock:
+            self._nodes.setdefault(threading.get_ident(), []).append(
+                (str(event.name), kind, event.elapsed_seconds, event.n_rows, event.size)
+            )
+
+    def on_execute_end(self, event: ExecutionEvent):
+        with self._lock:
+            nodes = self._nodes.pop(threading.get_ident(), [])
+            with closing(connect(self.path)) as connection, connection:
+                cursor = connection.execute(
+                    "INSERT INTO runs (hub, label, timestamp, elapsed_seconds, n_rows, size) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        event.hub,
+                        self.label,
+                        event.timestamp,
+                        event.elapsed_seconds,
+                        event.n_rows,
+                        event.size,
+                    ),
+                )
+                connection.executemany(
+                    "INSERT INTO nodes (run_id, name, kind, elapsed_seconds, n_rows, size) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(cursor.lastrowid, *node) for node in nodes],
+                )
+
+
+def connect(path: str | pathlib.Path) -> sqlite3.Connection:
+    """
+    Connects to the history file and creates tables if they do not exist.
+    """
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+@dataclass
+class NodeRegression:
+    """
+    Metric of a function or a join which grew beyond the threshold.
+    """
+
+    name: str
+    kind: str
+    metric: str
+    baseline: float
+    latest: float
+
+    @property
+    def ratio(self) -> float:
+        return self.latest / self.baseline if self.baseline else float("inf")
+
+
+@dataclass
+class RegressionReport:
+    """
+    Result of `PerformanceHistory.compare`.
+
+    Attributes
+    ----------
+    hub : str
+        Name of the DataHub class.
+    run_id : int
+        Run compared with the baseline.
+    baseline_run_ids : list of int
+        Runs of the baseline.
+    regressions : list of NodeRegression
+        Metrics which grew beyond the thresholds.
+    """
+
+    hub: str
+    run_id: int
+    baseline_run_ids: list[int]
+    regressions: list[NodeRegression] = field(default_factory=list)
+
+    @property
+    def has_regressions(self) -> bool:
+        return len(self.regressions) > 0
+
+    def summary(self) -> str:
+        lines = [
+            f"{self.hub}: run {self.run_id} vs baseline runs {self.baseline_run_ids}, "
+            f"{len(self.regressions)} regressions"
+        ]
+        for r in self.regressions:
+            lines.append(
+                f"  {r.kind} {r.name}: {r.metric} {r.baseline:.6g} -> {r.latest:.6g} "
+                f"(x{r.ratio:.2f})"
+            )
+        return "\n".join(lines)
+
+
+class PerformanceHistory:
+    """
+    Reads the history file written by `HistoryRecorder`.
+    """
+
+    def __init__(self, path: str | pathlib.Path):
+        self.path = pathlib.Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"{path} is not found.")
+
+    def _query(self, sql: str, parameters: tuple = ()) -> pl.DataFrame:
+        with closing(connect(self.path)) as connection:
+            cursor = connection.execute(sql, parameters)
+            columns = [column[0] for column in cursor.description]
+            rows = cursor.fetchall()
+        return pl.DataFrame(rows, schema=columns, orient="row")
+
+    def runs(self, hub: str | None = None) -> pl.DataFrame:
+        """
+        Returns runs in the order of execution, optionally of a DataHub class.
+        """
+        if hub is None:
+            return self._query("SELECT * FROM runs ORDER BY run_id")
+        return self._query("SELECT * FROM runs WHERE hub = ? ORDER BY run_id", (hub,))
+
+    def nodes(self, run_id: int) -> pl.DataFrame:
+        """
+        Returns timings, row counts and sizes of functions and joins of a run.
+        """
+        return self._query("SELECT * FROM nodes WHERE run_id = ?", (run_id,))
+
+    def compare(
+        self,
+        hub: str,
+        run_id: int | None = None,
+        baseline: int | None = None,
+        baseline_runs: int = 5,
+        time_threshold: float = 0.2,
+        size_threshold: float = 0.2,
+        min_seconds: float = 0.01,
+    ) -> RegressionReport:
+        """
+        Compares a run with the baseline and finds functions and joins whose time or size grew
+        beyond the thresholds.
+
+        Parameters
+        ----------
+        hub : str
+            Name of the DataHub class.
+        run_id : int, optional
+            Run to compare. Defaults to the latest run of the hub.
+        baseline : int, optional
+            Run used as the baseline. Defaults to the median of `baseline_runs` runs before
+            `run_id`, which is robust to noisy runs.
+        baseline_runs : int, default 5
+            Number of runs of the default baseline.
+        time_threshold : float, default 0.2
+            Relative growth of elapsed seconds regarded as a regression, e.g. 0.2 for 20%.
+        size_threshold : float, default 0.2
+            Relative growth of sizes regarded as a regression.
+        min_seconds : float, default 0.01
+            Functions and joins faster than this in both runs are not regarded as regressions
+            of time, since their timings are dominated by noise.
+
+        Returns
+        -------
+        RegressionReport
+        """
+        run_id, baseline_run_ids = self._select_runs(hub, run_id, baseline, baseline_runs)
+        latest = self._metrics([run_id])
+        baselines = self._metrics(baseline_run_ids)
+        thresholds = {"elapsed_seconds": time_threshold, "size": size_threshold}
+
+        report = RegressionReport(hub, run_id, baseline_run_ids)
+        for key, rows in latest.items():
+            for metric in METRICS:
+                latest_value = rows[0][metric]
+                history = [v[metric] for v in baselines.get(key, []) if v[metric] is not None]
+                if latest_value is None or not history:
+                    continue
+                baseline_value = statistics.median(history)
+                if metric == "elapsed_seconds" and max(latest_value, baseline_value) < min_seconds:
+                    continue
+                if latest_value > baseline_value * (1 + thresholds[metric]):
+                    report.regressions.append(
+                        NodeRegression(key[0], key[1], metric, baseline_value, latest_value)
+                    )
+        return report
+
+    def _select_runs(
+        self, hub: str, run_id: int | None, baseline: int | None, baseline_runs: int
+    ) -> tuple[int, list[int]]:
+        """
+        Returns the run to compare and runs of the baseline.
+        """
+        run_ids = self.runs(hub)["run_id"].to_list()
+        if run_id is None:
+            if not run_ids:
+                raise ValueError(f"There are no runs of {hub}.")
+            run_id = run_ids[-1]
+        elif run_id not in run_ids:
+            raise ValueError(f"Run {run_id} of {hub} is not found.")
+
+        if baseline is None:
+            baseline_run_ids = [i for i in run_ids if i < run_id][-baseline_runs:]
+        else:
+            baseline_run_ids = [baseline]
+        if not baseline_run_ids:
+            raise ValueError(f"There are no baseline runs before run {run_id} of {hub}.")
+        return run_id, baseline_run_ids
+
+    def _metrics(self, run_ids: list[int]) -> dict[tuple[str, str], list[dict]]:
+        """
+        Metrics of functions and joins of runs, keyed by names and kinds.
+        """
+        metrics: dict[tuple[str, str], list[dict]] = {}
+        for run_id in run_ids:
+            for row in self.nodes(run_id).iter_rows(named=True):
+                metrics.setdefault((row["name"], row["kind"]), []).append(row)
+        return metrics
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from collections.abc import Mapping
+from dataclasses import replace
+import inspect
+from typing import TYPE_CHECKING
+
+import polars as pl
+
+from pytred._types import POLARS_JOIN_METHOD
+from pytred.data_node import DataNode
+from pytred.decorators.polars import polars_table
+from pytred.helpers.decorator import get_metadata
+from pytred.helpers.ordered_join import join_data_node
+
+
+if TYPE_CHECKING:
+    from pytred.data_hub import DataHub
+
+
+# Separator of the name of a nested DataHub and names of its tables
+NESTED_TABLE_SEPARATOR = "__"
+
+
+class NestedDataHub:
+    """
+    Declares another DataHub subclass as a table of a DataHub.
+
+    Functions of the nested DataHub are fused into the outer DataHub as its own functions named
+    `{name}__{function name}`, so they are scheduled, spilled and reported together with
+    the functions of the outer DataHub, and the tables of the nested DataHub are never
+    materialized as a separate DataHub. The table `name` is the output of the nested DataHub:
+    its root table joined with its tables and processed by its `post_step`.
+
+    Functions of the nested DataHub are called on an instance created without calling its
+    `__init__`, so they must not depend on attributes set in `__init__`.
+    Only tables of functions of the nested DataHub are joined to its output, and input
+    tables of the nested DataHub are not.
+
+    Examples
+    --------
+    >>> class OuterDataHub(DataHub):
+    ...     user_features = NestedDataHub(
+    ...         UserFeatureHub, 0, "user_id", join="left", root="users",
+    ...         tables={"orders": "user_orders"},
+    ...     )
+    """
+
+    def __init__(
+        self,
+        hub: type[DataHub],
+        order: int,
+        *keys: str,
+        join: POLARS_JOIN_METHOD | None = None,
+        root: str = "root_df",
+        tables: Mapping[str, str] | None = None,
+        is_validate_unique: bool = True,
+    ):
+        """
+        Parameters
+        ----------
+        hub : type of DataHub
+            DataHub subclass to be nested.
+        order : int
+            The order from which functions of the nested DataHub are executed. The order of
+            each function is shifted by `order`, and the output table is created at
+            `order + (the maximum order of the nested DataHub) + 1`.
+        keys : str
+            The names of the key columns to join the output table.
+        join : {'inner', 'left', 'right', 'full', 'semi', 'anti', 'cross'}, optional
+            The join type of the output table. If None, the output table is not joined.
+        root : str, default 'root_df'
+            Name of the table of the outer DataHub used as root_df of the nested DataHub.
+        tables : Mapping of str to str, optional
+            Names of tables of the outer DataHub passed as input tables of the nested DataHub,
+            keyed by the input table names of the nested DataHub. Input tables which are not
+            in the mapping are passed from the tables of the same name.
+        is_validate_unique : bool, default True
+            Whether to validate the uniqueness of the keys of the output table.
+        """
+        if not hub.registerd_tables_order:
+            raise ValueError(f"{hub.__name__} has no functions to be nested.")
+        expression_functions = [
+            name
+            for name in hub.registerd_tables_order
+            if get_metadata(getattr(hub, name), "is_expression")
+        ]
+        if expression_functions:
+            raise ValueError(
+                f"{hub.__name__} has expression functions which cannot be nested: "
+                f"{expression_functions}"
+            )
+        self.hub = hub
+        self.order = order
+        self.keys = keys
+        self.join = join
+        self.root = root
+        self.tables = dict(tables or {})
+        self.is_validate_unique = is_validate_unique
+
+    def build_functions(self, name: str) -> dict[str, Callable]:
+        """
+        Creates functions of the outer DataHub which execute the nested DataHub.
+
+        Parameters
+        ----------
+        name : str
+            Name of the output table in the outer DataHub.
+
+        Returns
+        -------
+        dict of str to Callable
+            Functions keyed by their names in the outer DataHub.
+        """
+        from pytred.data_hub import ROOT_TABLE_NAME
+
+        table_order = self.hub.registerd_tables_order or {}
+        names = {
+            inner_name: f"{name}{NESTED_TABLE_SEPARATOR}{inner_name}" for inner_name in table_order
+        }
+        names[ROOT_TABLE_NAME] = self.root
+
+        functions: dict[str, Callable] = {}
+        for order, inner_name, arg_table_names in self.hub.collect_table_and_arguments(
+            table_order
+        ):
+            arg_names = [names.get(t, self.tables.get(t, t)) for t in arg_table_names]
+            # functions of multiple outputs are executed once for all their tables
+            output_of = None
+            if source := get_metadata(getattr(self.hub, inner_name), "output_of"):
+                output_of = f"{name}{NESTED_TABLE_SEPARATOR}{source}"
+                functions[output_of] = self._build_source_function(source, arg_names, names)
+            functions[names[inner_name]] = self._build_node_function(
+                inner_name, self.order + order, arg_names, output_of=output_of
+            )
+
+        # the output table joins tables of the nested DataHub to its root table
+        joined_tables = [
+            inner_name
+            for inner_name, _ in sorted(table_order.items(), key=lambda x: x[1])
+            if get_metadata(getattr(self.hub, inner_name), "join") is not None
+        ]
+        functions[name] = self._build_output_function(
+            self.order + max(table_order.values()) + 1,
+            [self.root] + [names[inner_name] for inner_name in joined_tables],
+            joined_tables,
+        )
+        return functions
+
+    def _build_node_function(
+        self, inner_name: str, order: int, arg_names: list[str], output_of: str | None = None
+    ):
+        inner_function = getattr(self.hub, inner_name)
+        hub = self.hub
+
+        def function(self, *tables):
+            return inner_function(get_nested_instance(self, hub), *tables)
+
+        function.__name__ = inner_name
+        function.__signature__ = _make_signature(arg_names)  # type: ignore[attr-defined]
+        function.__pytred_meta__ = {  # type: ignore[attr-defined]
+            **inner_function.__pytred_meta__,
+            "table_process_order": order,
+            # tables of the nested DataHub are joined only to its output
+            "join": None,
+            "output_of": output_of,
+        }
+        return function
+
+    def _build_source_function(self, source: str, arg_names: list[str], names: dict[str, str]):
+        """
+        Builds the function of multiple outputs of the outer DataHub, which returns tables of the
+        nested DataHub keyed by their names in the outer DataHub.
+        """
+        hub = self.hub
+
+        def function(self, *tables):
+            outputs = getattr(get_nested_instance(self, hub), source)(*tables)
+            return {names[inner_name]: table for inner_name, table in outputs.items()}
+
+        function.__name__ = source
+        function.__signature__ = _make_signature(arg_names)  # type: ignore[attr-defined]
+        return function
+
+    def _build_output_function(self, order: int, arg_names: list[str], joined_tables: list[str]):
+        hub = self.hub
+        join_nodes = [
+            DataNode(
+                pl.DataFrame(),
+                keys=get_metadata(getattr(hub, inner_name), "keys"),
+                join=get_metadata(getattr(hub, inner_name), "join"),
+                name=inner_name,
+                join_options=get_metadata(getattr(hub, inner_name), "join_options"),
+            )
+            for inner_name in joined_tables
+        ]
+
+        def function(self, root_df, *tables):
+            df = root_df
+            for join_node, table in zip(join_nodes, tables):  # noqa: B905
+                if table is None:
+                    # skipped optional table
+                    continue
+                df = join_data_node(df, replace(join_node, table=table))
+            return get_nested_instance(self, hub).post_step(df)
+
+        function.__name__ = hub.__name__
+        # tables of skipped optional functions are passed as None
+        function.__signature__ = _make_signature(  # type: ignore[attr-defined]
+            arg_names[:1], optional_arg_names=arg_names[1:]
+        )
+        return polars_table(
+            order, *self.keys, join=self.join, is_validate_unique=self.is_validate_unique
+        )(function)
+
+
+def get_nested_instance(datahub: DataHub, hub: type[DataHub]) -> DataHub:
+    """
+    Returns the instance of the nested DataHub class owned by `datahub`.
+    """
+    instances = datahub.__dict__.setdefault("_nested_instances", {})
+    if hub not in instances:
+        instances[hub] = hub.__new__(hub)
+    return instances[hub]
+
+
+def _make_signature(
+    arg_names: list[str], optional_arg_names: list[str] | None = None
+) -> inspect.Signature:
+    parameters = [inspect.Parameter("self", inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+    parameters += [
+        inspect.Parameter(arg_name, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+        for arg_name in arg_names
+    ]
+    parameters += [
+        inspect.Parameter(arg_name, inspect.Parameter.POSITIONAL_OR_KEYWORD, default=None)
+        for arg_name in optional_arg_names or []
+    ]
+    return inspect.Signature(parameters)
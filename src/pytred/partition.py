@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+import copy
+from dataclasses import replace
+from logging import getLogger
+import multiprocessing
+from typing import TYPE_CHECKING
+
+import polars as pl
+
+from pytred.data_node import DataNode
+from pytred.data_node import EmptyDataNode
+from pytred.helpers.decorator import get_metadata
+from pytred.prefetch import FileDataNode
+from pytred.statistics import StatisticsCatalog
+
+
+if TYPE_CHECKING:
+    from pytred.data_hub import DataHub
+
+
+logger = getLogger(__name__)
+
+# Column of partition ids added temporarily
+PARTITION_COLUMN = "__pytred_partition"
+
+# Join methods keeping unmatched rows of the joined table, which are duplicated in partitions if
+# the table is shared by all partitions
+UNMATCHED_JOIN_METHODS = ("right", "full")
+
+
+def hash_partition(df: pl.DataFrame, keys: Sequence[str], n_partitions: int) -> list[pl.DataFrame]:
+    """
+    Split df into partitions by the hash of key columns.
+    Rows with the same key values are in the same partition in all tables, as long as the key
+    columns have the same dtypes.
+
+    Parameters
+    ----------
+    df : pl.DataFrame
+        DataFrame to be split.
+    keys : Sequence of str
+        Key columns.
+    n_partitions : int
+        Number of partitions.
+
+    Returns
+    -------
+    list of pl.DataFrame
+        Partitions, some of which may be empty.
+    """
+    partition_ids = pl.struct(keys).hash() % n_partitions
+    partitions = df.with_columns(partition_ids.alias(PARTITION_COLUMN)).partition_by(
+        PARTITION_COLUMN, as_dict=True, include_key=False
+    )
+    empty = df.clear()
+    return [partitions.get((i,), empty) for i in range(n_partitions)]
+
+
+def plan_partitioned_execution(datahub: DataHub) -> tuple[list[str], list[str]]:
+    """
+    Split functions of the DataHub into functions executed per partition and functions executed
+    once for all partitions.
+
+    Functions declared key-local are executed per partition, unless their tables are used by
+    functions executed once, because functions executed once need whole tables.
+
+    Returns
+    -------
+    tuple of list of str and list of str
+        Names of functions executed per partition and names of functions executed once, in the
+        execution order.
+    """
+    functions = list(datahub.collect_table_and_arguments(datahub.table_order))
+    local_functions = {
+        name for _, name, _ in functions if get_metadata(getattr(datahub, name), "is_key_local")
+    }
+    # arguments of a function come earlier in the execution order, so a reverse scan reaches
+    # every ancestor of functions executed once
+    for _, name, arg_table_names in reversed(functions):
+        if name not in local_functions:
+            local_functions -= set(arg_table_names)
+
+    local_names = [name for _, name, _ in functions if name in local_functions]
+    global_names = [name for _, name, _ in functions if name not in local_functions]
+    return local_names, global_names
+
+
+def split_tables(
+    tables: dict[str, DataNode | EmptyDataNode], keys: Sequence[str], n_partitions: int
+) -> list[dict[str, DataNode | EmptyDataNode]]:
+    """
+    Split tables into partitions by the partition keys. Other tables are shared by all
+    partitions.
+
+    Tables joined to root_df are split only if their join keys include the partition keys, since
+    their rows match rows of root_df in other partitions otherwise. Tables which are not joined
+    are split if they have the partition key columns, since they are used by key-local functions.
+
+    Raises
+    ------
+    ValueError
+        If a table joined by a 'right' or 'full' join is shared by all partitions, since its
+        unmatched rows would be in the result once per partition.
+    """
+    partitioned_tables: list[dict[str, DataNode | EmptyDataNode]] = [
+        {} for _ in range(n_partitions)
+    ]
+    for name, node in tables.items():
+        if isinstance(node, DataNode) and _is_splittable(node, keys):
+            for partition, table in zip(  # noqa: B905
+                partitioned_tables, hash_partition(node.table, keys, n_partitions)
+            ):
+                partition[name] = replace(node, table=table)
+        else:
+            if node.join in UNMATCHED_JOIN_METHODS:
+                raise ValueError(
+                    f"{name} is joined by a '{node.join}' join on keys which do not include the "
+                    f"partition keys {list(keys)}, so it can not be executed per partition."
+                )
+            for partition in partitioned_tables:
+                partition[name] = node
+    return partitioned_tables
+
+
+def execute_partitioned(
+    datahub: DataHub,
+    keys: Sequence[str],
+    n_partitions: int,
+    max_workers: int | None = None,
+) -> pl.DataFrame:
+    """
+    Executes tables and joins of the DataHub per hash partition of keys in worker processes.
+
+    Functions which are not key-local are executed once in this process, and their tables are
+    split into partitions if they have the key columns, or passed to all partitions otherwise.
+    Then each worker executes key-local functions and joins of a partition, and the results are
+    concatenated. post_step is not applied.
+
+    Parameters
+    ----------
+    datahub : DataHub
+        DataHub to execute. The DataHub class must be importable from worker processes.
+    keys : Sequence of str
+        Partition keys. root_df must have these columns.
+    n_partitions : int
+        Number of partitions.
+    max_workers : int, optional
+        Maximum number of worker processes. Defaults to n_partitions.
+
+    Returns
+    -------
+    pl.DataFrame
+        Concatenated results of joins of partitions. The row order is not kept.
+    """
+    if n_partitions < 1:
+        raise ValueError("n_partitions must be positive.")
+    if not set(keys).issubset(datahub.root_df.columns):
+        raise ValueError(f"root_df must have the partition keys {list(keys)}.")
+
+    local_names, global_names = plan_partitioned_execution(datahub)
+    logger.info(f"Execute per partition: {local_names}, execute once: {global_names}.")
+
+    # tables of previous executions are not reused
+    tables: dict[str, DataNode | EmptyDataNode] = {
+        name: node.read() if isinstance(node, FileDataNode) else node
+        for name, node in datahub._input_tables.items()
+    }
+    datahub._build_tables(tables, datahub.root_df, names=global_names)
+
+    partitioned_tables = split_tables(tables, keys, n_partitions)
+    root_partitions = hash_partition(datahub.root_df, keys, n_partitions)
+    partitioned_datahubs = []
+    for root_df, partition_tables in zip(root_partitions, partitioned_tables):  # noqa: B905
+        partitioned_datahub = copy.copy(datahub)
+        partitioned_datahub.root_df = root_df
+        partitioned_datahub.tables = partition_tables
+        # only partitions of input tables are sent to workers
+        partitioned_datahub._input_tables = {}
+        partitioned_datahub.statistics = StatisticsCatalog(hub=datahub.statistics.hub)
+        # events and reports are not sent back from workers
+        partitioned_datahub.callbacks = []
+        # dtypes compacted per partition may differ between partitions
+        partitioned_datahub.compact_dtypes = False
+        partitioned_datahubs.append(partitioned_datahub)
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers or n_partitions, mp_context=context) as executor:
+        results = list(
+            executor.map(_execute_partition, partitioned_datahubs, [local_names] * n_partitions)
+        )
+
+    return pl.concat(results, how="vertical_relaxed")
+
+
+def _execute_partition(datahub: DataHub, names: list[str]) -> pl.DataFrame:
+    datahub._build_tables(datahub.tables, datahub.root_df, names=names)  # type: ignore[arg-type]
+    return datahub.steps()
+
+
+def _is_splittable(node: DataNode, keys: Sequence[str]) -> bool:
+    if node.join is not None:
+        return set(keys).issubset(node.keys or [])
+    return set(keys).issubset(node.table.columns)
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from collections.abc import MutableMapping
+from collections.abc import Sequence
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from logging import getLogger
+import pathlib
+import threading
+from typing import Any
+
+import polars as pl
+
+from pytred._types import ENGINE
+from pytred._types import POLARS_JOIN_METHOD
+from pytred.data_node import DataNode
+from pytred.data_node import EmptyDataNode
+from pytred.spill import SpillableTableStore
+from pytred.spill import SpilledDataNode
+from pytred.spill import parse_memory_size
+
+
+logger = getLogger(__name__)
+
+
+def read_table(path: str | pathlib.Path) -> pl.DataFrame:
+    """
+    Read a table file. The format is decided by the extension.
+    """
+    suffix = pathlib.Path(path).suffix.lower()
+    if suffix == ".parquet":
+        return pl.read_parquet(path)
+    elif suffix == ".csv":
+        return pl.read_csv(path)
+    elif suffix in [".ipc", ".arrow", ".feather"]:
+        return pl.read_ipc(path)
+    elif suffix == ".ndjson":
+        return pl.read_ndjson(path)
+    elif suffix == ".json":
+        return pl.read_json(path)
+    else:
+        raise ValueError(f"Unsupported file format: {path}")
+
+
+def read_table_schema(path: str | pathlib.Path) -> pl.Schema:
+    """
+    Read the schema of a table file without reading its rows, except for JSON files which
+    cannot be scanned.
+    """
+    suffix = pathlib.Path(path).suffix.lower()
+    if suffix == ".parquet":
+        return pl.Schema(pl.read_parquet_schema(path))
+    elif suffix == ".csv":
+        return pl.scan_csv(path).collect_schema()
+    elif suffix in [".ipc", ".arrow", ".feather"]:
+        return pl.scan_ipc(path).collect_schema()
+    elif suffix == ".ndjson":
+        return pl.scan_ndjson(path).collect_schema()
+    return read_table(path).schema
+
+
+@dataclass
+class FileDataNode:
+    """
+    Input DataNode whose table is read from a file when it is used.
+
+    Files of a DataHub are read in background threads before the functions which need them, so
+    that reading overlaps with the execution of earlier functions.
+    The format is decided by the extension: parquet, csv, ipc/arrow/feather, ndjson or json.
+    """
+
+    path: str | pathlib.Path
+    keys: Sequence[str] | None
+    join: POLARS_JOIN_METHOD | None
+    name: str
+    engine: ENGINE = "polars"
+    join_options: dict[str, Any] | None = None
+
+    def read(self) -> DataNode:
+        logger.debug(f"Read table '{self.name}' from {self.path}.")
+        return DataNode(
+            read_table(self.path),
+            keys=self.keys,
+            join=self.join,
+            name=self.name,
+            engine=self.engine,
+            join_options=self.join_options,
+        )
+
+    @property
+    def schema(self) -> pl.Schema:
+        return read_table_schema(self.path)
+
+    @property
+    def file_size(self) -> int:
+        return pathlib.Path(self.path).stat().st_size
+
+
+class PrefetchingTableStore(MutableMapping):
+    """
+    Dictionary of DataNodes whose input tables are read from files in background threads.
+
+    FileDataNodes are read on access. After `start` is called with the order in which tables
+    are used, files are read ahead in that order while the total size of tables read but not
+    used yet is under the memory limit. The size of a table being read is estimated by its file
+    size, and replaced by the estimated size of the DataFrame when the read is done.
+    Read tables are stored to `inner`, which may be a SpillableTableStore.
+    """
+
+    def __init__(
+        self,
+        inner: MutableMapping[str, DataNode | EmptyDataNode] | None = None,
+        memory_limit: int | str = "1GB",
+        max_workers: int = 2,
+    ):
+        """
+        Parameters
+        ----------
+        inner : MutableMapping of str to DataNode, optional
+            Store of tables other than files which are not read yet.
+        memory_limit : int or str, default '1GB'
+            Memory budget of tables read ahead but not used yet, e.g. 1024 or '4GB'.
+            A table is always read ahead if no table is being read.
+        max_workers : int, default 2
+            Number of threads reading files.
+        """
+        self.inner: MutableMapping[str, DataNode | EmptyDataNode] = {} if inner is None else inner
+        self.memory_limit = parse_memory_size(memory_limit)
+        self.max_workers = max_workers
+
+        self._files: dict[str, FileDataNode] = {}
+        self._futures: dict[str, Future] = {}
+        # estimated sizes of tables read ahead and not used yet
+        self._reserved: dict[str, int] = {}
+        self._queue: list[str] = []
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # threads are not copied, e.g. to worker processes
+        self.close()
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> DataNode | EmptyDataNode:
+        if name in self._files:
+            return self._load(name)
+        return self.inner[name]
+
+    def __setitem__(self, name: str, node: DataNode | EmptyDataNode | FileDataNode):
+        self._discard(name)
+        if isinstance(node, FileDataNode):
+            self.inner.pop(name, None)
+            self._files[name] = node
+        else:
+            self.inner[name] = node
+
+    def __delitem__(self, name: str):
+        if name in self._files:
+            self._discard(name)
+        else:
+            del self.inner[name]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.inner
+        yield from (name for name in list(self._files) if name not in self.inner)
+
+    def __len__(self) -> int:
+        return len(self.inner) + len(self._files)
+
+    def __contains__(self, name) -> bool:
+        return name in self._files or name in self.inner
+
+    def peek(self, name: str) -> DataNode | EmptyDataNode | FileDataNode | SpilledDataNode:
+        """
+        Returns the node without reading files or reloading spilled tables.
+        """
+        if name in self._files:
+            return self._files[name]
+        if isinstance(self.inner, SpillableTableStore):
+            return self.inner.peek(name)
+        return self.inner[name]
+
+    @property
+    def unread_tables(self) -> list[str]:
+        return list(self._files.keys())
+
+    def start(self, order: Sequence[str]):
+        """
+        Starts reading files ahead in the order of their use.
+
+        Parameters
+        ----------
+        order : Sequence of str
+            Names of tables in the order in which they are used. Files which are not in the
+            order are read on access.
+        """
+        with self._lock:
+            self._queue = [name for name in dict.fromkeys(order) if name in self._files]
+            if self._queue and self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="pytred_prefetch"
+                )
+        self._submit()
+
+    def close(self):
+        """
+        Stops reading files ahead. Tables being read are kept as unread files.
+        """
+        with self._lock:
+            self._queue = []
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            for future in self._futures.values():
+                future.cancel()
+            executor.shutdown(wait=True)
+        self._futures = {}
+        self._reserved = {}
+
+    def _submit(self):
+        with self._lock:
+            while self._queue and self._executor is not None:
+                name = self._queue[0]
+                size = self._files[name].file_size
+                if self._reserved and sum(self._reserved.values()) + size > self.memory_limit:
+                    break
+                self._queue.pop(0)
+                self._reserved[name] = size
+                future = self._executor.submit(self._files[name].read)
+                future.add_done_callback(lambda f, name=name: self._on_read(name, f))
+                self._futures[name] = future
+
+    def _on_read(self, name: str, future: Future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self._lock:
+            if name in self._reserved:
+                self._reserved[name] = int(future.result().table.estimated_size())
+
+    def _load(self, name: str) -> DataNode:
+        future = self._futures.pop(name, None)
+        if future is not None and not future.cancelled():
+            node = future.result()
+        else:
+            node = self._files[name].read()
+        with self._lock:
+            self._reserved.pop(name, None)
+        del self._files[name]
+        self.inner[name] = node
+        self._submit()
+        return node
+
+    def _discard(self, name: str):
+        future = self._futures.pop(name, None)
+        if future is not None:
+            future.cancel()
+        with self._lock:
+            self._reserved.pop(name, None)
+            if name in self._queue:
+                self._queue.remove(name)
+        self._files.pop(name, None)
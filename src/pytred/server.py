@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+import json
+from logging import getLogger
+import queue
+import socketserver
+import threading
+import time
+
+import polars as pl
+
+from pytred.serving import CompiledDataHub
+
+
+logger = getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Executes concurrent small requests of a CompiledDataHub in one batch.
+
+    Requests submitted while a batch is running are queued and executed together by
+    `CompiledDataHub.execute_batch`, which executes functions depending on root_df per request
+    and joins of all requests at once. If a batch fails, its requests are executed one by one,
+    so that an invalid request fails only itself.
+    """
+
+    def __init__(
+        self,
+        compiled: CompiledDataHub,
+        max_batch_rows: int = 1024,
+        max_wait_seconds: float = 0.005,
+    ):
+        """
+        Parameters
+        ----------
+        compiled : CompiledDataHub
+            Compiled DataHub to execute.
+        max_batch_rows : int, default 1024
+            Maximum number of root_df rows in a batch.
+        max_wait_seconds : float, default 0.005
+            Maximum time to wait for more requests after the first request of a batch.
+        """
+        self.compiled = compiled
+        self.max_batch_rows = max_batch_rows
+        self.max_wait_seconds = max_wait_seconds
+
+        self.n_batches = 0
+        self.n_requests = 0
+
+        self._queue: queue.Queue[tuple[pl.DataFrame, Future] | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, root_df: pl.DataFrame) -> Future:
+        """
+        Submits a request.
+
+        Parameters
+        ----------
+        root_df : pl.DataFrame
+            root_df of this request.
+
+        Returns
+        -------
+        Future
+            Future of the resulting DataFrame.
+        """
+        future: Future = Future()
+        self._queue.put((root_df, future))
+        return future
+
+    def _run(self):
+        is_running = True
+        while is_running:
+            request = self._queue.get()
+            if request is None:
+                break
+
+            batch = [request]
+            n_rows = len(request[0])
+            deadline = time.perf_counter() + self.max_wait_seconds
+            while n_rows < self.max_batch_rows:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if request is None:
+                    is_running = False
+                    break
+                batch.append(request)
+                n_rows += len(request[0])
+
+            self.execute_batch(batch)
+
+    def execute_batch(self, batch: list[tuple[pl.DataFrame, Future]]):
+        """
+        Executes requests in one call of CompiledDataHub and sets results to futures.
+        Requests whose root_df schemas differ are executed separately.
+        """
+        groups: dict[tuple, list[tuple[pl.DataFrame, Future]]] = {}
+        for root_df, future in batch:
+            groups.setdefault(tuple(root_df.schema.items()), []).append((root_df, future))
+
+        for requests in groups.values():
+            self.n_batches += 1
+            self.n_requests += len(requests)
+            try:
+                results = self.compiled.execute_batch([root_df for root_df, _ in requests])
+            except Exception:
+                logger.exception("Failed to execute a batch. Requests are executed one by one.")
+                for root_df, future in requests:
+                    self._execute_request(root_df, future)
+                continue
+            for (_, future), result in zip(requests, results):  # noqa: B905
+                future.set_result(result)
+
+    def _execute_request(self, root_df: pl.DataFrame, future: Future):
+        try:
+            future.set_result(self.compiled(root_df))
+        except Exception as err:
+            future.set_exception(err)
+
+
+class PytredRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles execution requests.
+
+    - POST /execute : body is a JSON list of records of root_df. The response is a JSON list
+      of records of the result.
+    - GET /health : returns 'ok'.
+    """
+
+    server: PytredHTTPServer | PytredUnixHTTPServer  # type: ignore[assignment]
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, b"ok", content_type="text/plain")
+        else:
+            self._send_error(404, f"{self.path} is not found.")
+
+    def do_POST(self):
+        if self.path != "/execute":
+            self._send_error(404, f"{self.path} is not found.")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            records = json.loads(self.rfile.read(length))
+            root_df = self.server.parse_records(records)
+        except Exception as err:
+            self._send_error(400, f"Invalid request: {err}")
+            return
+
+        try:
+            result = self.server.batcher.submit(root_df).result()
+        except Exception as err:
+            self._send_error(500, f"{type(err).__name__}: {err}")
+            return
+
+        self._send(200, result.write_json().encode())
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str):
+        self._send(status, json.dumps({"error": message}).encode())
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class _ServerMixin:
+    batcher: MicroBatcher
+
+    def parse_records(self, records: list[dict]) -> pl.DataFrame:
+        """
+        Converts records to root_df. Columns of root_df of the DataHub keep their dtypes.
+        """
+        if not isinstance(records, list):
+            raise TypeError(f"records must be list, not {type(records)}.")
+        root_schema = self.batcher.compiled.datahub.root_df.schema
+        return pl.DataFrame(records, schema_overrides=dict(root_schema), infer_schema_length=None)
+
+    def server_close(self):
+        self.batcher.stop()
+        super().server_close()  # type: ignore[misc]
+
+
+class PytredHTTPServer(_ServerMixin, ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class PytredUnixHTTPServer(_ServerMixin, socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(
+    compiled: CompiledDataHub,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    unix_socket: str | None = None,
+    max_batch_rows: int = 1024,
+    max_wait_seconds: float = 0.005,
+) -> PytredHTTPServer | PytredUnixHTTPServer:
+    """
+    Creates a server executing requests with micro batching.
+    Call `serve_forever()` of the returned server to start serving.
+
+    Parameters
+    ----------
+    compiled : CompiledDataHub
+        Compiled DataHub to serve.
+    host : str, default '127.0.0.1'
+        Host of HTTP server.
+    port : int, default 8000
+        Port of HTTP server. If 0, a free port is used.
+    unix_socket : str, optional
+        Path of the Unix domain socket. If given, host and port are ignored.
+    max_batch_rows : int, default 1024
+        Maximum number of root_df rows in a batch.
+    max_wait_seconds : float, default 0.005
+        Maximum time to wait for more requests after the first request of a batch.
+
+    Returns
+    -------
+    PytredHTTPServer or PytredUnixHTTPServer
+    """
+    server: PytredHTTPServer | PytredUnixHTTPServer
+    if unix_socket is None:
+        server = PytredHTTPServer((host, port), PytredRequestHandler)
+    else:
+        server = PytredUnixHTTPServer(unix_socket, PytredRequestHandler)
+
+    server.batcher = MicroBatcher(
+        compiled, max_batch_rows=max_batch_rows, max_wait_seconds=max_wait_seconds
+    )
+    server.batcher.start()
+    return server
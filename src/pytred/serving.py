@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from collections.abc import Sequence
+from dataclasses import replace
+from functools import reduce
+from logging import getLogger
+from operator import and_
+import time
+from typing import TYPE_CHECKING
+
+import polars as pl
+
+from pytred.data_node import DataNode
+from pytred.data_node import EmptyDataNode
+from pytred.helpers.decorator import get_metadata
+from pytred.helpers.ordered_join import join_data_node
+
+
+if TYPE_CHECKING:
+    from pytred.data_hub import DataHub
+
+
+logger = getLogger(__name__)
+
+# Join methods which can be answered by key lookups
+LOOKUP_JOIN_METHODS = ("inner", "left", "semi", "anti")
+
+# Column to distinguish requests executed in a batch
+REQUEST_ID_COLUMN = "__pytred_request_id"
+
+# Joins of tables depending on root_df which can not be batched, since they return rows of the
+# table which do not match any request
+UNBATCHABLE_JOIN_METHODS = ("right", "full")
+
+
+class KeyIndex:
+    """
+    Hash index from key values to row positions of a table.
+    """
+
+    def __init__(self, table: pl.DataFrame, keys: Sequence[str]):
+        """
+        Parameters
+        ----------
+        table : pl.DataFrame
+            Table to be indexed.
+        keys : Sequence of str
+            Key columns of the index. Rows with null in any key column are not indexed,
+            in the same way as joins do not match null keys.
+        """
+        self.keys = list(keys)
+        self.positions: dict[tuple, list[int]] = {}
+        for position, key in enumerate(table.select(self.keys).iter_rows()):
+            if None in key:
+                continue
+            self.positions.setdefault(key, []).append(position)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def lookup(self, df: pl.DataFrame, how: str) -> tuple[list[int], list[int | None]]:
+        """
+        Find row positions of the indexed table matched with each row of df.
+
+        Parameters
+        ----------
+        df : pl.DataFrame
+            Left table of the join. It must contain the key columns.
+        how : {'inner', 'left', 'semi', 'anti'}
+            Join method.
+
+        Returns
+        -------
+        tuple of list of int and list of int or None
+            Row positions of df and of the indexed table for each output row. None in the
+            second list means no match. The second list is empty for 'semi' and 'anti'.
+        """
+        left_positions: list[int] = []
+        right_positions: list[int | None] = []
+        for left_position, key in enumerate(df.select(self.keys).iter_rows()):
+            positions = self.positions.get(key)
+            if how == "semi":
+                if positions:
+                    left_positions.append(left_position)
+            elif how == "anti":
+                if not positions:
+                    left_positions.append(left_position)
+            elif positions:
+                left_positions += [left_position] * len(positions)
+                right_positions += positions
+            elif how == "left":
+                left_positions.append(left_position)
+                right_positions.append(None)
+        return left_positions, right_positions
+
+
+class CompiledDataHub:
+    """
+    DataHub compiled for low-latency execution with a small root_df.
+
+    Tables which do not depend on root_df are created once at compilation and joined tables
+    among them are indexed by their join keys. On each execution, only functions depending
+    on root_df (functions which have the `root_df` argument and their descendants) are
+    executed, and indexed tables are joined by key lookups instead of hash joins.
+    Dtype compaction and surrogate keys of DataHub are not applied.
+    """
+
+    def __init__(self, datahub: DataHub):
+        """
+        Parameters
+        ----------
+        datahub : DataHub
+            DataHub instance holding input tables.
+        """
+        self.datahub = datahub
+        self.root_dependent_tables = datahub.get_root_dependent_tables()
+
+        # build tables which do not depend on root_df
+        self.tables: dict[str, DataNode | EmptyDataNode] = {
+            name: node
+            for name, node in datahub.tables.items()
+            if datahub.table_order.get(name) == -1
+        }
+        independent_tables = [
+            name
+            for name, order in datahub.table_order.items()
+            if order >= 0 and name not in self.root_dependent_tables
+        ]
+        datahub._build_tables(self.tables, datahub.root_df, names=independent_tables)
+
+        # index joined tables
+        self.indexes: dict[str, KeyIndex] = {}
+        self.value_tables: dict[str, pl.DataFrame] = {}
+        for name, node in self.tables.items():
+            if not isinstance(node, DataNode) or node.join not in LOOKUP_JOIN_METHODS:
+                continue
+            if not node.keys:
+                continue
+            self.indexes[name] = KeyIndex(node.table, node.keys)
+            self.value_tables[name] = node.table.drop(node.keys)
+            logger.info(f"Indexed {name}: {len(self.indexes[name])} keys.")
+
+        # unmatched rows of 'right' and 'full' joins do not belong to any request
+        self.is_batchable = all(
+            self._get_join(name) not in UNBATCHABLE_JOIN_METHODS for name in datahub.table_order
+        )
+
+    def _get_join(self, name: str) -> str | None:
+        """
+        Returns the join method of a table, which is not built yet if it depends on root_df.
+        """
+        if name in self.root_dependent_tables:
+            return get_metadata(getattr(self.datahub, name), "join")
+        node = self.tables.get(name)
+        return None if node is None else node.join
+
+    def __call__(self, root_df: pl.DataFrame, *filters: pl.Expr) -> pl.DataFrame:
+        """
+        Alias of execute.
+        """
+        return self.execute(root_df, *filters)
+
+    def execute(self, root_df: pl.DataFrame, *filters: pl.Expr) -> pl.DataFrame:
+        """
+        Executes the compiled pipeline with root_df.
+
+        Parameters
+        ----------
+        root_df : pl.DataFrame
+            The base DataFrame of this execution. It replaces root_df of the DataHub.
+        filters : pl.Expr
+            Filter expressions to apply to the output DataFrame.
+
+        Returns
+        -------
+        pl.DataFrame
+            The resulting DataFrame.
+        """
+        start = time.perf_counter()
+        self.datahub.emit_event("execute_start")
+
+        tables = dict(self.tables)
+        self.datahub._build_tables(tables, root_df, names=self.root_dependent_tables)
+
+        df = self.datahub._apply_expression_nodes(root_df, tables.values())
+        df = self._join_tables(df, tables)
+        df = self.datahub.post_step(df)
+
+        if filters:
+            df = df.filter(reduce(and_, filters))
+
+        self.datahub.emit_event(
+            "execute_end",
+            elapsed_seconds=time.perf_counter() - start,
+            n_rows=df.height,
+            size=int(df.estimated_size()),
+        )
+        return df
+
+    def execute_batch(self, root_dfs: Sequence[pl.DataFrame]) -> list[pl.DataFrame]:
+        """
+        Executes root_dfs of several requests, returning the same results as calling `execute`
+        for each of them.
+
+        Functions depending on root_df and post_step are executed per request, and joins are
+        executed once for all requests: rows of the requests are concatenated with a request id
+        column, and tables of functions depending on root_df are joined on their keys and the
+        request id, so that rows of a request never match rows of other requests.
+        Requests are executed one by one if any table is joined with a 'right' or 'full' join.
+
+        Parameters
+        ----------
+        root_dfs : Sequence of pl.DataFrame
+            root_df of each request. They must have the same schema.
+
+        Returns
+        -------
+        list of pl.DataFrame
+            The resulting DataFrame of each request.
+        """
+        if len(root_dfs) <= 1 or not self.is_batchable:
+            return [self.execute(root_df) for root_df in root_dfs]
+
+        start = time.perf_counter()
+        self.datahub.emit_event("execute_start")
+
+        dfs = []
+        tables: dict[str, DataNode | EmptyDataNode] = dict(self.tables)
+        request_nodes: dict[str, DataNode] = {}
+        request_tables: dict[str, list[pl.DataFrame]] = {}
+        for i, root_df in enumerate(root_dfs):
+            request_id = pl.lit(i, dtype=pl.UInt32).alias(REQUEST_ID_COLUMN)
+            request = dict(self.tables)
+            self.datahub._build_tables(request, root_df, names=self.root_dependent_tables)
+            df = self.datahub._apply_expression_nodes(root_df, request.values())
+            dfs.append(df.with_columns(request_id))
+            for name in self.root_dependent_tables:
+                table_node = request[name]
+                tables[name] = table_node
+                if isinstance(table_node, DataNode) and table_node.join is not None:
+                    table = table_node.table.with_columns(request_id)
+                    request_tables.setdefault(name, []).append(table)
+                    request_nodes[name] = table_node
+
+        for name, request_table in request_tables.items():
+            table_node = request_nodes[name]
+            tables[name] = replace(
+                table_node,
+                table=pl.concat(request_table, how="vertical_relaxed"),
+                keys=[*(table_node.keys or []), REQUEST_ID_COLUMN],
+                # rows of a cross join are matched within the request
+                join="inner" if table_node.join == "cross" else table_node.join,
+            )
+
+        df = self._join_tables(pl.concat(dfs), tables)
+        partitions = df.partition_by(REQUEST_ID_COLUMN, as_dict=True, include_key=False)
+        empty = df.clear().drop(REQUEST_ID_COLUMN)
+        results = [self.datahub.post_step(partitions.get((i,), empty)) for i in range(len(dfs))]
+
+        self.datahub.emit_event(
+            "execute_end",
+            elapsed_seconds=time.perf_counter() - start,
+            n_rows=sum(result.height for result in results),
+            size=sum(int(result.estimated_size()) for result in results),
+        )
+        return results
+
+    def _join_tables(
+        self, df: pl.DataFrame, tables: Mapping[str, DataNode | EmptyDataNode]
+    ) -> pl.DataFrame:
+        """
+        Joins tables to df in the join order, by key lookups for indexed tables.
+        """
+        for name, _ in sorted(self.datahub.table_order.items(), key=lambda x: x[1]):
+            table_node = tables[name]
+            if table_node.join is None or isinstance(table_node, EmptyDataNode):
+                continue
+            if name in self.tables and self.datahub.table_order[name] >= 0:
+                self.datahub.emit_event(
+                    "cache_hit",
+                    name=name,
+                    n_rows=table_node.table.height,
+                    size=int(table_node.table.estimated_size()),
+                )
+
+            join_start = self.datahub._emit_join_start(name, df)
+            if name in self.indexes:
+                df = self.lookup_join(df, table_node)
+            else:
+                df = join_data_node(df, table_node)
+            self.datahub._emit_join_end(name, df, join_start)
+        return df
+
+    def lookup_join(self, df: pl.DataFrame, table_node: DataNode) -> pl.DataFrame:
+        """
+        Joins df and an indexed table by key lookups.
+        The result is the same as `df.join(table, on=keys, how=join)`, keeping the row order
+        of df.
+        """
+        left_positions, right_positions = self.indexes[table_node.name].lookup(
+            df, how=str(table_node.join)
+        )
+        joined = df.select(pl.all().gather(pl.Series(left_positions, dtype=pl.UInt32)))
+        value_table = self.value_tables[table_node.name]
+        if table_node.join in ["semi", "anti"] or value_table.width == 0:
+            return joined
+
+        values = value_table.select(pl.all().gather(pl.Series(right_positions, dtype=pl.UInt32)))
+        suffix = f"_{table_node.name}"
+        values = values.rename(
+            {col: f"{col}{suffix}" for col in values.columns if col in df.columns}
+        )
+        return pl.concat([joined, values], how="horizontal")
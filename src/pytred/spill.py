@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+from collections.abc import Collection
+from collections.abc import Iterator
+from collections.abc import MutableMapping
+from collections.abc import Sequence
+from dataclasses import dataclass
+from logging import getLogger
+import math
+import pathlib
+import re
+import tempfile
+from typing import Any
+
+import polars as pl
+
+from pytred._types import ENGINE
+from pytred.data_node import DataNode
+from pytred.data_node import EmptyDataNode
+
+
+logger = getLogger(__name__)
+
+MEMORY_UNITS = {
+    "": 1,
+    "B": 1,
+    "K": 1024,
+    "KB": 1024,
+    "KIB": 1024,
+    "M": 1024**2,
+    "MB": 1024**2,
+    "MIB": 1024**2,
+    "G": 1024**3,
+    "GB": 1024**3,
+    "GIB": 1024**3,
+    "T": 1024**4,
+    "TB": 1024**4,
+    "TIB": 1024**4,
+}
+
+
+def parse_memory_size(size: int | float | str) -> int:
+    """
+    Parse memory size like '48GB' to bytes. Units are powers of 1024.
+
+    Parameters
+    ----------
+    size : int, float or str
+        Number of bytes, or a string with a unit (B, KB, MB, GB, TB, KiB, ...).
+
+    Returns
+    -------
+    int
+        Number of bytes.
+    """
+    if isinstance(size, (int, float)):
+        return int(size)
+
+    matched = re.fullmatch(r"\s*([0-9]*\.?[0-9]+)\s*([a-zA-Z]*)\s*", size)
+    if matched is None or matched.group(2).upper() not in MEMORY_UNITS:
+        raise ValueError(f"Invalid memory size: {size}")
+    return int(float(matched.group(1)) * MEMORY_UNITS[matched.group(2).upper()])
+
+
+@dataclass
+class SpilledDataNode:
+    """
+    DataNode whose table is stored in an IPC file.
+    """
+
+    name: str
+    keys: Sequence[str] | None
+    join: str | None
+    path: pathlib.Path
+    engine: ENGINE = "polars"
+    join_options: dict[str, Any] | None = None
+
+
+class SpillableTableStore(MutableMapping):
+    """
+    Dictionary of DataNodes which keeps the total size of tables in memory under a limit.
+
+    When the limit is exceeded, tables are written to Arrow IPC files and released from memory.
+    Tables whose next use in the schedule is the farthest are spilled first, and tables
+    which are never used again are spilled before any other. Spilled tables are transparently
+    reloaded on access.
+
+    Resident tables, e.g. input tables held by the DataHub, count toward the limit but are never
+    spilled, since spilling them does not release memory.
+    """
+
+    def __init__(
+        self,
+        memory_limit: int | str,
+        schedule: Sequence[tuple[str, Sequence[str]]] = (),
+        joined_tables: Sequence[str] = (),
+        spill_dir: str | pathlib.Path | None = None,
+        resident_tables: Collection[str] = (),
+    ):
+        """
+        Parameters
+        ----------
+        memory_limit : int or str
+            Memory budget of tables in memory, e.g. 1024 or '48GB'.
+        schedule : Sequence of tuple of str and Sequence of str
+            Names of functions in execution order and names of their argument tables.
+        joined_tables : Sequence of str
+            Names of tables joined after all functions are executed.
+        spill_dir : str or pathlib.Path, optional
+            Directory where a temporary directory for spilled tables is created.
+        resident_tables : Collection of str
+            Names of tables which are kept in memory by others. They are not spilled until
+            they are replaced.
+        """
+        self.memory_limit = parse_memory_size(memory_limit)
+        self.spill_dir = spill_dir
+        self.schedule = list(schedule)
+        self.joined_tables = set(joined_tables)
+        self.position = 0
+        self.resident_tables = set(resident_tables)
+
+        self._nodes: dict[str, DataNode | EmptyDataNode] = {}
+        self._spilled: dict[str, SpilledDataNode] = {}
+        # spilled files which are still the same as tables in memory
+        self._files: dict[str, pathlib.Path] = {}
+        self._tmpdir = tempfile.TemporaryDirectory(prefix="pytred_spill_", dir=spill_dir)
+        self._n_files = 0
+        self._positions = {name: i for i, (name, _) in enumerate(self.schedule)}
+
+    def __getitem__(self, name: str) -> DataNode | EmptyDataNode:
+        if name in self._nodes:
+            return self._nodes[name]
+        if name not in self._spilled:
+            raise KeyError(name)
+
+        spilled = self._spilled.pop(name)
+        logger.debug(f"Reload spilled table '{name}' from {spilled.path}.")
+        self._nodes[name] = DataNode(
+            pl.read_ipc(spilled.path),
+            keys=spilled.keys,
+            join=spilled.join,  # type: ignore[arg-type]
+            name=name,
+            engine=spilled.engine,
+            join_options=spilled.join_options,
+        )
+        self._files[name] = spilled.path
+        self.enforce_limit(pinned={name})
+        return self._nodes[name]
+
+    def __setitem__(self, name: str, node: DataNode | EmptyDataNode):
+        if name in self._nodes and node is not self._nodes[name]:
+            self.resident_tables.discard(name)
+        self._spilled.pop(name, None)
+        self._files.pop(name, None)
+        self._nodes[name] = node
+        if name in self._positions:
+            self.position = self._positions[name] + 1
+        self.enforce_limit(pinned={name})
+
+    def __delitem__(self, name: str):
+        if name in self._nodes:
+            del self._nodes[name]
+        else:
+            del self._spilled[name]
+        self._files.pop(name, None)
+        self.resident_tables.discard(name)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._nodes
+        yield from self._spilled
+
+    def __len__(self) -> int:
+        return len(self._nodes) + len(self._spilled)
+
+    def __contains__(self, name) -> bool:
+        return name in self._nodes or name in self._spilled
+
+    def peek(self, name: str) -> DataNode | EmptyDataNode | SpilledDataNode:
+        """
+        Returns the node without reloading spilled tables.
+        """
+        if name in self._spilled:
+            return self._spilled[name]
+        return self._nodes[name]
+
+    @property
+    def spilled_tables(self) -> list[str]:
+        return list(self._spilled.keys())
+
+    @property
+    def memory_usage(self) -> int:
+        """
+        Estimated size of tables in memory.
+        """
+        return sum(
+            int(node.table.estimated_size())
+            for node in self._nodes.values()
+            if isinstance(node, DataNode)
+        )
+
+    def next_use(self, name: str) -> float:
+        """
+        Returns the step of the schedule where the table is used next.
+        Joins are executed at the step after all functions. Returns inf if not used again.
+        """
+        for step in range(self.position, len(self.schedule)):
+            if name in self.schedule[step][1]:
+                return step
+        if name in self.joined_tables:
+            return len(self.schedule)
+        return math.inf
+
+    def enforce_limit(self, pinned: Collection[str] = ()):
+        """
+        Spills tables until the memory usage is under the limit.
+
+        Parameters
+        ----------
+        pinned : Collection of str
+            Names of tables which must be kept in memory.
+        """
+        sizes = {
+            name: int(node.table.estimated_size())
+            for name, node in self._nodes.items()
+            if isinstance(node, DataNode)
+        }
+        memory_usage = sum(sizes.values())
+        if memory_usage <= self.memory_limit:
+            return
+
+        candidates = sorted(
+            (name for name in sizes if name not in pinned and name not in self.resident_tables),
+            key=lambda name: (self.next_use(name), sizes[name]),
+            reverse=True,
+        )
+        for name in candidates:
+            if memory_usage <= self.memory_limit:
+                break
+            self.spill(name)
+            memory_usage -= sizes[name]
+
+        if memory_usage > self.memory_limit:
+            logger.info(
+                f"Memory usage of tables ({memory_usage} bytes) exceeds the memory limit "
+                f"({self.memory_limit} bytes) even after spilling."
+            )
+
+    def spill(self, name: str):
+        """
+        Writes the table to an IPC file and releases it from memory.
+        """
+        node = self._nodes[name]
+        if not isinstance(node, DataNode):
+            return
+
+        path = self._files.get(name)
+        if path is None:
+            # files are never overwritten because read tables may be memory-mapped
+            self._n_files += 1
+            path = pathlib.Path(self._tmpdir.name, f"{self._n_files}_{name}.arrow")
+            node.table.write_ipc(path)
+            logger.debug(f"Spill table '{name}' to {path}.")
+
+        self._spilled[name] = SpilledDataNode(
+            name,
+            keys=node.keys,
+            join=node.join,
+            path=path,
+            engine=node.engine,
+            join_options=node.join_options,
+        )
+        del self._nodes[name]
+
+    def close(self):
+        """
+        Removes spilled files.
+        """
+        self._tmpdir.cleanup()
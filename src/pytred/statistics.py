@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+import datetime
+import json
+import math
+import os
+import pathlib
+import threading
+import time
+from typing import Any
+
+import polars as pl
+
+
+@dataclass
+class ColumnStatistics:
+    """
+    Statistics of a key column.
+
+    Attributes
+    ----------
+    dtype : str
+        Data type of the column.
+    null_fraction : float
+        Fraction of null values.
+    n_unique : int
+        Estimated number of distinct values.
+    min, max : optional
+        Minimum and maximum values. Values other than numbers, strings and booleans are stored
+        as strings.
+    """
+
+    dtype: str
+    null_fraction: float
+    n_unique: int
+    min: Any = None
+    max: Any = None
+
+
+@dataclass
+class TableStatistics:
+    """
+    Statistics of a table collected when it is created.
+
+    Attributes
+    ----------
+    name : str
+        Name of the table.
+    n_rows : int
+        Number of rows.
+    size : int
+        Estimated size in bytes.
+    keys : list of str
+        Join keys of the table.
+    columns : dict of str to ColumnStatistics
+        Statistics of key columns.
+    n_unique_keys : int, optional
+        Estimated number of distinct key tuples. None if the table has no keys.
+    max_key_fraction : float, optional
+        Fraction of rows having the most frequent key tuple, which shows the skew of keys.
+    is_sampled : bool
+        True if statistics of keys are estimated from sampled rows.
+    timestamp : float
+        Unix time when statistics were collected.
+    """
+
+    name: str
+    n_rows: int
+    size: int
+    keys: list[str] = field(default_factory=list)
+    columns: dict[str, ColumnStatistics] = field(default_factory=dict)
+    n_unique_keys: int | None = None
+    max_key_fraction: float | None = None
+    is_sampled: bool = False
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def rows_per_key(self) -> float | None:
+        """
+        Average number of rows per key tuple, i.e. the fan-out of joins with this table.
+        """
+        if not self.n_unique_keys:
+            return None
+        return self.n_rows / self.n_unique_keys
+
+    def summary(self) -> str:
+        text = f"{self.n_rows} rows, {self.size} bytes"
+        if self.n_unique_keys is not None and self.rows_per_key is not None:
+            text += (
+                f", {self.n_unique_keys} keys ({self.rows_per_key:.2f} rows/key, "
+                f"max key {self.max_key_fraction:.1%})"
+            )
+        for name, column in self.columns.items():
+            if column.null_fraction > 0:
+                text += f", {name} null {column.null_fraction:.1%}"
+        if self.is_sampled:
+            text += ", sampled"
+        return text
+
+    @classmethod
+    def from_dict(cls, data: dict) -> TableStatistics:
+        columns = {name: ColumnStatistics(**c) for name, c in data.get("columns", {}).items()}
+        return cls(**{**data, "columns": columns})
+
+
+def collect_statistics(
+    table: pl.DataFrame,
+    name: str,
+    keys: Sequence[str] | None = None,
+    sample_size: int | None = None,
+) -> TableStatistics:
+    """
+    Collects statistics of a table and its key columns.
+
+    The number of rows, the size and null fractions are exact. Distinct counts, min/max and the
+    skew of keys are computed from at most `sample_size` sampled rows, and distinct counts are
+    scaled to the whole table by the GEE estimator.
+
+    Parameters
+    ----------
+    table : pl.DataFrame
+        Table to collect statistics of.
+    name : str
+        Name of the table.
+    keys : Sequence of str, optional
+        Key columns of the table.
+    sample_size : int, optional
+        Maximum number of rows to compute statistics of keys from. If None, all rows are used.
+
+    Returns
+    -------
+    TableStatistics
+    """
+    keys = [key for key in keys or [] if key in table.columns]
+    statistics = TableStatistics(
+        name=name, n_rows=table.height, size=int(table.estimated_size()), keys=keys
+    )
+    if not keys or table.height == 0:
+        return statistics
+
+    sample = table.select(keys)
+    if sample_size is not None and table.height > sample_size:
+        sample = sample.sample(sample_size, seed=0)
+        statistics.is_sampled = True
+
+    for key in keys:
+        column = sample[key]
+        is_ordered = column.dtype.is_numeric() or column.dtype.is_temporal()
+        statistics.columns[key] = ColumnStatistics(
+            dtype=str(column.dtype),
+            null_fraction=table[key].null_count() / table.height,
+            n_unique=_estimate_n_unique(column.value_counts()["count"], table.height),
+            min=_to_json_value(column.min()) if is_ordered or column.dtype == pl.String else None,
+            max=_to_json_value(column.max()) if is_ordered or column.dtype == pl.String else None,
+        )
+
+    counts = sample.group_by(keys).len()["len"]
+    statistics.n_unique_keys = _estimate_n_unique(counts, table.height)
+    statistics.max_key_fraction = counts.max() / sample.height  # type: ignore[operator, assignment]
+    return statistics
+
+
+def estimate_join_rows(
+    n_rows: float | None, join: str, statistics: TableStatistics | None
+) -> float | None:
+    """
+    Estimates the number of rows of a left table of `n_rows` rows after joining a table with
+    the statistics, assuming that every row of the left table matches keys of the table.
+
+    Parameters
+    ----------
+    n_rows : float, optional
+        Number of rows of the left table.
+    join : str
+        Join method.
+    statistics : TableStatistics, optional
+        Statistics of the joined table.
+
+    Returns
+    -------
+    float or None
+        Estimated number of rows, or None if it can not be estimated.
+    """
+    if n_rows is None:
+        return None
+    if join in ["semi", "anti", "asof"]:
+        # each row of the left table is kept at most once
+        return n_rows
+    if statistics is None:
+        return None
+    if join == "cross":
+        return n_rows * statistics.n_rows
+    rows_per_key = statistics.rows_per_key
+    if rows_per_key is None:
+        return None
+    if join in ["left", "full"]:
+        return n_rows * max(1.0, rows_per_key)
+    if join in ["inner", "range"]:
+        return n_rows * rows_per_key
+    return None
+
+
+def _estimate_n_unique(counts: pl.Series, n_rows: int) -> int:
+    """
+    Estimates the number of distinct values of a table of `n_rows` rows from counts of values
+    in a sample by the GEE estimator: values seen once in the sample are scaled by
+    sqrt(n_rows / sample size), and others are counted as they are.
+    """
+    sample_rows = int(counts.sum())
+    if sample_rows == 0:
+        return 0
+    n_once = int((counts == 1).sum())
+    estimate = math.sqrt(n_rows / sample_rows) * n_once + (len(counts) - n_once)
+    return min(n_rows, round(estimate))
+
+
+def _to_json_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+class StatisticsCatalog:
+    """
+    Statistics of tables of a DataHub, keyed by table names.
+
+    Statistics are collected by `DataHub.execute` when `DataHub.collect_statistics` is True or
+    `DataHub.statistics_path` is set, and saved to the JSON file of the path after each run, so
+    that they persist between runs. The file can be shared by DataHubs; statistics are stored
+    per DataHub class.
+    """
+
+    def __init__(self, path: str | pathlib.Path | None = None, hub: str = ""):
+        """
+        Parameters
+        ----------
+        path : str or pathlib.Path, optional
+            Path of the JSON file. Statistics are loaded from the file if it exists.
+        hub : str
+            Name of the DataHub class.
+        """
+        self.path = None if path is None else pathlib.Path(path)
+        self.hub = hub
+        self.tables: dict[str, TableStatistics] = {}
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            self.load()
+
+    def __getstate__(self) -> dict:
+        # the lock is not picklable, e.g. by partitioned execution in processes
+        return {key: value for key, value in self.__dict__.items() if key != "_lock"}
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __contains__(self, name) -> bool:
+        return name in self.tables
+
+    def __getitem__(self, name: str) -> TableStatistics:
+        return self.tables[name]
+
+    def get(self, name: str) -> TableStatistics | None:
+        return self.tables.get(name)
+
+    def update(self, statistics: TableStatistics):
+        with self._lock:
+            self.tables[statistics.name] = statistics
+
+    def load(self):
+        """
+        Loads statistics of the DataHub from the file.
+        """
+        if self.path is None:
+            raise ValueError("path of the catalog is not set.")
+        data = json.loads(self.path.read_text()).get(self.hub, {})
+        with self._lock:
+            self.tables = {name: TableStatistics.from_dict(s) for name, s in data.items()}
+
+    def save(self):
+        """
+        Saves statistics of the DataHub to the file. Statistics of other DataHubs in the file
+        are kept. The file is rewritten atomically.
+        """
+        if self.path is None:
+            raise ValueError("path of the catalog is not set.")
+        with self._lock:
+            data = json.loads(self.path.read_text()) if self.path.exists() else {}
+            data[self.hub] = {name: asdict(s) for name, s in self.tables.items()}
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(data, indent=2))
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Mapping
+import hashlib
+import inspect
+from logging import getLogger
+import pathlib
+import time
+import types
+from typing import TYPE_CHECKING
+from typing import Any
+
+import polars as pl
+
+from pytred.data_node import DataNode
+
+
+if TYPE_CHECKING:
+    from pytred.data_hub import DataHub
+
+
+logger = getLogger(__name__)
+
+# Methods which are executed on every run, so that their changes do not affect tables
+RUN_METHODS = ("post_step", "steps")
+
+# Types of module globals fingerprinted by their values
+CONSTANT_TYPES = (bool, int, float, complex, str, bytes, type(None), tuple, frozenset)
+
+
+def fingerprint_datahub(datahub_class: type[DataHub]) -> dict[str, str]:
+    """
+    Fingerprints functions of the DataHub class by their bytecode and metadata, so that
+    changes of comments and formatting are ignored.
+
+    Functions and constants of the module of the DataHub class used by the functions are
+    fingerprinted together with them. Other objects of the module which functions use, e.g.
+    instances and classes, are fingerprinted by their representations.
+
+    Parameters
+    ----------
+    datahub_class : type of DataHub
+
+    Returns
+    -------
+    dict of str to str
+        Fingerprints of functions of tables keyed by their names. Other methods defined by the
+        class, which functions of tables may call, are fingerprinted together as `__methods__`.
+    """
+    table_order = datahub_class.registerd_tables_order or {}
+    fingerprints = {}
+    for name in table_order:
+        function = getattr(datahub_class, name)
+        metadata = repr(sorted(getattr(function, "__pytred_meta__", {}).items()))
+        fingerprints[name] = _hash(metadata, _fingerprint_function(function))
+
+    methods = [
+        f"{name}:{_fingerprint_function(value)}"
+        for name, value in sorted(vars(datahub_class).items())
+        if name not in table_order and name not in RUN_METHODS
+        # functions of multiple outputs are fingerprinted by their tables
+        and not hasattr(value, "__pytred_outputs__") and _get_function(value)
+    ]
+    fingerprints["__methods__"] = _hash(*methods)
+    return fingerprints
+
+
+def _get_function(value: Any) -> types.FunctionType | None:
+    if isinstance(value, (staticmethod, classmethod)):
+        value = value.__func__
+    if isinstance(value, types.FunctionType):
+        return inspect.unwrap(value)  # type: ignore[return-value]
+    return None
+
+
+def _fingerprint_function(value: Any, visited: frozenset[int] = frozenset()) -> str:
+    function = _get_function(value)
+    if function is None:
+        return repr(value)
+    if id(function) in visited:
+        # recursive functions
+        return function.__qualname__
+    visited = visited | {id(function)}
+    parts = [_fingerprint_code(function.__code__), repr(function.__defaults__)]
+    for cell in function.__closure__ or ():
+        if _get_function(cell.cell_contents) is not None:
+            parts.append(_fingerprint_function(cell.cell_contents, visited))
+        else:
+            # values of closures can not be compared between imports, e.g. nested DataHubs
+            parts.append(str(id(cell.cell_contents)))
+    for name in sorted(_get_global_names(function.__code__)):
+        if name in function.__globals__:
+            parts.append(
+                f"{name}={_fingerprint_global(function.__globals__[name], function, visited)}"
+            )
+    return _hash(*parts)
+
+
+def _fingerprint_global(value: Any, function: types.FunctionType, visited: frozenset[int]) -> str:
+    """
+    Fingerprints a global of the module of the function used by the function.
+    """
+    if isinstance(value, CONSTANT_TYPES):
+        return repr(value)
+    if isinstance(value, types.ModuleType):
+        return value.__name__
+    if getattr(value, "__module__", None) != function.__module__:
+        # objects imported from other modules, e.g. `pl.col`
+        return f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', '')}"
+    if _get_function(value) is not None:
+        return _fingerprint_function(value, visited)
+    if isinstance(value, type):
+        return _hash(
+            *(
+                f"{name}:{_fingerprint_function(member, visited)}"
+                for name, member in sorted(vars(value).items())
+                if _get_function(member) is not None
+            )
+        )
+    return repr(value)
+
+
+def _get_global_names(code: types.CodeType) -> set[str]:
+    """
+    Returns names used by the code and its nested code, which include names of globals.
+    """
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _get_global_names(const)
+    return names
+
+
+def _fingerprint_code(code: types.CodeType) -> str:
+    consts = [
+        _fingerprint_code(const) if isinstance(const, types.CodeType) else repr(const)
+        for const in code.co_consts
+    ]
+    return _hash(code.co_code.hex(), repr(code.co_names), repr(code.co_varnames), *consts)
+
+
+def _hash(*parts: str) -> str:
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def find_affected_tables(datahub_class: type[DataHub], changed: Iterable[str]) -> set[str]:
+    """
+    Returns the changed tables and the tables depending on them in the DataHub class.
+    """
+    table_order = datahub_class.registerd_tables_order or {}
+    children: dict[str, list[str]] = {}
+    for _, name, arg_table_names in datahub_class.collect_table_and_arguments(table_order):
+        for arg_table_name in arg_table_names:
+            children.setdefault(arg_table_name, []).append(name)
+
+    affected: set[str] = set()
+    stack = [name for name in changed if name in table_order]
+    while stack:
+        name = stack.pop()
+        if name not in affected:
+            affected.add(name)
+            stack.extend(children.get(name, []))
+    return affected
+
+
+class WatchSession:
+    """
+    Keeps inputs and tables of a DataHub in memory, and re-executes only the functions changed
+    in the source file and the functions depending on them, followed by the joins.
+
+    Functions are compared by their bytecode and the functions and constants of the module
+    which they use, so that saving the file without changing code does not execute anything but
+    the joins. If other methods of the class are changed, all functions are executed, since
+    functions may call them.
+
+    Examples
+    --------
+    >>> session = WatchSession("hub.py", "MyDataHub", root_df, users_node)
+    >>> df = session.run()
+    >>> # after editing hub.py
+    >>> df = session.run()
+    >>> session.last_executed
+    ['user_feature']
+    """
+
+    def __init__(
+        self,
+        file_path: str | pathlib.Path,
+        class_name: str,
+        root_df: pl.DataFrame,
+        *tables: DataNode,
+        loader: Callable[[str, str], type[DataHub]] | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        file_path : str or pathlib.Path
+            Source file of the DataHub class.
+        class_name : str
+            Name of the DataHub class.
+        root_df : pl.DataFrame
+            root_df of the DataHub.
+        tables : DataNode
+            Input tables of the DataHub.
+        loader : Callable, optional
+            Function importing the class from the file and the class name. Defaults to
+            `pytred.cli.load_datahub_class`.
+        """
+        if loader is None:
+            from pytred.cli import load_datahub_class
+
+            loader = load_datahub_class
+        self.file_path = pathlib.Path(file_path)
+        self.class_name = class_name
+        self.root_df = root_df
+        self.input_tables = list(tables)
+        self.loader = loader
+        self.datahub: DataHub | None = None
+        self.fingerprints: dict[str, str] = {}
+        # names of functions executed by the last run and its elapsed time
+        self.last_executed: list[str] = []
+        self.last_elapsed_seconds = 0.0
+
+    def run(self) -> pl.DataFrame:
+        """
+        Imports the class again and executes the changed functions, their descendants and the
+        joins. The first run executes all functions.
+
+        Returns
+        -------
+        pl.DataFrame
+            The result of the DataHub.
+        """
+        start = time.perf_counter()
+        datahub_class = self.loader(str(self.file_path), self.class_name)
+        fingerprints = fingerprint_datahub(datahub_class)
+        datahub = datahub_class(self.root_df, *self.input_tables)
+
+        changed = [
+            name
+            for name, fingerprint in fingerprints.items()
+            if self.fingerprints.get(name) != fingerprint
+        ]
+        table_order = datahub_class.registerd_tables_order or {}
+        if self.datahub is None or "__methods__" in changed:
+            affected = set(table_order)
+        else:
+            affected = find_affected_tables(datahub_class, changed)
+            datahub.tables.update(
+                self._reusable_tables(self.datahub.tables, set(table_order) - affected)
+            )
+
+        datahub._build_tables(datahub.tables, datahub.root_df, names=affected)  # type: ignore[arg-type]
+        df = datahub.post_step(datahub.steps())
+
+        self.datahub = datahub
+        self.fingerprints = fingerprints
+        self.last_executed = sorted(affected, key=lambda name: (table_order[name], name))
+        self.last_elapsed_seconds = time.perf_counter() - start
+        return df
+
+    @staticmethod
+    def _reusable_tables(tables: Mapping[str, Any], names: set[str]) -> dict[str, Any]:
+        """
+        Returns tables of the last run which are not affected by changes.
+        """
+        return {name: node for name, node in tables.items() if name in names}
+
+    def watch(self, interval: float = 0.5, max_runs: int | None = None) -> Iterator[pl.DataFrame]:
+        """
+        Runs the DataHub whenever the source file is saved, until interrupted.
+
+        Errors of runs are logged, and the tables of the last successful run are kept until the
+        next change.
+
+        Parameters
+        ----------
+        interval : float
+            Seconds between checks of the modification time of the file.
+        max_runs : int, optional
+            Number of runs after which watching stops. If None, it watches forever.
+
+        Yields
+        ------
+        pl.DataFrame
+            The result of each successful run.
+        """
+        n_runs = 0
+        modified_time = None
+        while max_runs is None or n_runs < max_runs:
+            current_time = self.file_path.stat().st_mtime_ns
+            if current_time == modified_time:
+                time.sleep(interval)
+                continue
+            modified_time = current_time
+            n_runs += 1
+            try:
+                df = self.run()
+            except Exception:
+                logger.exception(f"Failed to run {self.class_name}.")
+                continue
+            yield df
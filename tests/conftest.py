@@ -10,6 +10,7 @@ from pytred.data_node import EmptyDataNode
 
 from .fixtures.data_hub import BasicDataHub
 from .fixtures.data_hub import ComplecatedDataHub
+from .fixtures.data_hub import DataHubWithCompositeKeys
 
 
 @pytest.fixture(scope="class", autouse=True)
@@ -33,6 +34,20 @@ def complecated_datahub():
     )
 
 
+@pytest.fixture(scope="function")
+def composite_key_datahub():
+    return DataHubWithCompositeKeys(
+        pl.DataFrame({"user_id": [1, 1, 2, 3, None], "item_id": ["a", "b", "a", "c", "a"]}),
+        table_in=pl.DataFrame(
+            {
+                "user_id": [1, 2, 3, None],
+                "item_id": ["a", "a", "c", "a"],
+                "value": [1, 2, 3, 4],
+            }
+        ),
+    )
+
+
 @pytest.fixture()
 def expected_report_of_complecated_datahub():
     path = pathlib.Path(__file__).parent / "fixtures/expected_report_of_complecated_datahub.md"
@@ -2,7 +2,13 @@ import polars as pl
 
 from pytred import DataHub
 from pytred import DataNode
+from pytred.decorators import duckdb_table
 from pytred.decorators import polars_table
+from pytred.decorators.polars import TableOutput
+from pytred.decorators.polars import polars_agg
+from pytred.decorators.polars import polars_expr
+from pytred.decorators.polars import polars_tables
+from pytred.nested import NestedDataHub
 
 
 class BasicDataHub(DataHub):
@@ -163,3 +169,295 @@ class DataHubWithOptionalTable(DataHub):
     @polars_table(1, "id", join="left", is_optional=True)
     def table2_2(self, table2):
         return table2
+
+
+class DataHubWithSchemaIssues(DataHub):
+    """
+    Keys and columns are misconfigured
+    """
+
+    @polars_table(0, "id", join="left")
+    def table1(self, table_in1):
+        return table_in1.select("id", value=pl.col("value") * 2)
+
+    @polars_table(1, "id", join="left")
+    def table1_2(self, table1):
+        return table1.select("id", pl.col("value"))
+
+    @polars_table(1, "user_id", join="left")
+    def table_unknown_key(self, table_in1):
+        return table_in1.select(user_id=pl.col("id"), other=pl.col("value"))
+
+    @polars_table(2, "id", join="left")
+    def table_unknown_column(self, table_in1):
+        return table_in1.select("id", pl.col("unknown_column"))
+
+
+class DataHubWithCompositeKeys(DataHub):
+    @polars_table(0, "user_id", "item_id", join="left")
+    def table1(self, table_in):
+        return table_in.select("user_id", "item_id", value1=pl.col("value") * 10)
+
+    @polars_table(0, "user_id", "item_id", join="inner")
+    def table2(self, table_in):
+        return table_in.select("user_id", "item_id", value2=pl.col("value") + 1).filter(
+            pl.col("value2") < 5
+        )
+
+    @polars_table(0, "user_id", "item_id", join="left", is_validate_unique=False)
+    def table3(self, table_in):
+        return pl.concat([table_in, table_in]).select("user_id", "item_id", pl.col("value"))
+
+
+class DataHubForServing(DataHub):
+    def __init__(self, root_df, *nodes, **tables):
+        super().__init__(root_df, *nodes, **tables)
+        self.called_functions = []
+
+    @polars_table(0, "id", join="left")
+    def user_feature(self, users):
+        self.called_functions.append("user_feature")
+        return users.select("id", score=pl.col("score") * 2)
+
+    @polars_table(0, "id", join="inner")
+    def active_users(self, users):
+        self.called_functions.append("active_users")
+        return users.filter(pl.col("active")).select("id", "active")
+
+    @polars_table(0, "id", join="anti")
+    def blocked_users(self, blocked):
+        self.called_functions.append("blocked_users")
+        return blocked
+
+    @polars_table(0, "id", join="left")
+    def request_feature(self, root_df, users):
+        self.called_functions.append("request_feature")
+        return root_df.unique().join(users, on="id").select("id", score=pl.col("score") + 1)
+
+    @polars_table(1, "id", join="left")
+    def request_feature_2(self, request_feature):
+        self.called_functions.append("request_feature_2")
+        return request_feature.select("id", score2=pl.col("score") * 10)
+
+
+class DataHubWithLargeIntermediate(DataHub):
+    @polars_table(0, join=None)
+    def intermediate(self, source):
+        return source.with_columns(double=pl.col("value") * 2)
+
+    @polars_table(1, "id", join="left")
+    def feature1(self, intermediate):
+        return intermediate.select("id", feature1=pl.col("double") + 1)
+
+    @polars_table(2, "id", join="left")
+    def feature2(self, intermediate, feature1):
+        return intermediate.join(feature1, on="id").select(
+            "id", feature2=pl.col("double") * pl.col("feature1")
+        )
+
+
+class DataHubWithDuckDB(DataHub):
+    """
+    polars and DuckDB tables are mixed
+    """
+
+    @duckdb_table(0, "id", join="left")
+    def amount(self, orders):
+        return (
+            "SELECT id, SUM(amount)::BIGINT AS amount, COUNT(*) AS n_orders "
+            "FROM orders GROUP BY id"
+        )
+
+    @polars_table(0, "id", join="left")
+    def user_score(self, users):
+        return users.select("id", "score")
+
+    @duckdb_table(1, "id", join="left")
+    def amount_rank(self, amount, user_score):
+        return amount.join(user_score, "id").project(
+            "id, rank() OVER (ORDER BY amount DESC, id) AS rank, score"
+        )
+
+    @duckdb_table(1, "id", join="anti")
+    def blocked_users(self, blocked):
+        return blocked.select("id")
+
+    @polars_table(2, "id", join="inner")
+    def active_users(self, amount_rank):
+        return amount_rank.filter(pl.col("rank") <= 3).select("id")
+
+
+class OrderFeatureHub(DataHub):
+    @polars_table(0, "user_id", join="left")
+    def order_amount(self, orders):
+        return orders.group_by("user_id").agg(amount=pl.col("amount").sum())
+
+    @polars_table(0, "user_id", join="inner")
+    def order_count(self, orders):
+        return orders.group_by("user_id").agg(n_orders=pl.len())
+
+    @polars_table(1, "user_id", join="left", is_optional=True)
+    def coupon(self, coupons, order_count):
+        return coupons.join(order_count, on="user_id").select("user_id", "coupon")
+
+    def post_step(self, df):
+        return df.with_columns(average=pl.col("amount") / pl.col("n_orders"))
+
+
+class DataHubWithNestedHub(DataHub):
+    @polars_table(0, join=None)
+    def users(self, root_df):
+        return root_df.select("user_id").unique()
+
+    order_features = NestedDataHub(
+        OrderFeatureHub, 1, "user_id", join="left", root="users", tables={"orders": "user_orders"}
+    )
+
+    @polars_table(4, "user_id", join="left")
+    def large_amount(self, order_features__order_amount):
+        return order_features__order_amount.select("user_id", is_large=pl.col("amount") > 10)
+
+
+class DataHubWithKeyLocalTables(DataHub):
+    @polars_table(0, "user_id", join="left", is_key_local=True)
+    def user_amount(self, orders):
+        return orders.group_by("user_id").agg(amount=pl.col("amount").sum())
+
+    @polars_table(0, join=None, is_key_local=True)
+    def large_orders(self, orders):
+        return orders.filter(pl.col("amount") >= 3)
+
+    @polars_table(1, "user_id", join="left", is_key_local=True)
+    def user_spend(self, orders, items):
+        return (
+            orders.join(items, on="item_id")
+            .group_by("user_id")
+            .agg(spend=(pl.col("amount") * pl.col("price")).sum())
+        )
+
+    @polars_table(1, join="cross")
+    def large_order_total(self, large_orders):
+        return large_orders.select(large_total=pl.col("amount").sum())
+
+    @polars_table(2, "user_id", join="inner", is_key_local=True)
+    def active_users(self, root_df, user_amount):
+        return root_df.join(user_amount, on="user_id").select("user_id").unique()
+
+
+class DataHubWithExpressions(DataHub):
+    @polars_expr(0)
+    def price_with_tax(self):
+        return (pl.col("price") * 1.1).alias("price_with_tax")
+
+    @polars_expr(0)
+    def price_flags(self, thresholds):
+        threshold = thresholds["price"].max()
+        return {"is_expensive": pl.col("price") > threshold, "is_free": pl.col("price") == 0}
+
+    @polars_table(1, "id", join="left")
+    def item_name(self, items):
+        return items
+
+    @polars_expr(2)
+    def price_rank(self):
+        return [pl.col("price").rank("ordinal").alias("price_rank")]
+
+
+class DataHubWithJoinedFeatures(DataHub):
+    @polars_table(0, "id", join="left")
+    def price_with_tax(self, root_df):
+        return root_df.select("id", price_with_tax=pl.col("price") * 1.1)
+
+    @polars_table(0, "id", join="left")
+    def price_flags(self, root_df, thresholds):
+        threshold = thresholds["price"].max()
+        return root_df.select(
+            "id", is_expensive=pl.col("price") > threshold, is_free=pl.col("price") == 0
+        )
+
+    @polars_table(1, "id", join="left")
+    def item_name(self, items):
+        return items
+
+    @polars_table(2, "id", join="left")
+    def price_rank(self, root_df):
+        return root_df.select("id", price_rank=pl.col("price").rank("ordinal"))
+
+
+class DataHubWithAggregations(DataHub):
+    @polars_agg(0, "user_id")
+    def order_amount(self, orders):
+        return {"total_amount": pl.col("amount").sum(), "max_amount": pl.col("amount").max()}
+
+    @polars_agg(0, "user_id")
+    def order_count(self, orders):
+        return pl.len().alias("n_orders")
+
+    @polars_agg(1, "user_id", join="inner")
+    def first_item(self, orders):
+        return [pl.col("item_id").min().alias("first_item")]
+
+    @polars_agg(1, "user_id", "item_id", join=None)
+    def item_amount(self, orders):
+        return pl.col("amount").sum().alias("item_amount")
+
+    @polars_table(2, "user_id", join="left")
+    def n_items(self, item_amount):
+        return item_amount.group_by("user_id").agg(n_items=pl.len())
+
+
+class DataHubWithGroupByTables(DataHub):
+    @polars_table(0, "user_id", join="left")
+    def order_amount(self, orders):
+        return orders.group_by("user_id").agg(
+            total_amount=pl.col("amount").sum(), max_amount=pl.col("amount").max()
+        )
+
+    @polars_table(0, "user_id", join="left")
+    def order_count(self, orders):
+        return orders.group_by("user_id").agg(n_orders=pl.len())
+
+    @polars_table(1, "user_id", join="inner")
+    def first_item(self, orders):
+        return orders.group_by("user_id").agg(first_item=pl.col("item_id").min())
+
+    @polars_table(1, join=None)
+    def item_amount(self, orders):
+        return orders.group_by("user_id", "item_id").agg(item_amount=pl.col("amount").sum())
+
+    @polars_table(2, "user_id", join="left")
+    def n_items(self, item_amount):
+        return item_amount.group_by("user_id").agg(n_items=pl.len())
+
+
+class DataHubWithOrderedJoins(DataHub):
+    @polars_table(0, "item_id", join="asof", on="timestamp", tolerance=10)
+    def latest_price(self, prices):
+        return prices
+
+    @polars_table(1, "item_id", join="range", on="timestamp", between=("start", "end"))
+    def campaign(self, campaigns):
+        return campaigns
+
+
+class DataHubWithMultipleOutputs(DataHub):
+    @polars_tables(
+        0,
+        order_amount=TableOutput(("user_id",), join="left"),
+        large_orders=TableOutput(),
+    )
+    def order_tables(self, orders):
+        """
+        Tables of orders sharing the filtered orders
+        """
+        valid_orders = orders.filter(pl.col("amount") > 1)
+        return {
+            "order_amount": valid_orders.group_by("user_id").agg(
+                total_amount=pl.col("amount").sum()
+            ),
+            "large_orders": valid_orders.filter(pl.col("amount") > 4).select("user_id", "item_id"),
+        }
+
+    @polars_table(1, "user_id", join="left")
+    def n_large_orders(self, large_orders):
+        return large_orders.group_by("user_id").agg(n_large_orders=pl.len())
@@ -0,0 +1,103 @@
+import json
+import pathlib
+
+from pytred.cli import load_datahub_class
+from pytred.helpers.batch_report import CACHE_FILE_NAME
+from pytred.helpers.batch_report import _render_file
+from pytred.helpers.batch_report import discover_datahubs
+from pytred.helpers.batch_report import infer_input_tables
+from pytred.helpers.batch_report import report_directory
+
+
+FIXTURE_PATH = pathlib.Path(__file__).parents[1] / "fixtures" / "data_hub.py"
+
+HUB_SOURCE = '''
+from pytred import DataHub
+from pytred.decorators import polars_table
+
+
+class Hub(DataHub):
+    """{doc}"""
+
+    @polars_table(0, "id", join="left")
+    def users(self, users_raw):
+        return users_raw
+
+
+class BrokenHub(DataHub):
+    pass
+'''
+
+
+def write_hubs(directory: pathlib.Path, doc: str = "Hub for test."):
+    (directory / "hubs").mkdir(exist_ok=True)
+    (directory / "hubs" / "hub.py").write_text(HUB_SOURCE.format(doc=doc))
+    (directory / "not_hub.py").write_text("x = 1\n")
+    (directory / ".hidden").mkdir(exist_ok=True)
+    (directory / ".hidden" / "hub.py").write_text(HUB_SOURCE.format(doc=doc))
+
+
+def test__discover_datahubs(tmp_path):
+    write_hubs(tmp_path)
+    (tmp_path / "fixtures.py").write_text(FIXTURE_PATH.read_text())
+
+    actual = discover_datahubs(tmp_path)
+
+    assert actual[tmp_path / "hubs" / "hub.py"] == ["Hub", "BrokenHub"]
+    assert "ComplecatedDataHub" in actual[tmp_path / "fixtures.py"]
+    assert "OrderFeatureHub" in actual[tmp_path / "fixtures.py"]
+    assert set(actual) == {tmp_path / "hubs" / "hub.py", tmp_path / "fixtures.py"}
+
+
+def test__infer_input_tables():
+    datahub_class = load_datahub_class(str(FIXTURE_PATH), "ComplecatedDataHub")
+
+    actual = [node.name for node in infer_input_tables(datahub_class)]
+
+    assert actual == ["input_table2"]
+
+
+def test__report_directory_skips_unchanged_files(tmp_path):
+    source_dir = tmp_path / "src"
+    output_dir = tmp_path / "docs"
+    source_dir.mkdir()
+    write_hubs(source_dir)
+    report_path = output_dir / "hubs.hub.Hub.md"
+
+    result = report_directory(source_dir, output_dir, max_workers=1)
+
+    assert result.rendered == [str(report_path)]
+    assert result.skipped == []
+    assert list(result.failed) == [f"{source_dir / 'hubs' / 'hub.py'}::BrokenHub"]
+    assert "Hub for test." in report_path.read_text()
+    assert "users_raw" in report_path.read_text()
+    assert list(json.loads((output_dir / CACHE_FILE_NAME).read_text())) == ["hubs.hub.Hub"]
+
+    result = report_directory(source_dir, output_dir, max_workers=1)
+    assert result.rendered == []
+    assert result.skipped == [str(report_path)]
+
+    write_hubs(source_dir, doc="Updated hub.")
+    result = report_directory(source_dir, output_dir, max_workers=1)
+    assert result.rendered == [str(report_path)]
+    assert "Updated hub." in report_path.read_text()
+
+    result = report_directory(source_dir, output_dir, max_workers=1, use_cache=False)
+    assert result.rendered == [str(report_path)]
+
+
+def test__render_file_imports_module_once(tmp_path):
+    counter_path = tmp_path / "count.txt"
+    source = HUB_SOURCE.format(doc="Hub for test.").replace(
+        "class BrokenHub(DataHub):", "class OtherHub(Hub):"
+    )
+    hub_path = tmp_path / "hub.py"
+    hub_path.write_text(
+        f"with open({str(counter_path)!r}, 'a') as f:\n    f.write('x')\n" + source
+    )
+
+    reports, errors = _render_file(hub_path, ["Hub", "OtherHub", "MissingHub"], "import")
+
+    assert counter_path.read_text() == "x"
+    assert set(reports) == {"Hub", "OtherHub"}
+    assert list(errors) == ["MissingHub"]
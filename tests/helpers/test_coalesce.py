@@ -0,0 +1,81 @@
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+from pytred.data_node import DataNode
+from pytred.helpers.coalesce import coalesce_join_nodes
+from pytred.helpers.coalesce import group_coalescible_joins
+
+
+def make_node(name, join="left", keys=("id",), **columns):
+    return DataNode(pl.DataFrame(columns), keys=list(keys), join=join, name=name)
+
+
+def test__group_coalescible_joins():
+    nodes = [
+        make_node("a", id=[1, 2], a=[1, 2]),
+        make_node("b", id=[2, 3], b=[1, 2]),
+        # different join
+        make_node("c", join="inner", id=[1], c=[1]),
+        # different keys
+        make_node("d", keys=("id", "sub"), id=[1], sub=[1], d=[1]),
+        make_node("e", keys=("id", "sub"), id=[1], sub=[1], e=[1]),
+        # column of the left table needs a suffix
+        make_node("f", keys=("id", "sub"), id=[1], sub=[1], value=[1]),
+        # different key dtype
+        make_node("g", id=["1"], g=[1]),
+        make_node("h", id=[1], h=[1]),
+    ]
+
+    groups = group_coalescible_joins(["id", "sub", "value"], nodes)
+
+    assert [[node.name for node in group] for group in groups] == [
+        ["a", "b"],
+        ["c"],
+        ["d", "e"],
+        ["f"],
+        ["g"],
+        ["h"],
+    ]
+
+
+@pytest.mark.parametrize("join", ["left", "inner"])
+def test__coalesce_join_nodes_returns_same_result(join):
+    root_df = pl.DataFrame({"id": [1, 2, 3, 4, None], "x": [1, 2, 3, 4, 5]})
+    nodes = [
+        make_node("a", join=join, id=[1, 2, 2, None], a=[1, 2, 3, 4]),
+        make_node("b", join=join, id=[2, 3, None], b=[5, 6, 7]),
+        make_node("c", join=join, id=[1, 2, 4], c=[8, 9, 10]),
+    ]
+    expected = root_df
+    for node in nodes:
+        expected = expected.join(node.table, on=node.keys, how=join)
+
+    node = coalesce_join_nodes(nodes)
+    actual = root_df.join(node.table, on=node.keys, how=join)
+
+    assert node.name == "a,b,c"
+    assert_frame_equal(actual, expected, check_row_order=False)
+
+
+def test__coalesce_aligned_tables_horizontally():
+    nodes = [make_node("a", id=[1, 2], a=[1, 2]), make_node("b", id=[1, 2], b=[3, 4])]
+
+    node = coalesce_join_nodes(nodes)
+
+    assert_frame_equal(node.table, pl.DataFrame({"id": [1, 2], "a": [1, 2], "b": [3, 4]}))
+
+
+def test__group_coalescible_joins_larger_than_left_table():
+    nodes = [
+        make_node("a", id=[1, 2, 3], a=[1, 2, 3]),
+        # aligned with a
+        make_node("b", id=[1, 2, 3], b=[1, 2, 3]),
+        make_node("c", id=[1, 2, 4], c=[1, 2, 3]),
+        make_node("d", id=[1, 2], d=[1, 2]),
+        make_node("e", id=[3], e=[1]),
+    ]
+
+    groups = group_coalescible_joins(["id"], nodes, max_rows=2)
+
+    assert [[node.name for node in group] for group in groups] == [["a", "b"], ["c"], ["d", "e"]]
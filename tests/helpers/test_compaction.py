@@ -0,0 +1,49 @@
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from pytred.helpers.compaction import compact_tables
+from pytred.helpers.compaction import plan_compaction
+
+
+def test__plan_compaction_share_dtype_between_tables():
+    frames = [
+        pl.DataFrame({"id": [1, 2, 3, 4], "category": ["a", "b", "a", "b"]}),
+        pl.DataFrame({"id": [1, 300], "value": [0.5, 1.25], "category": ["c", "c"]}),
+    ]
+
+    actual = plan_compaction(frames)
+    expected = {
+        "id": pl.Int16,
+        "value": pl.Float32,
+        "category": pl.Enum(["a", "b", "c"]),
+    }
+    assert actual == expected
+
+
+def test__plan_compaction_keep_values():
+    frames = [
+        pl.DataFrame(
+            {
+                "large_int": [-1, 2**40],
+                "precise_float": [0.1, None],
+                "high_cardinality": ["a", "b"],
+                "unsigned": pl.Series([0, 255], dtype=pl.UInt64),
+            }
+        ),
+    ]
+
+    actual = plan_compaction(frames)
+    expected = {"unsigned": pl.UInt8}
+    assert actual == expected
+
+
+def test__compact_tables_reports_saved_memory():
+    tables = {
+        "table1": pl.DataFrame({"id": list(range(100)), "flag": ["yes", "no"] * 50}),
+    }
+
+    compacted, results = compact_tables(tables)
+
+    assert_frame_equal(compacted["table1"], tables["table1"], check_dtypes=False)
+    assert compacted["table1"].schema == pl.Schema({"id": pl.Int8, "flag": pl.Enum(["no", "yes"])})
+    assert results["table1"].saved_size > 0
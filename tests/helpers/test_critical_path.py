@@ -0,0 +1,60 @@
+import pytest
+
+from pytred.callbacks import TimingRecorder
+from pytred.data_node import EmptyDataNode
+from pytred.helpers.critical_path import compute_critical_path
+from pytred.helpers.visualize import make_dataflow_graph_from_datahub
+
+
+INPUT_TABLES = [EmptyDataNode(name="input_table2", keys=["id"], join="left")]
+TIMINGS = {"table1": 1.0, "table2": 0.5, "table1_2": 2.0, "table_not_in_output": 0.1}
+
+
+def test__compute_critical_path(basic_datahub):
+    nodes = type(basic_datahub).search_tables(*INPUT_TABLES)
+
+    report = compute_critical_path(nodes, TIMINGS)
+
+    assert report.path == ["table1", "table1_2"]
+    assert report.total_seconds == pytest.approx(3.0)
+    assert report.slack == pytest.approx(
+        {
+            "input_table2": 3.0,
+            "table1": 0.0,
+            "table2": 2.5,
+            "table1_2": 0.0,
+            "table_not_in_output": 2.9,
+        }
+    )
+    assert report.summary().startswith("Critical path (3.000s): table1 -> table1_2")
+
+
+def test__critical_path_from_recorded_timings(basic_datahub):
+    datahub = basic_datahub
+    recorder = TimingRecorder()
+    datahub.add_callback(recorder)
+    datahub.execute()
+
+    report = type(datahub).critical_path(recorder.timings, *INPUT_TABLES)
+
+    assert set(recorder.timings) == set(datahub.expected_called_order)
+    assert report.total_seconds >= max(recorder.timings.values())
+    assert all(slack >= 0 for slack in report.slack.values())
+    assert all(report.slack[name] == pytest.approx(0.0) for name in report.path)
+
+
+def test__highlight_critical_path_in_dataflow_graph(basic_datahub):
+    graph, _ = make_dataflow_graph_from_datahub(
+        type(basic_datahub), *INPUT_TABLES, timings=TIMINGS
+    )
+    lines = str(graph).splitlines()
+
+    assert "    style table1 stroke:#d62728,stroke-width:3px" in lines
+    assert "    style table1_2 stroke:#d62728,stroke-width:3px" in lines
+    assert "    style table2 stroke:#d62728,stroke-width:3px" not in lines
+    highlighted = [line.split()[1] for line in lines if line.strip().startswith("linkStyle")]
+    edges = [line.strip() for line in lines if "--" in line or "~~~" in line]
+    assert [edges[int(i)].split()[:3] for i in highlighted] == [
+        ["table1", "-->", "table1_2"],
+        ["table1_2", "--->|left<br>-", "id|"],
+    ]
@@ -0,0 +1,43 @@
+import logging
+
+import polars as pl
+import pytest
+
+from pytred.exceptions import JoinFanoutError
+from pytred.helpers.fanout import FanoutEstimate
+from pytred.helpers.fanout import check_fanout
+from pytred.helpers.fanout import estimate_fanout
+
+
+@pytest.mark.parametrize(
+    "right, keys, expected_fanout",
+    [
+        [pl.DataFrame({"id": [1, 2, 3, 4]}), ["id"], 1.0],
+        [pl.DataFrame({"id": [1, 1, 2, 2]}), ["id"], 2.0],
+        [pl.DataFrame({"id1": [1, 1, 1, 1], "id2": ["a", "a", "b", "b"]}), ["id1", "id2"], 2.0],
+        [pl.DataFrame({"id": []}, schema={"id": pl.Int64}), ["id"], 1.0],
+    ],
+)
+def test__estimate_fanout(right, keys, expected_fanout):
+    estimate = estimate_fanout(10, right, keys, "table1")
+
+    assert estimate.fanout == expected_fanout
+    assert estimate.estimated_rows == int(10 * expected_fanout)
+
+
+def test__check_fanout_policy(caplog):
+    unique = FanoutEstimate("table1", left_rows=10, right_rows=10, right_unique_keys=10)
+    duplicated = FanoutEstimate("table1", left_rows=10, right_rows=30, right_unique_keys=10)
+
+    check_fanout(unique, "raise")
+    check_fanout(duplicated, 3)
+    with caplog.at_level(logging.WARNING, logger="pytred"):
+        check_fanout(duplicated, "warn")
+    assert "multiplies rows by about 3.00" in caplog.text
+
+    with pytest.raises(JoinFanoutError):
+        check_fanout(duplicated, "raise")
+    with pytest.raises(JoinFanoutError):
+        check_fanout(duplicated, 2.5)
+    with pytest.raises(ValueError):
+        check_fanout(duplicated, "ignore")  # type: ignore[arg-type]
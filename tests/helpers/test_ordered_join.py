@@ -0,0 +1,85 @@
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+from pytred.data_node import DataNode
+from pytred.helpers.ordered_join import join_data_node
+from pytred.helpers.ordered_join import validate_join_options
+
+
+@pytest.fixture
+def events():
+    return pl.DataFrame({"item_id": [1, 2, 1, 1], "timestamp": [25, 12, 5, 15]})
+
+
+@pytest.mark.parametrize(
+    "strategy, tolerance, expected",
+    [
+        ("backward", None, [20, 10, None, 10]),
+        ("forward", None, [None, 40, 10, 20]),
+        # ties are resolved to the later row
+        ("nearest", None, [20, 10, 10, 20]),
+        ("backward", 4, [None, 10, None, None]),
+    ],
+)
+def test__asof_join_keeps_row_order(events, strategy, tolerance, expected):
+    prices = pl.DataFrame(
+        {"item_id": [1, 1, 2, 2], "timestamp": [20, 10, 30, 8], "price": [20, 10, 40, 10]}
+    )
+    node = DataNode(
+        prices,
+        keys=["item_id"],
+        join="asof",
+        name="price",
+        join_options={"on": "timestamp", "strategy": strategy, "tolerance": tolerance},
+    )
+
+    actual = join_data_node(events, node)
+
+    assert_frame_equal(actual, events.with_columns(price=pl.Series(expected, dtype=pl.Int64)))
+
+
+def test__range_join(events):
+    campaigns = pl.DataFrame(
+        {
+            "item_id": [1, 1, 2],
+            "start": [0, 10, 0],
+            "end": [10, 20, 10],
+            "campaign": ["a", "b", "c"],
+        }
+    )
+    node = DataNode(
+        campaigns,
+        keys=["item_id"],
+        join="range",
+        name="campaign",
+        join_options={"on": "timestamp", "between": ("start", "end")},
+    )
+
+    actual = join_data_node(events, node)
+
+    # events without campaigns are dropped
+    expected = pl.DataFrame(
+        {
+            "item_id": [1, 1],
+            "timestamp": [5, 15],
+            "start": [0, 10],
+            "end": [10, 20],
+            "campaign": ["a", "b"],
+        }
+    )
+    assert_frame_equal(actual, expected, check_row_order=False)
+
+
+@pytest.mark.parametrize(
+    "join, options",
+    [
+        ("asof", {}),
+        ("asof", {"on": "timestamp", "strategy": "latest"}),
+        ("range", {"on": "timestamp", "between": "start"}),
+        ("left", {"on": "timestamp"}),
+    ],
+)
+def test__raise_ValueError_invalid_join_options(join, options):
+    with pytest.raises(ValueError):
+        validate_join_options(join, options)
@@ -0,0 +1,23 @@
+import polars as pl
+import pytest
+
+from pytred.helpers.sampling import sample_by_keys
+
+
+def test__sample_by_keys_keeps_same_keys():
+    df1 = pl.DataFrame({"id": range(10_000), "value": 1})
+    df2 = pl.DataFrame({"id": list(range(0, 10_000, 2)) * 2}, schema={"id": pl.Int32})
+
+    sampled1 = sample_by_keys(df1, ["id"], 0.1)
+    sampled2 = sample_by_keys(df2, ["id"], 0.1, key_dtypes={"id": pl.Int64})
+
+    assert 800 < len(sampled1) < 1200
+    assert set(sampled2["id"]) == set(sampled1["id"]) & set(df2["id"])
+    assert sample_by_keys(df1, ["id"], 0.1, seed=1)["id"].to_list() != sampled1["id"].to_list()
+    assert sample_by_keys(df1, ["id"], 1.0).equals(df1)
+
+
+@pytest.mark.parametrize("fraction", [0, -0.1, 1.5])
+def test__raise_ValueError_invalid_fraction(fraction):
+    with pytest.raises(ValueError):
+        sample_by_keys(pl.DataFrame({"id": [1]}), ["id"], fraction)
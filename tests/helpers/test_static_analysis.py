@@ -0,0 +1,126 @@
+import pathlib
+import textwrap
+
+import pytest
+
+from pytred.cli import load_datahub_class
+from pytred.data_node import EmptyDataNode
+from pytred.exceptions import StaticAnalysisError
+from pytred.helpers.static_analysis import load_datahub_class_statically
+from pytred.helpers.visualize import report_datahub
+
+
+FIXTURE_PATH = pathlib.Path(__file__).parents[1] / "fixtures" / "data_hub.py"
+
+
+@pytest.mark.parametrize("class_name", ["ComplecatedDataHub", "BasicDataHub", "DataHubWithDuckDB"])
+def test__static_report_is_same_as_imported_report(class_name, inputs_visualize_test):
+    _, tables = inputs_visualize_test
+
+    actual = report_datahub(load_datahub_class_statically(FIXTURE_PATH, class_name), *tables)
+    expected = report_datahub(load_datahub_class(FIXTURE_PATH, class_name), *tables)
+
+    assert actual == expected
+
+
+def test__load_datahub_class_without_importing_dependencies(tmp_path):
+    path = tmp_path / "hub.py"
+    path.write_text(textwrap.dedent('''
+            import not_installed_package
+
+            from pytred import DataHub
+            from pytred.decorators import polars_table as pt
+
+            not_installed_package.side_effect()
+
+
+            class BaseHub(DataHub):
+                """Base hub."""
+
+                @pt(0, "id", join="left")
+                def users(self, users_raw):
+                    """Users."""
+                    return not_installed_package.load(users_raw)
+
+                @pt(0, "id", join="left")
+                def removed(self):
+                    return not_installed_package.load()
+
+
+            class Hub(BaseHub):
+                """Hub for test."""
+
+                @pt(1, "id", join="inner", is_optional=True)
+                def scores(self, users, events=None):
+                    return not_installed_package.score(users, events)
+
+                def removed(self):
+                    return None
+            '''))
+
+    hub = load_datahub_class_statically(path, "Hub")
+
+    assert hub.__doc__ == "Hub for test."
+    assert hub.registerd_tables_order == {"users": 0, "scores": 1}
+    assert hub.table_join_info == {"users": "left", "scores": "inner"}
+    assert hub.users.__pytred_meta__["keys"] == ("id",)
+    assert hub.scores.__pytred_meta__["is_optional"]
+    assert hub.users.__doc__ == "Users."
+    nodes = hub.search_tables(EmptyDataNode(name="users_raw", keys=None, join=None))
+    assert {node.name: [child.name for child in node.children] for node in nodes} == {
+        "users_raw": ["users"],
+        "users": ["scores"],
+        "scores": [],
+    }
+    with pytest.raises(StaticAnalysisError):
+        hub.users(None, None)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "@polars_table(ORDER, 'id', join='left')\ndef users(self):\n    pass",
+        "@polars_table(0, 'id', join='left')\n@cache\ndef users(self):\n    pass",
+        "nested = NestedDataHub(OtherHub, 0, 'id')",
+        "@custom_table(0, 'id', join='left')\ndef users(self):\n    pass",
+        "@cache\ndef helper(self):\n    pass",
+    ],
+)
+def test__raise_StaticAnalysisError_if_not_resolved(tmp_path, source):
+    path = tmp_path / "hub.py"
+    path.write_text(
+        "from pytred import DataHub\n"
+        "from pytred.decorators import polars_table\n"
+        "from pytred.nested import NestedDataHub\n\n"
+        "class Hub(DataHub):\n" + textwrap.indent(source, "    ") + "\n"
+    )
+
+    with pytest.raises(StaticAnalysisError):
+        load_datahub_class_statically(path, "Hub")
+
+
+@pytest.mark.parametrize(
+    "imports, decorator",
+    [
+        ("from pytred import decorators", "decorators.polars_table"),
+        ("import pytred as pt", "pt.decorators.polars_table"),
+        ("import pytred.decorators", "pytred.decorators.polars_table"),
+        ("from pytred.decorators import polars as pd", "pd.polars_table"),
+    ],
+)
+def test__resolve_decorators_of_imported_modules(tmp_path, imports, decorator):
+    path = tmp_path / "hub.py"
+    path.write_text(
+        f"{imports}\nfrom pytred import DataHub\n\n"
+        "class Hub(DataHub):\n"
+        f"    @{decorator}(0, 'id', join='left')\n"
+        "    def users(self):\n"
+        "        pass\n\n"
+        "    @staticmethod\n"
+        "    def helper():\n"
+        "        pass\n"
+    )
+
+    hub = load_datahub_class_statically(path, "Hub")
+
+    assert hub.registerd_tables_order == {"users": 0}
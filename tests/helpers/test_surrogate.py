@@ -0,0 +1,43 @@
+import polars as pl
+
+from pytred.data_node import DataNode
+from pytred.helpers.surrogate import encode_surrogate_keys
+from pytred.helpers.surrogate import get_surrogate_column_name
+
+
+def test__encode_surrogate_keys():
+    root_df = pl.DataFrame({"id1": [1, 1, 2], "id2": ["a", "b", "a"]})
+    nodes = [
+        DataNode(
+            pl.DataFrame({"id1": [1, 2], "id2": ["a", "a"], "x": [1, 2]}),
+            keys=["id1", "id2"],
+            join="left",
+            name="table1",
+        ),
+        DataNode(
+            pl.DataFrame({"id1": [1], "id2": ["b"], "y": [3]}),
+            keys=["id1", "id2"],
+            join="left",
+            name="table2",
+        ),
+        DataNode(
+            pl.DataFrame({"id1": [1], "z": [3]}),
+            keys=["id1"],
+            join="left",
+            name="single_key",
+        ),
+    ]
+
+    encoded_root, encoded_nodes, surrogate_columns = encode_surrogate_keys(root_df, nodes)
+
+    surrogate_column = get_surrogate_column_name(["id1", "id2"])
+    assert surrogate_columns == [surrogate_column]
+    assert encoded_root.columns == ["id1", "id2", surrogate_column]
+    assert encoded_root[surrogate_column].n_unique() == 3
+    assert [node.keys for node in encoded_nodes] == [
+        [surrogate_column],
+        [surrogate_column],
+        ["id1"],
+    ]
+    assert encoded_nodes[0].table.columns == ["x", surrogate_column]
+    assert encoded_nodes[2] is nodes[2]
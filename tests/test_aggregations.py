@@ -0,0 +1,118 @@
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+from pytred import DataHub
+from pytred.callbacks import ExecutionCallback
+from pytred.decorators.polars import polars_agg
+
+from .fixtures.data_hub import DataHubWithAggregations
+from .fixtures.data_hub import DataHubWithGroupByTables
+
+
+@pytest.fixture
+def aggregation_inputs():
+    return {
+        "root_df": pl.DataFrame({"user_id": [1, 2, 3, 4]}),
+        "orders": pl.DataFrame(
+            {
+                "user_id": [1, 1, 2, 3, 3, 3],
+                "item_id": [10, 11, 10, 12, 12, 13],
+                "amount": [5, 8, 3, 1, 2, 7],
+            }
+        ),
+    }
+
+
+class JoinRecorder(ExecutionCallback):
+    def __init__(self):
+        self.joins = []
+
+    def on_join_end(self, event):
+        self.joins.append(event.name)
+
+
+def test__aggregations_return_same_result_as_group_by_tables(aggregation_inputs):
+    expected = DataHubWithGroupByTables(**aggregation_inputs)()
+    actual = DataHubWithAggregations(**aggregation_inputs)()
+
+    assert_frame_equal(actual, expected, check_row_order=False)
+
+
+def test__aggregations_of_same_source_and_keys_are_fused(aggregation_inputs, monkeypatch):
+    group_by_keys = []
+    group_by = pl.DataFrame.group_by
+
+    def recording_group_by(df, *keys, **kwargs):
+        group_by_keys.append(keys)
+        return group_by(df, *keys, **kwargs)
+
+    monkeypatch.setattr(pl.DataFrame, "group_by", recording_group_by)
+    recorder = JoinRecorder()
+    datahub = DataHubWithAggregations(**aggregation_inputs)
+    datahub.add_callback(recorder)
+    datahub.execute()
+
+    # one group_by per pair of source and keys, and one by n_items
+    assert len(group_by_keys) == 3
+    # aggregations with the same join type are joined at once
+    assert recorder.joins == ["order_amount,order_count", "first_item", "n_items"]
+    assert datahub.get("order_count").table.columns == ["user_id", "n_orders"]
+
+
+def test__compiled_datahub_with_aggregations(aggregation_inputs):
+    root_df = aggregation_inputs.pop("root_df")
+    expected = DataHubWithAggregations(root_df, **aggregation_inputs)()
+
+    compiled = DataHubWithAggregations(root_df.head(1), **aggregation_inputs).compile()
+
+    assert_frame_equal(compiled(root_df), expected, check_row_order=False)
+
+
+def test__dry_run_with_aggregations(aggregation_inputs):
+    datahub = DataHubWithAggregations(**aggregation_inputs)
+    report = datahub.dry_run()
+
+    assert report.is_valid
+    assert report.schemas["order_count"] == pl.Schema({"user_id": pl.Int64, "n_orders": pl.UInt32})
+    assert report.output_schema == datahub().schema
+
+
+def test__aggregations_of_multiple_columns_and_colliding_names(aggregation_inputs):
+    class DataHubWithCollidingAggregations(DataHub):
+        @polars_agg(0, "user_id")
+        def amounts(self, orders):
+            return pl.col("item_id", "amount").sum()
+
+        @polars_agg(0, "user_id")
+        def n_orders(self, orders):
+            return pl.len()
+
+        @polars_agg(0, "user_id")
+        def n_rows(self, orders):
+            return pl.len()
+
+    datahub = DataHubWithCollidingAggregations(**aggregation_inputs)
+    df = datahub()
+
+    assert datahub.get("amounts").table.columns == ["user_id", "item_id", "amount"]
+    assert datahub.get("n_rows").table.columns == ["user_id", "len"]
+    # the colliding column is joined with a suffix as if aggregations were not fused
+    assert df.sort("user_id").to_dict(as_series=False) == {
+        "user_id": [1, 2, 3, 4],
+        "item_id": [21, 10, 37, None],
+        "amount": [13, 3, 10, None],
+        "len": [2, 1, 3, None],
+        "len_n_rows": [2, 1, 3, None],
+    }
+
+
+def test__raise_ValueError_aggregation_without_one_source():
+    with pytest.raises(ValueError):
+
+        @polars_agg(0, "user_id")
+        def two_sources(self, orders, items):
+            return pl.len()
+
+    with pytest.raises(ValueError):
+        polars_agg(0)
@@ -0,0 +1,140 @@
+from concurrent.futures import ThreadPoolExecutor
+import io
+import json
+
+import polars as pl
+
+from pytred.callbacks import ExecutionCallback
+from pytred.callbacks import JsonLinesExporter
+from pytred.callbacks import PrometheusTextfileExporter
+
+from .fixtures.data_hub import DataHubForServing
+from .fixtures.data_hub import DataHubWithOptionalTable
+
+
+class RecordingCallback(ExecutionCallback):
+    def __init__(self):
+        self.events = []
+
+    def record(self, event):
+        self.events.append(event)
+
+    on_execute_start = record
+    on_execute_end = record
+    on_node_start = record
+    on_node_end = record
+    on_join_start = record
+    on_join_end = record
+    on_cache_hit = record
+    on_skip = record
+
+
+def make_optional_datahub():
+    return DataHubWithOptionalTable(
+        root_df=pl.DataFrame({"id": ["a", "b", "c"]}),
+        table_in1=pl.DataFrame({"id": ["a", "b"], "table_in1": [1, 1]}),
+    )
+
+
+def test__callbacks_receive_events():
+    callback = RecordingCallback()
+    datahub = make_optional_datahub()
+    datahub.add_callback(callback)
+
+    datahub.execute()
+
+    assert [(e.event, e.name) for e in callback.events] == [
+        ("execute_start", None),
+        ("node_start", "table1"),
+        ("node_end", "table1"),
+        ("skip", "table2"),
+        ("skip", "table2_2"),
+        ("join_start", "table1"),
+        ("join_end", "table1"),
+        ("execute_end", None),
+    ]
+    node_end = callback.events[2]
+    assert node_end.hub == "DataHubWithOptionalTable"
+    assert node_end.n_rows == 2
+    assert node_end.size > 0
+    assert node_end.elapsed_seconds >= 0
+    assert callback.events[3].missing_tables == ["table_in2"]
+    assert callback.events[-1].n_rows == 3
+
+
+def test__callbacks_of_class_attribute():
+    callback = RecordingCallback()
+
+    class DataHubWithCallback(DataHubWithOptionalTable):
+        callbacks = [callback]
+
+    DataHubWithCallback(
+        root_df=pl.DataFrame({"id": ["a"]}), table_in1=pl.DataFrame({"id": ["a"]})
+    ).execute()
+
+    assert callback.events[0].event == "execute_start"
+
+
+def test__cache_hit_of_compiled_datahub():
+    datahub = DataHubForServing(
+        pl.DataFrame({"id": ["a"]}),
+        users=pl.DataFrame({"id": ["a", "b"], "score": [1, 2], "active": [True, False]}),
+        blocked=pl.DataFrame({"id": ["b"]}),
+    )
+    compiled = datahub.compile()
+    callback = RecordingCallback()
+    datahub.add_callback(callback)
+
+    compiled(pl.DataFrame({"id": ["a", "b"]}))
+
+    assert [e.name for e in callback.events if e.event == "cache_hit"] == [
+        "active_users",
+        "blocked_users",
+        "user_feature",
+    ]
+    assert [e.name for e in callback.events if e.event == "node_end"] == [
+        "request_feature",
+        "request_feature_2",
+    ]
+
+
+def test__json_lines_exporter():
+    stream = io.StringIO()
+    datahub = make_optional_datahub()
+    datahub.add_callback(JsonLinesExporter(stream))
+
+    datahub.execute()
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(records) == 8
+    assert records[2]["event"] == "node_end"
+    assert records[2]["name"] == "table1"
+    assert records[2]["n_rows"] == 2
+
+
+def test__prometheus_textfile_exporter(tmp_path):
+    path = tmp_path / "pytred.prom"
+    datahub = make_optional_datahub()
+    datahub.add_callback(PrometheusTextfileExporter(path))
+
+    datahub.execute()
+    datahub.execute()
+
+    lines = path.read_text().splitlines()
+    assert "# TYPE pytred_node_rows gauge" in lines
+    assert 'pytred_node_rows{hub="DataHubWithOptionalTable",node="table1"} 2' in lines
+    assert 'pytred_node_skipped{hub="DataHubWithOptionalTable",node="table2"} 1' in lines
+    assert 'pytred_executions_total{hub="DataHubWithOptionalTable"} 2' in lines
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test__prometheus_textfile_exporter_with_concurrent_executions(tmp_path):
+    path = tmp_path / "pytred.prom"
+    datahub = make_optional_datahub()
+    datahub.add_callback(PrometheusTextfileExporter(path))
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda _: datahub.execute(), range(32)))
+
+    assert 'pytred_executions_total{hub="DataHubWithOptionalTable"} 32' in path.read_text()
+    assert list(tmp_path.iterdir()) == [path]
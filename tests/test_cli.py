@@ -1,6 +1,9 @@
+import json
 import pathlib
 import subprocess
+import urllib.request
 
+import polars as pl
 import pytest
 
 import pytred
@@ -22,6 +25,36 @@ def test__cli_make_report():
     _ = result.stdout
 
 
+def test__cli_make_report_without_import(tmp_path):
+    """
+    Check static mode does not import the module and auto mode falls back to import
+    """
+    current_file_path = pathlib.Path(__file__)
+    datahub_file_path = tmp_path / "data_hub.py"
+    datahub_file_path.write_text(
+        "import not_installed_package\n"
+        + (current_file_path.parent / "fixtures" / "data_hub.py").read_text()
+    )
+    cmd = ["pytred", "report", datahub_file_path.as_posix(), "ComplecatedDataHub"]
+    cmd += ["--input-table", '{"name": "input_table1", "keys": ["id"], "join": "left"}']
+
+    for mode in ["auto", "static"]:
+        result = subprocess.run(cmd + ["--mode", mode], stdout=subprocess.PIPE, text=True)
+        assert result.returncode == 0
+        assert "## ComplecatedDataHub" in result.stdout
+    with pytest.raises(subprocess.CalledProcessError):
+        subprocess.run(cmd + ["--mode", "import"], capture_output=True, check=True)
+
+    # NestedDataHub is not resolved statically
+    datahub_file_path = current_file_path.parent / "fixtures" / "data_hub.py"
+    cmd = ["pytred", "report", datahub_file_path.as_posix(), "DataHubWithNestedHub"]
+    cmd += ["--input-table", '{"name": "user_orders"}']
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, text=True, check=True)
+    assert "order_features__order_amount" in result.stdout
+    with pytest.raises(subprocess.CalledProcessError):
+        subprocess.run(cmd + ["--mode", "static"], capture_output=True, check=True)
+
+
 def test__raise_JosnDecodeError_with_invalid_json_str():
 
     current_file_path = pathlib.Path(__file__)
@@ -42,3 +75,37 @@ def test__cli_show_version():
     expected = f"pytred cli {pytred.__version__}\n"
 
     assert actual == expected
+
+
+def test__cli_serve(tmp_path):
+    """
+    Check cli serves requests
+    """
+    users_path = tmp_path / "users.parquet"
+    pl.DataFrame(
+        {"id": ["a", "b"], "score": [1, 2], "active": [True, False]},
+    ).write_parquet(users_path)
+    blocked_path = tmp_path / "blocked.csv"
+    pl.DataFrame({"id": ["b"]}).write_csv(blocked_path)
+
+    current_file_path = pathlib.Path(__file__)
+    datahub_file_path = current_file_path.parent / "fixtures" / "data_hub.py"
+    cmd = ["pytred", "serve", datahub_file_path.as_posix(), "DataHubForServing", "--port", "0"]
+    cmd += ["--input-table", json.dumps({"name": "users", "path": users_path.as_posix()})]
+    cmd += ["--input-table", json.dumps({"name": "blocked", "path": blocked_path.as_posix()})]
+
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    try:
+        url = process.stdout.readline().split(" on ")[-1].strip()
+        request = urllib.request.Request(
+            f"{url}/execute", data=json.dumps([{"id": "a"}, {"id": "b"}]).encode()
+        )
+        with urllib.request.urlopen(request, timeout=10) as response:
+            actual = json.loads(response.read())
+    finally:
+        process.terminate()
+        process.wait()
+
+    assert actual == [
+        {"id": "a", "active": True, "score": 2, "score_user_feature": 2, "score2": 20}
+    ]
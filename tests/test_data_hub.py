@@ -1,12 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import polars as pl
+from polars.testing import assert_frame_equal
 import pytest
 
 from pytred import DataHub
 from pytred import DataNode
+from pytred.callbacks import ExecutionCallback
+from pytred.callbacks import TimingRecorder
 from pytred.data_node import DataflowNode
+from pytred.exceptions import JoinFanoutError
 from pytred.exceptions import TableNotFoundError
+from pytred.helpers.sampling import sample_by_keys
 
+from .fixtures.data_hub import DataHubWithGroupByTables
+from .fixtures.data_hub import DataHubWithLargeIntermediate
 from .fixtures.data_hub import DataHubWithOptionalTable
+from .fixtures.data_hub import DataHubWithOrderedJoins
 
 
 def test__initialize():
@@ -240,3 +250,162 @@ def test__search_table(inputs_visualize_test):
     expected[9].add_child(expected[10])
 
     assert actual == expected
+
+
+def test__compact_dtypes(basic_datahub):
+    """
+    Test dtypes are compacted before joins
+    """
+    basic_datahub.compact_dtypes = True
+    actual_result = basic_datahub()
+
+    assert actual_result["col1"].dtype == pl.Int8
+    assert actual_result["id"].dtype == pl.Enum(["a", "b", "c"])
+    assert actual_result.cast(basic_datahub.expected_result_table.schema).equals(
+        basic_datahub.expected_result_table
+    )
+    assert set(basic_datahub.compaction_report.keys()) == {
+        "root_df",
+        "input_table2",
+        "table1",
+        "table2",
+        "table1_2",
+    }
+    # tables created by functions are not modified
+    assert basic_datahub.get("table1").table["col1"].dtype == pl.Int64
+
+
+def test__surrogate_keys_returns_same_result(composite_key_datahub):
+    expected = composite_key_datahub()
+
+    composite_key_datahub.surrogate_keys = True
+    actual = composite_key_datahub()
+
+    assert_frame_equal(actual, expected, check_row_order=False)
+
+
+def test__coalesce_joins_returns_same_result():
+    """
+    Test consecutive joins with the same join type and keys are coalesced
+    """
+    datahub = DataHubWithGroupByTables(
+        pl.DataFrame({"user_id": [1, 2, 3]}),
+        orders=pl.DataFrame({"user_id": [1, 1, 2], "item_id": [1, 2, 1], "amount": [1, 2, 3]}),
+    )
+    datahub.coalesce_joins = False
+    expected = datahub()
+
+    class JoinRecorder(ExecutionCallback):
+        joins: list[str] = []
+
+        def on_join_end(self, event):
+            self.joins.append(event.name)
+
+    datahub.add_callback(JoinRecorder())
+    datahub.coalesce_joins = True
+    actual = datahub()
+
+    assert_frame_equal(actual, expected, check_row_order=False)
+    assert JoinRecorder.joins == ["order_amount,order_count", "first_item", "n_items"]
+
+
+def test__fanout_policy(composite_key_datahub):
+    """
+    Test joins with duplicated keys are checked by fan-out policies
+    """
+    assert DataHub.fanout_policies is None
+    composite_key_datahub.default_fanout_policy = 1.5
+    with pytest.raises(JoinFanoutError):
+        composite_key_datahub()
+
+    composite_key_datahub.default_fanout_policy = None
+    composite_key_datahub.fanout_policies = {"table3": 1.5}
+    with pytest.raises(JoinFanoutError):
+        composite_key_datahub()
+    assert composite_key_datahub.fanout_report["table3"].fanout == 2.0
+
+    composite_key_datahub.fanout_policies = {"table3": "warn"}
+    composite_key_datahub.default_fanout_policy = "raise"
+    composite_key_datahub()
+    assert composite_key_datahub.fanout_report["table1"].fanout == 1.0
+
+
+def test__execute_with_sample(composite_key_datahub):
+    """
+    Test root_df and input tables are sampled by the same keys
+    """
+    table_in = composite_key_datahub.get("table_in")
+    expected = composite_key_datahub()
+
+    actual = composite_key_datahub.execute(sample=0.3, sample_keys=["user_id"])
+
+    sampled_ids = sample_by_keys(
+        composite_key_datahub.root_df.select("user_id").unique(), ["user_id"], 0.3
+    )
+    assert 0 < len(actual) < len(expected)
+    assert_frame_equal(
+        actual,
+        expected.join(sampled_ids, on="user_id", how="semi"),
+        check_row_order=False,
+    )
+    # input tables are restored
+    assert composite_key_datahub.get("table_in") is table_in
+    with pytest.raises(ValueError):
+        composite_key_datahub.execute(sample=0.5, sample_keys=["unknown"])
+
+
+def test__concurrent_execute_on_shared_datahub():
+    """
+    Test concurrent calls of execute on the same DataHub do not interfere
+    """
+    source = pl.DataFrame({"id": range(1000), "value": range(1000)})
+    datahub = DataHubWithLargeIntermediate(source.select("id"), source=source)
+    recorder = TimingRecorder()
+    datahub.add_callback(recorder)
+    # samples of different fractions create different tables per call
+    fractions = [0.2, 0.4, 0.6, 0.8] * 6
+    expected = [datahub.execute(sample=f, sample_keys=["id"]) for f in fractions]
+    assert len({df.height for df in expected}) == 4
+
+    with ThreadPoolExecutor(8) as executor:
+        actual = list(
+            executor.map(lambda f: datahub.execute(sample=f, sample_keys=["id"]), fractions)
+        )
+
+    for actual_df, expected_df in zip(actual, expected):  # noqa: B905
+        assert_frame_equal(actual_df, expected_df)
+    # input tables are shared without copies
+    assert datahub.get("source").table is source
+    assert set(datahub.tables) == set(datahub.table_order)
+    # timings of concurrent calls are not mixed
+    assert set(recorder.timings) == {"intermediate", "feature1", "feature2"}
+
+
+def test__ordered_joins():
+    """
+    Test 'asof' and 'range' joins of tables
+    """
+    datahub = DataHubWithOrderedJoins(
+        pl.DataFrame({"item_id": [1, 2, 1], "timestamp": [25, 12, 5]}),
+        prices=pl.DataFrame(
+            {"item_id": [1, 1, 2], "timestamp": [20, 10, 30], "price": [20, 10, 40]}
+        ),
+        campaigns=pl.DataFrame(
+            {"item_id": [1, 2], "start": [0, 0], "end": [30, 10], "campaign": ["a", "b"]}
+        ),
+    )
+
+    actual = datahub()
+
+    expected = pl.DataFrame(
+        {
+            "item_id": [1, 1],
+            "timestamp": [25, 5],
+            "price": [20, None],
+            "start": [0, 0],
+            "end": [30, 30],
+            "campaign": ["a", "a"],
+        }
+    )
+    assert_frame_equal(actual, expected, check_row_order=False)
+    assert datahub.dry_run().output_schema == actual.schema
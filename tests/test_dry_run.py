@@ -0,0 +1,67 @@
+import polars as pl
+import pytest
+
+from pytred.exceptions import SchemaMismatchError
+
+from .fixtures.data_hub import DataHubWithOptionalTable
+from .fixtures.data_hub import DataHubWithSchemaIssues
+
+
+def test__dry_run_valid_datahub(basic_datahub):
+    report = basic_datahub.dry_run()
+
+    assert report.is_valid
+    assert report.output_schema == basic_datahub.expected_result_table.schema
+    assert report.schemas["table1_2"] == pl.Schema({"id": pl.String, "col1_2": pl.Int64})
+
+    # tables are not replaced by dry run
+    assert set(basic_datahub.tables.keys()) == {"input_table2"}
+
+
+def test__dry_run_skip_optional_table():
+    dh = DataHubWithOptionalTable(
+        root_df=pl.DataFrame({"id": ["a", "b", "c"]}),
+        table_in1=pl.DataFrame({"id": ["a", "b", "c"], "table_in1": [1, 1, 1]}),
+    )
+    report = dh.dry_run()
+
+    assert report.is_valid
+    assert report.skipped == ["table2", "table2_2"]
+    assert report.output_schema.names() == ["id", "table_in1"]
+
+
+def test__dry_run_reports_issues():
+    dh = DataHubWithSchemaIssues(
+        pl.DataFrame({"id": ["a", "b"]}),
+        table_in1=pl.DataFrame({"id": ["a", "b"], "value": [1, 2]}),
+    )
+    report = dh.dry_run()
+
+    actual = {(issue.table, issue.kind, issue.severity) for issue in report.issues}
+    expected = {
+        ("table1_2", "suffix_applied", "warning"),
+        ("table_unknown_key", "missing_key", "error"),
+        ("table_unknown_column", "function_error", "error"),
+    }
+    assert actual == expected
+    assert report.output_schema is None
+
+    with pytest.raises(SchemaMismatchError):
+        report.raise_for_errors()
+
+
+def test__dry_run_reports_key_dtype_mismatch_and_suffix_collision(basic_datahub):
+    basic_datahub.root_df = pl.DataFrame({"id": [1, 2, 3]})
+    report = basic_datahub.dry_run()
+
+    assert [(issue.table, issue.kind) for issue in report.errors] == [
+        ("input_table2", "key_dtype_mismatch")
+    ]
+
+    dh = DataHubWithSchemaIssues(
+        pl.DataFrame({"id": ["a", "b"], "value": [1, 2], "value_table1": [1, 2]}),
+        table_in1=pl.DataFrame({"id": ["a", "b"], "value": [1, 2]}),
+    )
+    report = dh.dry_run()
+
+    assert ("table1", "suffix_collision") in [(issue.table, issue.kind) for issue in report.errors]
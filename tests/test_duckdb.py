@@ -0,0 +1,113 @@
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+from pytred.data_node import DataNode
+from pytred.decorators import duckdb_table
+from pytred.decorators import table
+from pytred.exceptions import InvalidReturnValueError
+from pytred.helpers.decorator import get_metadata
+
+from .fixtures.data_hub import DataHubWithDuckDB
+
+
+duckdb = pytest.importorskip("duckdb")
+
+
+@pytest.fixture
+def duckdb_datahub():
+    root_df = pl.DataFrame({"id": ["a", "b", "c", "d", "e"], "score": [1, 2, 3, 4, 5]})
+    return DataHubWithDuckDB(
+        root_df,
+        orders=pl.DataFrame({"id": ["a", "a", "b", "c", "d", "e"], "amount": [1, 2, 3, 4, 5, 1]}),
+        users=pl.DataFrame({"id": ["a", "b", "c", "d", "e"], "score": [9, 8, 7, 6, 5]}),
+        blocked=pl.DataFrame({"id": ["b"]}),
+    )
+
+
+def test__execute_datahub_with_duckdb_tables(duckdb_datahub):
+    actual = duckdb_datahub.execute()
+    expected = pl.DataFrame(
+        {
+            "id": ["a", "c", "d"],
+            "score": [1, 3, 4],
+            "amount": [3, 4, 5],
+            "n_orders": [2, 1, 1],
+            "score_user_score": [9, 7, 6],
+            "rank": [3, 2, 1],
+            "score_amount_rank": [9, 7, 6],
+        }
+    )
+
+    assert_frame_equal(actual, expected, check_row_order=False)
+    assert duckdb_datahub.tables["amount"].engine == "duckdb"
+    assert duckdb_datahub.tables["user_score"].engine == "polars"
+
+
+@pytest.mark.parametrize("join", ["inner", "left", "semi", "anti"])
+def test__duckdb_join_is_same_as_polars_join(join):
+    from pytred.helpers.duckdb_join import join_with_duckdb
+
+    df = pl.DataFrame({"id": [3, 1, None, 2], "value": ["x", "y", "z", "w"]})
+    nodes = [
+        DataNode(
+            pl.DataFrame({"id": [1, 2, None], "value": [10, 20, 30]}),
+            keys=["id"],
+            join=join,  # type: ignore[arg-type]
+            name="t1",
+        ),
+        DataNode(
+            pl.DataFrame({"id": [2, 3], "other": [True, False]}),
+            keys=["id"],
+            join="left",
+            name="t2",
+        ),
+    ]
+
+    expected = df
+    for node in nodes:
+        expected = expected.join(
+            node.table, on=node.keys, how=node.join, suffix=f"_{node.name}", maintain_order="left"
+        )
+
+    assert_frame_equal(join_with_duckdb(df, nodes), expected)
+
+
+def test__duckdb_cross_join():
+    from pytred.helpers.duckdb_join import join_with_duckdb
+
+    df = pl.DataFrame({"id": [1, 2]})
+    node = DataNode(pl.DataFrame({"x": ["a", "b"]}), keys=None, join="cross", name="t")
+
+    assert_frame_equal(
+        join_with_duckdb(df, [node]), df.join(node.table, how="cross"), check_row_order=False
+    )
+
+
+def test__duckdb_table_accepts_relation():
+    @duckdb_table(0, "id", join="left")
+    def prep_function(df):
+        return df.filter("number > 1")
+
+    actual = prep_function(pl.DataFrame({"id": ["a", "b", "c"], "number": [1, 2, 3]}))
+
+    assert_frame_equal(actual, pl.DataFrame({"id": ["b", "c"], "number": [2, 3]}))
+
+
+def test__duckdb_table_raise_InvalidReturnValueError():
+    @duckdb_table(0, "id", join="left")
+    def prep_function(df):
+        return df.pl()
+
+    with pytest.raises(InvalidReturnValueError):
+        prep_function(pl.DataFrame({"id": ["a"]}))
+
+
+def test__table_with_engine():
+    @table("duckdb", 0, "id", join="left")
+    def prep_function():
+        return "SELECT 1 AS id"
+
+    assert get_metadata(prep_function, "engine") == "duckdb"
+    with pytest.raises(ValueError):
+        table("spark", 0, "id", join="left")  # type: ignore[arg-type]
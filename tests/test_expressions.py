@@ -0,0 +1,116 @@
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+from pytred import DataHub
+from pytred.callbacks import ExecutionCallback
+from pytred.decorators.polars import polars_expr
+from pytred.exceptions import InvalidReturnValueError
+from pytred.nested import NestedDataHub
+
+from .fixtures.data_hub import DataHubWithExpressions
+from .fixtures.data_hub import DataHubWithJoinedFeatures
+
+
+@pytest.fixture
+def expression_inputs():
+    return {
+        "root_df": pl.DataFrame({"id": ["a", "b", "c", "d"], "price": [0, 500, 2000, 1500]}),
+        "items": pl.DataFrame({"id": ["a", "b", "c"], "name": ["x", "y", "z"]}),
+        "thresholds": pl.DataFrame({"price": [1000]}),
+    }
+
+
+class EventRecorder(ExecutionCallback):
+    def __init__(self):
+        self.events = []
+
+    def on_node_end(self, event):
+        self.events.append(("node_end", event.name))
+
+    def on_join_end(self, event):
+        self.events.append(("join_end", event.name))
+
+
+def test__expressions_return_same_result_as_joins(expression_inputs):
+    expected = DataHubWithJoinedFeatures(**expression_inputs)()
+    actual = DataHubWithExpressions(**expression_inputs)()
+
+    assert_frame_equal(actual, expected, check_column_order=False)
+
+
+def test__expressions_are_fused_into_one_with_columns(expression_inputs):
+    recorder = EventRecorder()
+    datahub = DataHubWithExpressions(**expression_inputs)
+    datahub.add_callback(recorder)
+    datahub.execute()
+
+    joins = [name.split(",") for event, name in recorder.events if event == "join_end"]
+    assert len(joins) == 2
+    assert sorted(joins[0]) == ["price_flags", "price_rank", "price_with_tax"]
+    assert joins[0][-1] == "price_rank"
+    assert joins[1] == ["item_name"]
+    nodes = [name for event, name in recorder.events if event == "node_end"]
+    assert sorted(nodes) == ["item_name", "price_flags", "price_rank", "price_with_tax"]
+
+
+def test__compiled_datahub_evaluates_expressions(expression_inputs):
+    root_df = expression_inputs.pop("root_df")
+    expected = DataHubWithExpressions(root_df, **expression_inputs)()
+
+    compiled = DataHubWithExpressions(root_df.head(1), **expression_inputs).compile()
+
+    assert_frame_equal(compiled(root_df), expected)
+
+
+def test__dry_run_with_expressions(expression_inputs):
+    datahub = DataHubWithExpressions(**expression_inputs)
+    report = datahub.dry_run()
+
+    assert report.is_valid
+    assert report.schemas["price_flags"] == pl.Schema(
+        {"is_expensive": pl.Boolean, "is_free": pl.Boolean}
+    )
+    assert report.output_schema == datahub().schema
+
+
+def test__dry_run_reports_invalid_expression(expression_inputs):
+    class DataHubWithInvalidExpression(DataHub):
+        @polars_expr(0)
+        def discount(self):
+            return pl.col("discount") * 2
+
+    report = DataHubWithInvalidExpression(expression_inputs["root_df"]).dry_run()
+
+    assert [(issue.table, issue.kind) for issue in report.issues] == [
+        ("discount", "expression_error")
+    ]
+    assert report.output_schema is None
+
+
+@pytest.mark.parametrize("value", [pl.lit(1), [pl.lit(1)], {"one": pl.lit(1)}])
+def test__expression_function_return_values(value):
+    class DataHubWithExpression(DataHub):
+        @polars_expr(0)
+        def one(self):
+            return value
+
+    df = DataHubWithExpression(pl.DataFrame({"id": [1, 2]}))()
+
+    assert df["literal" if not isinstance(value, dict) else "one"].to_list() == [1, 1]
+
+
+@pytest.mark.parametrize("value", [pl.DataFrame({"id": [1]}), [pl.lit(1), 1], None])
+def test__raise_InvalidReturnValueError_expression_function(value):
+    class DataHubWithInvalidExpression(DataHub):
+        @polars_expr(0)
+        def invalid(self):
+            return value
+
+    with pytest.raises(InvalidReturnValueError):
+        DataHubWithInvalidExpression(pl.DataFrame({"id": [1, 2]}))()
+
+
+def test__raise_ValueError_nesting_datahub_with_expressions():
+    with pytest.raises(ValueError):
+        NestedDataHub(DataHubWithExpressions, 0, "id", join="left")
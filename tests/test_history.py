@@ -0,0 +1,117 @@
+from concurrent.futures import ThreadPoolExecutor
+import subprocess
+
+import polars as pl
+import pytest
+
+from pytred.callbacks import ExecutionEvent
+from pytred.history import HistoryRecorder
+from pytred.history import PerformanceHistory
+
+from .fixtures.data_hub import DataHubWithOptionalTable
+
+
+def record_run(recorder, node_seconds, node_size, hub="Hub"):
+    recorder.on_execute_start(ExecutionEvent("execute_start", hub))
+    recorder.on_node_end(
+        ExecutionEvent(
+            "node_end", hub, "table1", elapsed_seconds=node_seconds, n_rows=10, size=node_size
+        )
+    )
+    recorder.on_node_end(
+        ExecutionEvent("node_end", hub, "table2", elapsed_seconds=0.001, n_rows=10, size=100)
+    )
+    recorder.on_join_end(
+        ExecutionEvent("join_end", hub, "table1", elapsed_seconds=0.5, n_rows=10, size=1000)
+    )
+    recorder.on_execute_end(ExecutionEvent("execute_end", hub, elapsed_seconds=1.0, n_rows=10))
+
+
+def test__record_executions(tmp_path):
+    path = tmp_path / "history.sqlite"
+    datahub = DataHubWithOptionalTable(
+        root_df=pl.DataFrame({"id": ["a", "b", "c"]}),
+        table_in1=pl.DataFrame({"id": ["a", "b"], "table_in1": [1, 1]}),
+    )
+    datahub.add_callback(HistoryRecorder(path, label="v1"))
+
+    datahub.execute()
+    datahub.execute()
+
+    history = PerformanceHistory(path)
+    runs = history.runs("DataHubWithOptionalTable")
+    assert runs["run_id"].to_list() == [1, 2]
+    assert runs["label"].to_list() == ["v1", "v1"]
+    assert runs["n_rows"].to_list() == [3, 3]
+    nodes = history.nodes(2)
+    assert nodes.select("name", "kind", "n_rows").rows() == [
+        ("table1", "node", 2),
+        ("table1", "join", 3),
+    ]
+    assert history.runs("OtherHub").height == 0
+
+
+def test__record_concurrent_executions(tmp_path):
+    path = tmp_path / "history.sqlite"
+    datahub = DataHubWithOptionalTable(
+        root_df=pl.DataFrame({"id": ["a", "b", "c"]}),
+        table_in1=pl.DataFrame({"id": ["a", "b"], "table_in1": [1, 1]}),
+    )
+    datahub.add_callback(HistoryRecorder(path))
+
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(lambda _: datahub.execute(), range(8)))
+
+    history = PerformanceHistory(path)
+    # each run has its own node and join
+    for run_id in history.runs("DataHubWithOptionalTable")["run_id"]:
+        assert history.nodes(run_id)["kind"].to_list() == ["node", "join"]
+
+
+def test__compare_with_baseline(tmp_path):
+    path = tmp_path / "history.sqlite"
+    recorder = HistoryRecorder(path)
+    for seconds in [1.0, 1.1, 0.9, 5.0, 1.0]:
+        record_run(recorder, seconds, 1000)
+    history = PerformanceHistory(path)
+
+    # the median of the baseline is robust to the noisy run 4
+    report = history.compare("Hub")
+    assert report.run_id == 5
+    assert report.baseline_run_ids == [1, 2, 3, 4]
+    assert not report.has_regressions
+
+    record_run(recorder, 1.5, 2000)
+    record_run(recorder, 10.0, 1000, hub="OtherHub")
+    report = history.compare("Hub", baseline_runs=3)
+    assert report.baseline_run_ids == [3, 4, 5]
+    assert [(r.name, r.kind, r.metric) for r in report.regressions] == [
+        ("table1", "node", "elapsed_seconds"),
+        ("table1", "node", "size"),
+    ]
+    assert report.regressions[0].ratio == pytest.approx(1.5)
+    assert "table1: elapsed_seconds 1 -> 1.5 (x1.50)" in report.summary()
+
+    report = history.compare("Hub", baseline=1, time_threshold=0.6, size_threshold=1.0)
+    assert not report.has_regressions
+
+    with pytest.raises(ValueError):
+        history.compare("Hub", run_id=1)
+    with pytest.raises(ValueError):
+        history.compare("UnknownHub")
+
+
+def test__cli_history_compare(tmp_path):
+    path = tmp_path / "history.sqlite"
+    recorder = HistoryRecorder(path)
+    record_run(recorder, 1.0, 1000)
+    record_run(recorder, 1.0, 1000)
+    cmd = ["pytred", "history-compare", path.as_posix(), "Hub"]
+
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, text=True, check=True)
+    assert result.stdout.startswith("Hub: run 2 vs baseline runs [1], 0 regressions")
+
+    record_run(recorder, 2.0, 1000)
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, text=True)
+    assert result.returncode == 1
+    assert "node table1: elapsed_seconds" in result.stdout
@@ -0,0 +1,90 @@
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+from pytred import DataHub
+from pytred.decorators.polars import TableOutput
+from pytred.decorators.polars import polars_tables
+from pytred.exceptions import InvalidReturnValueError
+
+from .fixtures.data_hub import DataHubWithMultipleOutputs
+
+
+@pytest.fixture
+def order_inputs():
+    return {
+        "root_df": pl.DataFrame({"user_id": [1, 2, 3]}),
+        "orders": pl.DataFrame(
+            {
+                "user_id": [1, 1, 2, 3, 3],
+                "item_id": [10, 11, 10, 12, 12],
+                "amount": [5, 8, 1, 6, 7],
+            }
+        ),
+    }
+
+
+def test__tables_of_multiple_outputs(order_inputs, monkeypatch):
+    calls = []
+    order_tables = DataHubWithMultipleOutputs.order_tables
+
+    def recording_order_tables(self, orders):
+        calls.append(orders.height)
+        return order_tables(self, orders)
+
+    monkeypatch.setattr(DataHubWithMultipleOutputs, "order_tables", recording_order_tables)
+    datahub = DataHubWithMultipleOutputs(**order_inputs)
+    df = datahub()
+
+    # the function is executed once for both tables
+    assert calls == [5]
+    expected = pl.DataFrame(
+        {
+            "user_id": [1, 2, 3],
+            "total_amount": [13, None, 13],
+            "n_large_orders": pl.Series([2, None, 2], dtype=pl.UInt32),
+        }
+    )
+    assert_frame_equal(df, expected, check_row_order=False)
+    assert datahub.get("order_amount").keys == ("user_id",)
+    assert "order_tables" not in datahub.table_order
+
+
+def test__call_output_function_directly(order_inputs):
+    datahub = DataHubWithMultipleOutputs(**order_inputs)
+
+    table = datahub.order_amount(order_inputs["orders"])
+
+    assert table.columns == ["user_id", "total_amount"]
+
+
+def test__dry_run_with_multiple_outputs(order_inputs):
+    datahub = DataHubWithMultipleOutputs(**order_inputs)
+    report = datahub.dry_run()
+
+    assert report.is_valid
+    assert report.output_schema == datahub().schema
+
+
+def test__raise_InvalidReturnValueError_missing_output(order_inputs):
+    class DataHubWithMissingOutput(DataHub):
+        @polars_tables(0, a=TableOutput(("user_id",), join="left"), b=TableOutput())
+        def split_orders(self, orders):
+            return {"a": orders}
+
+    with pytest.raises(InvalidReturnValueError):
+        DataHubWithMissingOutput(**order_inputs)()
+
+
+def test__raise_ValueError_invalid_outputs():
+    with pytest.raises(ValueError):
+        polars_tables(0)
+
+    with pytest.raises(ValueError):
+        polars_tables(0, a=TableOutput(join="left"))
+
+    with pytest.raises(ValueError):
+
+        @polars_tables(0, tables=TableOutput())
+        def tables(self, orders):
+            return {"tables": orders}
@@ -0,0 +1,76 @@
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+from pytred import DataHub
+from pytred import DataNode
+from pytred.nested import NestedDataHub
+
+from .fixtures.data_hub import DataHubWithMultipleOutputs
+from .fixtures.data_hub import DataHubWithNestedHub
+from .fixtures.data_hub import OrderFeatureHub
+
+
+@pytest.fixture
+def orders():
+    return pl.DataFrame({"user_id": [1, 1, 2, 4], "amount": [5, 8, 3, 1]})
+
+
+def test__functions_of_nested_datahub_are_fused():
+    assert DataHubWithNestedHub.registerd_tables_order == {
+        "users": 0,
+        "order_features__order_amount": 1,
+        "order_features__order_count": 1,
+        "order_features__coupon": 2,
+        "order_features": 3,
+        "large_amount": 4,
+    }
+    assert DataHubWithNestedHub.table_join_info["order_features__order_amount"] is None
+    assert DataHubWithNestedHub.table_join_info["order_features"] == "left"
+    # tables of the nested DataHub which do not depend on its root are cached by compile()
+    assert DataHubWithNestedHub.get_root_dependent_tables() == {"users", "order_features"}
+
+
+@pytest.mark.parametrize("has_coupons", [True, False])
+def test__nested_datahub_returns_same_result_as_materialized_datahub(orders, has_coupons):
+    root_df = pl.DataFrame({"user_id": [1, 2, 3, 1]})
+    tables = {"coupons": pl.DataFrame({"user_id": [2], "coupon": ["x"]})} if has_coupons else {}
+
+    actual = DataHubWithNestedHub(root_df, user_orders=orders, **tables)()
+
+    inner_result = OrderFeatureHub(root_df.select("user_id").unique(), orders=orders, **tables)()
+    expected = root_df.join(inner_result, on="user_id", how="left").with_columns(
+        is_large=pl.col("amount") > 10
+    )
+    assert_frame_equal(actual, expected, check_row_order=False)
+
+
+def test__raise_ValueError_nesting_datahub_without_functions():
+    class EmptyHub(DataHub):
+        pass
+
+    with pytest.raises(ValueError):
+        NestedDataHub(EmptyHub, 0, "id", join="left")
+
+
+def test__nested_datahub_node_is_data_node(orders):
+    datahub = DataHubWithNestedHub(pl.DataFrame({"user_id": [1]}), user_orders=orders)
+    datahub()
+
+    assert isinstance(datahub.get("order_features__order_count"), DataNode)
+    assert datahub.get("order_features").keys == ("user_id",)
+
+
+def test__nested_datahub_with_multiple_outputs(orders):
+    class DataHubWithNestedOutputs(DataHub):
+        order_tables = NestedDataHub(
+            DataHubWithMultipleOutputs, 0, "user_id", join="left", tables={"orders": "user_orders"}
+        )
+
+    root_df = pl.DataFrame({"user_id": [1, 2, 3]})
+    orders = orders.with_columns(item_id=pl.Series([10, 11, 10, 12]))
+
+    actual = DataHubWithNestedOutputs(root_df, user_orders=orders)()
+
+    expected = DataHubWithMultipleOutputs(root_df, orders=orders)()
+    assert_frame_equal(actual, expected, check_row_order=False)
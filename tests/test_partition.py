@@ -0,0 +1,142 @@
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+from pytred import partition
+from pytred.data_node import DataNode
+from pytred.partition import hash_partition
+from pytred.partition import plan_partitioned_execution
+
+from .fixtures.data_hub import DataHubWithKeyLocalTables
+
+
+@pytest.fixture
+def key_local_datahub():
+    return DataHubWithKeyLocalTables(
+        pl.DataFrame({"user_id": [1, 2, 3, 4, 5, 1], "name": ["a", "b", "c", "d", "e", "f"]}),
+        orders=pl.DataFrame(
+            {
+                "user_id": [1, 1, 2, 3, 3, 3, 5],
+                "item_id": [10, 11, 10, 12, 10, 11, 12],
+                "amount": [1, 2, 3, 4, 5, 6, 7],
+            }
+        ),
+        items=pl.DataFrame({"item_id": [10, 11, 12], "price": [100, 200, 300]}),
+    )
+
+
+def test__hash_partition():
+    df = pl.DataFrame(
+        {"id1": [1, 2, 3, 1, 2, 3, None], "id2": ["a", "a", "b", "a", "a", "b", "c"]}
+    )
+    partitions = hash_partition(df, ["id1", "id2"], 3)
+
+    assert len(partitions) == 3
+    assert sum(len(partition) for partition in partitions) == len(df)
+    # the same keys are in the same partition
+    partition_ids = pl.concat(
+        [partition.with_columns(partition_id=pl.lit(i)) for i, partition in enumerate(partitions)]
+    )
+    assert (
+        partition_ids.group_by("id1", "id2").agg(pl.col("partition_id").n_unique())["partition_id"]
+        == 1
+    ).all()
+    assert [len(p) for p in partitions] == [
+        len(p) for p in hash_partition(df.reverse(), ["id1", "id2"], 3)
+    ]
+
+
+def test__plan_partitioned_execution(key_local_datahub):
+    local_names, global_names = plan_partitioned_execution(key_local_datahub)
+
+    # large_orders is used by large_order_total executed once
+    assert local_names == ["user_amount", "user_spend", "active_users"]
+    assert global_names == ["large_orders", "large_order_total"]
+
+
+def test__execute_partitioned_returns_same_result(key_local_datahub):
+    expected = key_local_datahub.execute()
+    actual = key_local_datahub.execute_partitioned(keys=["user_id"], n_partitions=2)
+
+    assert_frame_equal(actual, expected, check_row_order=False)
+
+
+def test__execute_partitioned_with_table_joined_on_other_keys(key_local_datahub):
+    # item_owners has the partition column but is joined on item_id
+    datahub = DataHubWithKeyLocalTables(
+        key_local_datahub.root_df.with_columns(item_id=pl.Series([10, 11, 12, 10, 11, 12])),
+        DataNode(
+            pl.DataFrame(
+                {"item_id": [10, 11, 12], "user_id": [5, 4, 3], "owner": ["x", "y", "z"]}
+            ),
+            keys=["item_id"],
+            join="left",
+            name="item_owners",
+        ),
+        orders=key_local_datahub.get("orders").table,
+        items=key_local_datahub.get("items").table,
+    )
+    expected = datahub.execute()
+    actual = datahub.execute_partitioned(keys=["user_id"], n_partitions=3)
+
+    assert_frame_equal(actual, expected, check_row_order=False)
+
+
+def test__execute_partitioned_with_right_join_split_by_partition_keys(key_local_datahub):
+    datahub = DataHubWithKeyLocalTables(
+        key_local_datahub.root_df,
+        DataNode(
+            pl.DataFrame({"user_id": [1, 3, 6, 7], "segment": ["x", "y", "z", "w"]}),
+            keys=["user_id"],
+            join="full",
+            name="segments",
+        ),
+        orders=key_local_datahub.get("orders").table,
+        items=key_local_datahub.get("items").table,
+    )
+    expected = datahub.execute()
+    actual = datahub.execute_partitioned(keys=["user_id"], n_partitions=3)
+
+    assert_frame_equal(actual, expected, check_row_order=False)
+
+
+@pytest.mark.parametrize("join", ["right", "full"])
+def test__raise_ValueError_with_shared_right_join(key_local_datahub, join):
+    # unmatched rows of item_owners would be in the result once per partition
+    datahub = DataHubWithKeyLocalTables(
+        key_local_datahub.root_df.with_columns(item_id=pl.Series([10, 11, 12, 10, 11, 12])),
+        DataNode(
+            pl.DataFrame({"item_id": [10, 13], "owner": ["x", "y"]}),
+            keys=["item_id"],
+            join=join,
+            name="item_owners",
+        ),
+        orders=key_local_datahub.get("orders").table,
+        items=key_local_datahub.get("items").table,
+    )
+
+    with pytest.raises(ValueError):
+        datahub.execute_partitioned(keys=["user_id"], n_partitions=3)
+
+
+def test__execute_partitioned_does_not_reuse_tables_of_previous_execution(
+    key_local_datahub, monkeypatch
+):
+    key_local_datahub.execute()
+    split_tables = []
+
+    def record_split_tables(tables, keys, n_partitions):
+        split_tables.append(set(tables))
+        raise RuntimeError("stop before starting workers")
+
+    monkeypatch.setattr(partition, "split_tables", record_split_tables)
+    with pytest.raises(RuntimeError):
+        key_local_datahub.execute_partitioned(keys=["user_id"], n_partitions=2)
+
+    # key-local functions are executed by workers from partitions of input tables
+    assert split_tables == [{"orders", "items", "large_orders", "large_order_total"}]
+
+
+def test__raise_ValueError_without_partition_keys(key_local_datahub):
+    with pytest.raises(ValueError):
+        key_local_datahub.execute_partitioned(keys=["item_id"], n_partitions=2)
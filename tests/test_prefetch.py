@@ -0,0 +1,123 @@
+import pickle
+import threading
+
+import polars as pl
+import pytest
+
+from pytred.prefetch import FileDataNode
+from pytred.prefetch import PrefetchingTableStore
+from pytred.prefetch import read_table
+from pytred.prefetch import read_table_schema
+from pytred.spill import SpillableTableStore
+
+from .fixtures.data_hub import DataHubForServing
+
+
+@pytest.fixture
+def input_files(tmp_path):
+    users = pl.DataFrame(
+        {"id": ["a", "b", "c"], "score": [1, 2, 3], "active": [True, False, True]}
+    )
+    blocked = pl.DataFrame({"id": ["c"]})
+    users.write_parquet(tmp_path / "users.parquet")
+    blocked.write_csv(tmp_path / "blocked.csv")
+    return {"users": users, "blocked": blocked}, [
+        FileDataNode(tmp_path / "users.parquet", keys=None, join=None, name="users"),
+        FileDataNode(tmp_path / "blocked.csv", keys=None, join=None, name="blocked"),
+    ]
+
+
+def test__read_table(tmp_path):
+    df = pl.DataFrame({"id": ["a", "b"], "value": [1, 2]})
+    for suffix, write in [
+        (".parquet", df.write_parquet),
+        (".csv", df.write_csv),
+        (".arrow", df.write_ipc),
+        (".ndjson", df.write_ndjson),
+    ]:
+        write(tmp_path / f"table{suffix}")
+        assert read_table(tmp_path / f"table{suffix}").equals(df)
+
+        assert read_table_schema(tmp_path / f"table{suffix}") == df.schema
+
+    with pytest.raises(ValueError):
+        read_table(tmp_path / "table.txt")
+
+
+@pytest.mark.parametrize("memory_limit", [None, 1])
+def test__execute_with_file_inputs(input_files, memory_limit):
+    tables, file_nodes = input_files
+    root_df = pl.DataFrame({"id": ["a", "b", "c"]})
+    expected = DataHubForServing(root_df, **tables).execute()
+
+    datahub = DataHubForServing(root_df, *file_nodes)
+    assert isinstance(datahub.tables, PrefetchingTableStore)
+    assert datahub.tables.unread_tables == ["users", "blocked"]
+
+    actual = datahub.execute(memory_limit=memory_limit)
+
+    assert actual.equals(expected)
+    assert datahub.tables.unread_tables == []
+    assert datahub.get("users").table.equals(tables["users"])
+    if memory_limit is not None:
+        assert isinstance(datahub.tables.inner, SpillableTableStore)
+
+
+def test__dry_run_with_file_inputs_without_reading_files(input_files):
+    tables, file_nodes = input_files
+    root_df = pl.DataFrame({"id": ["a", "b", "c"]})
+    expected = DataHubForServing(root_df, **tables).dry_run()
+
+    datahub = DataHubForServing(root_df, *file_nodes)
+    report = datahub.dry_run()
+
+    assert report.output_schema == expected.output_schema
+    assert report.schemas["users"] == tables["users"].schema
+    assert datahub.tables.unread_tables == ["users", "blocked"]
+
+
+def test__prefetch_in_order_under_memory_limit(input_files):
+    tables, file_nodes = input_files
+    read_names = []
+    started = threading.Event()
+
+    class RecordingFileDataNode(FileDataNode):
+        def read(self):
+            read_names.append(self.name)
+            started.set()
+            return super().read()
+
+    store = PrefetchingTableStore(memory_limit=1, max_workers=2)
+    for node in file_nodes:
+        store[node.name] = RecordingFileDataNode(node.path, node.keys, node.join, node.name)
+    store["other"] = FileDataNode(file_nodes[0].path, keys=None, join=None, name="other")
+
+    store.start(["blocked", "users"])
+    started.wait(timeout=10)
+    # only one table is read ahead at once since the memory limit is small
+    assert list(store._futures) == ["blocked"]
+    assert store["blocked"].table.equals(tables["blocked"])
+    # the next table is read ahead after the previous one is used
+    assert list(store._futures) == ["users"]
+    assert store["users"].table.equals(tables["users"])
+    assert read_names == ["blocked", "users"]
+
+    # tables which are not in the order are read on access
+    assert store.unread_tables == ["other"]
+    assert "other" in store
+    assert store.peek("other").path == file_nodes[0].path
+    assert store["other"].table.equals(tables["users"])
+    store.close()
+
+
+def test__pickle_prefetching_table_store(input_files):
+    _, file_nodes = input_files
+    store = PrefetchingTableStore()
+    for node in file_nodes:
+        store[node.name] = node
+    store.start(["users", "blocked"])
+
+    restored = pickle.loads(pickle.dumps(store))
+
+    assert restored.unread_tables == ["users", "blocked"]
+    assert restored["users"].table.height == 3
@@ -0,0 +1,179 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+import pathlib
+import socket
+import tempfile
+import threading
+import urllib.request
+
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+from pytred import DataHub
+from pytred.decorators import polars_table
+from pytred.server import MicroBatcher
+from pytred.server import make_server
+
+from .fixtures.data_hub import DataHubForServing
+
+
+@pytest.fixture
+def compiled_datahub():
+    datahub = DataHubForServing(
+        pl.DataFrame({"id": ["a"]}),
+        users=pl.DataFrame(
+            {
+                "id": ["a", "b", "c", "d"],
+                "score": [1, 2, 3, 4],
+                "active": [True, True, False, True],
+            }
+        ),
+        blocked=pl.DataFrame({"id": ["d"]}),
+    )
+    return datahub.compile()
+
+
+@pytest.fixture
+def http_server(compiled_datahub):
+    server = make_server(compiled_datahub, port=0, max_wait_seconds=0.05)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(url, records):
+    request = urllib.request.Request(
+        url, data=json.dumps(records).encode(), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def test__micro_batcher_splits_results(compiled_datahub):
+    batcher = MicroBatcher(compiled_datahub)
+    requests = [
+        (pl.DataFrame({"id": ["a", "b"]}), batcher.submit(pl.DataFrame({"id": ["a", "b"]}))),
+        (pl.DataFrame({"id": ["c"]}), batcher.submit(pl.DataFrame({"id": ["c"]}))),
+        (pl.DataFrame({"id": ["x"]}), batcher.submit(pl.DataFrame({"id": ["x"]}))),
+    ]
+    batcher.start()
+
+    for root_df, future in requests:
+        assert_frame_equal(future.result(timeout=10), compiled_datahub(root_df))
+
+    batcher.stop()
+    assert batcher.n_batches == 1
+    assert batcher.n_requests == 3
+
+
+def test__execute_batch_returns_same_results_as_execute(compiled_datahub):
+    # requests with the same id do not match rows of each other
+    root_dfs = [
+        pl.DataFrame({"id": ["a", "b"], "x": [1, 2]}),
+        pl.DataFrame({"id": ["a"], "x": [3]}),
+        pl.DataFrame({"id": ["c", "a"], "x": [4, 4]}),
+    ]
+
+    results = compiled_datahub.execute_batch(root_dfs)
+
+    for root_df, result in zip(root_dfs, results):
+        assert_frame_equal(result, compiled_datahub(root_df))
+
+
+def test__execute_batch_with_root_independent_right_join():
+    class DataHubWithRightJoin(DataHub):
+        @polars_table(0, "id", join="right")
+        def users(self, users_raw):
+            return users_raw
+
+    compiled = DataHubWithRightJoin(
+        pl.DataFrame({"id": ["a"], "x": [0]}),
+        users_raw=pl.DataFrame({"id": ["a", "b"], "score": [1, 2]}),
+    ).compile()
+    root_dfs = [pl.DataFrame({"id": ["a"], "x": [1]}), pl.DataFrame({"id": ["b"], "x": [2]})]
+
+    results = compiled.execute_batch(root_dfs)
+
+    assert not compiled.is_batchable
+    for root_df, result in zip(root_dfs, results):  # noqa: B905
+        assert_frame_equal(result, compiled(root_df))
+        # unmatched rows of the right table are kept
+        assert result.height == 2
+
+
+def test__micro_batcher_executes_requests_one_by_one_on_error(compiled_datahub, monkeypatch):
+    execute = compiled_datahub.execute
+
+    def failing_execute_batch(root_dfs):
+        raise ValueError("invalid batch")
+
+    def failing_execute(root_df, *filters):
+        if root_df["id"][0] == "invalid":
+            raise ValueError("invalid request")
+        return execute(root_df, *filters)
+
+    monkeypatch.setattr(compiled_datahub, "execute_batch", failing_execute_batch)
+    monkeypatch.setattr(compiled_datahub, "execute", failing_execute)
+    batcher = MicroBatcher(compiled_datahub)
+    valid = batcher.submit(pl.DataFrame({"id": ["a"]}))
+    invalid = batcher.submit(pl.DataFrame({"id": ["invalid"]}))
+    batcher.start()
+
+    assert_frame_equal(valid.result(timeout=10), execute(pl.DataFrame({"id": ["a"]})))
+    with pytest.raises(ValueError):
+        invalid.result(timeout=10)
+    batcher.stop()
+
+
+def test__serve_http(http_server, compiled_datahub):
+    host, port = http_server.server_address[:2]
+    url = f"http://{host}:{port}/execute"
+
+    ids = [["a"], ["b", "c"], ["d"], ["a", "b"]] * 4
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(lambda x: post(url, [{"id": i} for i in x]), ids))
+
+    for request_ids, response in zip(ids, responses):
+        expected = compiled_datahub(pl.DataFrame({"id": request_ids}))
+        assert response == expected.to_dicts()
+
+    assert http_server.batcher.n_batches < len(ids)
+
+
+def test__serve_http_returns_error(http_server):
+    host, port = http_server.server_address[:2]
+    request = urllib.request.Request(f"http://{host}:{port}/execute", data=b"{invalid json")
+
+    with pytest.raises(urllib.error.HTTPError) as err:
+        urllib.request.urlopen(request)
+    assert err.value.code == 400
+
+
+def test__serve_unix_socket(compiled_datahub):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        socket_path = pathlib.Path(tmpdir, "pytred.sock").as_posix()
+        server = make_server(compiled_datahub, unix_socket=socket_path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        body = json.dumps([{"id": "a"}]).encode()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            client.sendall(
+                b"POST /execute HTTP/1.0\r\nContent-Length: "
+                + str(len(body)).encode()
+                + b"\r\n\r\n"
+                + body
+            )
+            response = b""
+            while chunk := client.recv(4096):
+                response += chunk
+
+        server.shutdown()
+        server.server_close()
+
+    expected = compiled_datahub(pl.DataFrame({"id": ["a"]}))
+    assert json.loads(response.split(b"\r\n\r\n", 1)[1]) == expected.to_dicts()
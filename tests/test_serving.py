@@ -0,0 +1,65 @@
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+from pytred.serving import KeyIndex
+
+from .fixtures.data_hub import DataHubForServing
+
+
+@pytest.fixture
+def serving_tables():
+    return {
+        "users": pl.DataFrame(
+            {
+                "id": ["a", "b", "c", "d"],
+                "score": [1, 2, 3, 4],
+                "active": [True, True, False, True],
+            }
+        ),
+        "blocked": pl.DataFrame({"id": ["d"]}),
+    }
+
+
+def test__key_index_lookup():
+    table = pl.DataFrame({"id": [1, 2, 2, None], "value": [1, 2, 3, 4]})
+    index = KeyIndex(table, ["id"])
+    df = pl.DataFrame({"id": [2, 3, None]})
+
+    assert len(index) == 2
+    assert index.lookup(df, "left") == ([0, 0, 1, 2], [1, 2, None, None])
+    assert index.lookup(df, "inner") == ([0, 0], [1, 2])
+    assert index.lookup(df, "semi") == ([0], [])
+    assert index.lookup(df, "anti") == ([1, 2], [])
+
+
+def test__root_dependent_tables():
+    assert DataHubForServing.get_root_dependent_tables() == {
+        "request_feature",
+        "request_feature_2",
+    }
+
+
+@pytest.mark.parametrize("ids", [["b", "a"], ["c", "d", "x"], ["a", "a"]])
+def test__compiled_datahub_returns_same_result(serving_tables, ids):
+    root_df = pl.DataFrame({"id": ids})
+    expected = DataHubForServing(root_df, **serving_tables)()
+
+    datahub = DataHubForServing(pl.DataFrame({"id": ["a"]}), **serving_tables)
+    compiled = datahub.compile()
+    actual = compiled(root_df)
+
+    assert_frame_equal(actual, expected, check_row_order=False)
+
+
+def test__compiled_datahub_executes_only_root_dependent_functions(serving_tables):
+    datahub = DataHubForServing(pl.DataFrame({"id": ["a"]}), **serving_tables)
+    compiled = datahub.compile()
+    assert sorted(datahub.called_functions) == ["active_users", "blocked_users", "user_feature"]
+
+    datahub.called_functions.clear()
+    compiled(pl.DataFrame({"id": ["a"]}))
+    compiled(pl.DataFrame({"id": ["b"]}), pl.col("score") > 0)
+
+    assert datahub.called_functions == ["request_feature", "request_feature_2"] * 2
+    assert set(compiled.indexes.keys()) == {"user_feature", "active_users", "blocked_users"}
@@ -0,0 +1,122 @@
+import pathlib
+
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+from pytred.data_node import DataNode
+from pytred.spill import SpillableTableStore
+from pytred.spill import parse_memory_size
+
+from .fixtures.data_hub import DataHubWithLargeIntermediate
+
+
+@pytest.mark.parametrize(
+    "size, expected",
+    [
+        [1024, 1024],
+        ["512", 512],
+        ["48GB", 48 * 1024**3],
+        ["1.5 MiB", int(1.5 * 1024**2)],
+        ["2k", 2048],
+    ],
+)
+def test__parse_memory_size(size, expected):
+    assert parse_memory_size(size) == expected
+
+
+@pytest.mark.parametrize("size", ["", "GB", "10 apples", "-1GB"])
+def test__raise_ValueError_invalid_memory_size(size):
+    with pytest.raises(ValueError):
+        parse_memory_size(size)
+
+
+def make_node(name, n_rows):
+    return DataNode(pl.DataFrame({"id": range(n_rows)}), keys=["id"], join="left", name=name)
+
+
+def test__spill_table_used_latest():
+    store = SpillableTableStore(
+        8 * 150,
+        schedule=[("t1", ["a"]), ("t2", ["b"])],
+        joined_tables=["a", "b", "t1", "t2"],
+    )
+    store["unused"] = make_node("unused", 100)
+    store["a"] = make_node("a", 100)
+    # "unused" is spilled because it is never used again
+    assert store.spilled_tables == ["unused"]
+
+    store["b"] = make_node("b", 100)
+    # "b" is pinned and "a" is used before "b"
+    assert store.spilled_tables == ["unused", "a"]
+    assert store.memory_usage <= 8 * 150
+
+    # reload spilled table
+    assert_frame_equal(store["a"].table, make_node("a", 100).table)
+    assert store.spilled_tables == ["unused", "b"]
+    assert set(store) == {"unused", "a", "b"}
+
+    store.close()
+
+
+def test__resident_tables_are_not_spilled():
+    store = SpillableTableStore(8 * 150, resident_tables=["a"])
+    store["a"] = make_node("a", 100)
+    store["b"] = make_node("b", 100)
+    store["c"] = make_node("c", 100)
+
+    assert store.spilled_tables == ["b"]
+
+    # replaced tables are not resident
+    store["a"] = make_node("a", 100)
+    store["d"] = make_node("d", 100)
+    assert "a" in store.spilled_tables
+
+    store.close()
+
+
+def test__execute_with_memory_limit():
+    source = pl.DataFrame({"id": range(1000), "value": range(1000)})
+    root_df = pl.DataFrame({"id": range(0, 1000, 3)})
+    expected = DataHubWithLargeIntermediate(root_df, source=source)()
+
+    datahub = DataHubWithLargeIntermediate(root_df, source=source)
+    actual = datahub.execute(memory_limit=50_000)
+
+    assert_frame_equal(actual, expected)
+    assert "intermediate" in datahub.tables.spilled_tables
+    # input tables held by the DataHub count toward the limit but are not spilled
+    assert "source" not in datahub.tables.spilled_tables
+    assert datahub.tables.memory_usage <= 50_000
+
+    # spilled tables can be retrieved
+    assert datahub.get("intermediate").table.columns == ["id", "value", "double"]
+
+
+def test__spilled_files_of_previous_execution_are_removed(tmp_path):
+    source = pl.DataFrame({"id": range(1000), "value": range(1000)})
+    datahub = DataHubWithLargeIntermediate(pl.DataFrame({"id": range(0, 1000, 3)}), source=source)
+
+    datahub.execute(memory_limit=50_000, spill_dir=str(tmp_path))
+    first_dir = pathlib.Path(datahub.tables._tmpdir.name)
+    assert any(first_dir.iterdir())
+
+    datahub.execute(memory_limit=50_000, spill_dir=str(tmp_path))
+
+    assert not first_dir.exists()
+    assert list(tmp_path.iterdir()) == [pathlib.Path(datahub.tables._tmpdir.name)]
+
+
+def test__memory_limit_of_execute_is_not_applied_to_later_executions():
+    source = pl.DataFrame({"id": range(1000), "value": range(1000)})
+    datahub = DataHubWithLargeIntermediate(pl.DataFrame({"id": range(0, 1000, 3)}), source=source)
+
+    datahub.execute(memory_limit=50_000)
+    assert isinstance(datahub.tables, SpillableTableStore)
+    datahub.execute()
+    assert not isinstance(datahub.tables, SpillableTableStore)
+
+    # the limit set by set_memory_limit is applied to every execution
+    datahub.set_memory_limit(50_000)
+    datahub.execute()
+    assert "intermediate" in datahub.tables.spilled_tables
@@ -0,0 +1,122 @@
+import polars as pl
+import pytest
+
+from pytred.statistics import StatisticsCatalog
+from pytred.statistics import TableStatistics
+from pytred.statistics import collect_statistics
+from pytred.statistics import estimate_join_rows
+
+from .fixtures.data_hub import DataHubWithAggregations
+
+
+@pytest.fixture
+def aggregation_inputs():
+    return {
+        "root_df": pl.DataFrame({"user_id": [1, 2, 3, 4]}),
+        "orders": pl.DataFrame(
+            {
+                "user_id": [1, 1, 2, 3, 3, 3],
+                "item_id": [10, 11, 10, 12, 12, 13],
+                "amount": [5, 8, 3, 1, 2, 7],
+            }
+        ),
+    }
+
+
+def test__collect_statistics():
+    table = pl.DataFrame({"id": [1, 1, 1, 2, None], "name": ["a", "b", "c", "d", "e"]})
+
+    statistics = collect_statistics(table, "table", ["id"])
+
+    assert statistics.n_rows == 5
+    assert statistics.keys == ["id"]
+    assert statistics.n_unique_keys == 3
+    assert statistics.max_key_fraction == 0.6
+    assert statistics.columns["id"].null_fraction == 0.2
+    assert (statistics.columns["id"].min, statistics.columns["id"].max) == (1, 2)
+    assert not statistics.is_sampled
+
+
+def test__collect_statistics_from_sampled_rows():
+    table = pl.DataFrame({"id": list(range(10_000)) * 2})
+
+    statistics = collect_statistics(table, "table", ["id"], sample_size=2_000)
+
+    assert statistics.is_sampled
+    assert statistics.n_rows == 20_000
+    # the GEE estimate is within its error bound sqrt(n_rows / sample_size)
+    assert 10_000 / 3.2 <= statistics.n_unique_keys <= 10_000 * 3.2
+
+
+@pytest.mark.parametrize(
+    "join, expected",
+    [
+        ("left", 200),
+        ("inner", 200),
+        ("semi", 100),
+        ("asof", 100),
+        ("cross", 1_000),
+        ("right", None),
+    ],
+)
+def test__estimate_join_rows(join, expected):
+    statistics = TableStatistics(name="table", n_rows=10, size=0, n_unique_keys=5)
+
+    assert estimate_join_rows(100, join, statistics) == expected
+
+
+def test__statistics_are_collected_on_execution(aggregation_inputs):
+    datahub = DataHubWithAggregations(**aggregation_inputs)
+    datahub.collect_statistics = True
+    datahub.execute()
+
+    assert datahub.statistics["root_df"].n_rows == 4
+    assert datahub.statistics["orders"].n_rows == 6
+    assert datahub.statistics["order_count"].n_unique_keys == 3
+    assert datahub.statistics["item_amount"].keys == ["user_id", "item_id"]
+
+
+def test__statistics_persist_between_runs(aggregation_inputs, tmp_path):
+    class DataHubWithStatistics(DataHubWithAggregations):
+        statistics_path = str(tmp_path / "statistics.json")
+
+    DataHubWithStatistics(**aggregation_inputs).execute()
+    # statistics of other DataHubs in the file are kept
+    other = StatisticsCatalog(tmp_path / "statistics.json", hub="Other")
+    other.update(TableStatistics(name="table", n_rows=1, size=0))
+    other.save()
+
+    catalog = StatisticsCatalog(tmp_path / "statistics.json", hub="DataHubWithStatistics")
+    datahub = DataHubWithStatistics(**aggregation_inputs)
+
+    assert catalog["order_amount"] == datahub.statistics["order_amount"]
+    assert StatisticsCatalog(tmp_path / "statistics.json", hub="Other")["table"].n_rows == 1
+
+
+def test__explain(aggregation_inputs):
+    datahub = DataHubWithAggregations(**aggregation_inputs)
+    assert "  [0] order_amount: ?" in datahub.explain()
+
+    datahub.collect_statistics = True
+    datahub.execute()
+    lines = datahub.explain().splitlines()
+
+    assert "  [0] order_amount: 3 rows, 72 bytes, 3 keys (1.00 rows/key, max key 33.3%)" in lines
+    assert "Joins (root_df: 4 rows):" in lines
+    assert "  left join order_amount on ['user_id']: ~4 rows" in lines
+    # item_amount is not joined
+    assert not any(line.startswith("  None join") for line in lines)
+
+
+def test__statistics_are_not_collected_from_samples(aggregation_inputs, tmp_path):
+    class DataHubWithStatistics(DataHubWithAggregations):
+        statistics_path = str(tmp_path / "statistics.json")
+
+    datahub = DataHubWithStatistics(**aggregation_inputs)
+    datahub.execute(sample=0.5, sample_keys=["user_id"])
+
+    assert "orders" not in datahub.statistics
+    assert not (tmp_path / "statistics.json").exists()
+
+    datahub.execute()
+    assert datahub.statistics["orders"].n_rows == 6
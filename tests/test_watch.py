@@ -0,0 +1,116 @@
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+from pytred.data_node import DataNode
+from pytred.watch import WatchSession
+from pytred.watch import find_affected_tables
+
+from .fixtures.data_hub import ComplecatedDataHub
+
+
+HUB_SOURCE = """
+import polars as pl
+
+from pytred import DataHub
+from pytred.decorators import polars_table
+
+
+class WatchedDataHub(DataHub):
+    @polars_table(0, join=None)
+    def doubled(self, users):
+        return users.with_columns(value=pl.col("value") * 2)
+
+    @polars_table(0, "id", join="left")
+    def name_length(self, users):
+        return users.select("id", length=pl.col("name").str.len_chars())
+
+    @polars_table(1, "id", join="left")
+    def tripled(self, doubled):
+        return doubled.select("id", tripled=pl.col("value") * 3)
+"""
+
+
+@pytest.fixture
+def session(tmp_path):
+    file_path = tmp_path / "hub.py"
+    file_path.write_text(HUB_SOURCE)
+    users = pl.DataFrame({"id": [1, 2], "name": ["a", "bb"], "value": [1, 2]})
+    return WatchSession(
+        file_path,
+        "WatchedDataHub",
+        pl.DataFrame({"id": [1, 2, 3]}),
+        DataNode(users, keys=None, join=None, name="users"),
+    )
+
+
+def test__find_affected_tables():
+    assert find_affected_tables(ComplecatedDataHub, ["table1_3"]) == {
+        "table1_3",
+        "table2_3",
+        "table2_4",
+        "table3",
+    }
+
+
+def test__watch_session_executes_changed_functions(session):
+    first = session.run()
+    assert session.last_executed == ["doubled", "name_length", "tripled"]
+
+    # comments and formatting are not changes
+    session.file_path.write_text(
+        HUB_SOURCE.replace("    def doubled", "    # doubled\n    def doubled")
+    )
+    assert_frame_equal(session.run(), first)
+    assert session.last_executed == []
+
+    session.file_path.write_text(HUB_SOURCE.replace('"value") * 2', '"value") * 4'))
+    df = session.run()
+
+    assert session.last_executed == ["doubled", "tripled"]
+    assert df["tripled"].to_list() == [12, 24, None]
+    assert_frame_equal(df.drop("tripled"), first.drop("tripled"))
+
+
+def test__watch_session_keeps_tables_after_error(session):
+    expected = session.run()
+    session.file_path.write_text(HUB_SOURCE.replace('pl.col("name")', 'pl.col("unknown")'))
+    with pytest.raises(pl.exceptions.ColumnNotFoundError):
+        session.run()
+
+    # tables of the last successful run are reused
+    session.file_path.write_text(HUB_SOURCE)
+    assert_frame_equal(session.run(), expected)
+    assert session.last_executed == []
+
+
+def test__watch_session_executes_functions_using_changed_module_globals(tmp_path):
+    source = HUB_SOURCE.replace(
+        "class WatchedDataHub",
+        "FACTOR = 1\n\n\ndef scale(column):\n    return column * FACTOR\n\n\nclass WatchedDataHub",
+    ).replace('pl.col("value") * 3', 'scale(pl.col("value"))')
+    file_path = tmp_path / "hub.py"
+    file_path.write_text(source)
+    users = pl.DataFrame({"id": [1, 2], "name": ["a", "bb"], "value": [1, 2]})
+    session = WatchSession(
+        file_path,
+        "WatchedDataHub",
+        pl.DataFrame({"id": [1, 2, 3]}),
+        DataNode(users, keys=None, join=None, name="users"),
+    )
+    session.run()
+
+    file_path.write_text(source.replace("return column * FACTOR", "return column * FACTOR * 10"))
+    assert session.run()["tripled"].to_list() == [20, 40, None]
+    assert session.last_executed == ["tripled"]
+
+    file_path.write_text(source.replace("FACTOR = 1", "FACTOR = 100"))
+    assert session.run()["tripled"].to_list() == [200, 400, None]
+    assert session.last_executed == ["tripled"]
+
+
+def test__watch_runs_on_saving(session):
+    df = next(session.watch(interval=0.01, max_runs=1))
+
+    assert df.columns == ["id", "length", "tripled"]
+    assert session.last_executed == ["doubled", "name_length", "tripled"]